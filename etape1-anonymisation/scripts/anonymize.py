@@ -3,22 +3,79 @@ Script d'anonymisation des données pour le projet Digital Social Score
 Conforme RGPD - Anonymisation irréversible des données personnelles
 """
 
+import numpy as np
 import pandas as pd
 import spacy
 import re
+import base64
+import contextlib
 import hashlib
+import hmac
+import io
+import json
 import os
-from typing import Dict, List, Tuple
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
+# pyarrow optionnel (colonnes string[pyarrow], lecture/écriture Parquet par morceaux)
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Mémoire résidente maximale (absent sous Windows)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Composants spaCy inutiles pour la NER (désactivés au chargement)
+NER_UNUSED_COMPONENTS = ['tagger', 'parser', 'attribute_ruler', 'lemmatizer']
+
+# Empreintes des colonnes personnelles: SHA-256 (ou HMAC-SHA256 si une clé est
+# fournie) tronqué, mémorisé par valeur distincte
+HASH_LENGTH = 8
+HASH_CACHE_SIZE = 1_000_000
+HASH_KEY_ENV = 'ANONYMIZATION_HMAC_KEY'
+
+# Pré-filtre NER: sans majuscule (ni lettre non ASCII), un texte n'est envoyé à
+# spaCy que s'il contient un de ces noms souvent écrits en minuscules
+NER_GAZETTEER = [
+    'wikipedia', 'wiki', 'google', 'facebook', 'youtube', 'twitter', 'microsoft', 'apple',
+    'america', 'usa', 'uk', 'england', 'britain', 'canada', 'australia', 'india', 'china',
+    'japan', 'russia', 'israel', 'palestine', 'iran', 'iraq', 'germany', 'france', 'europe',
+    'london', 'paris', 'new york', 'obama', 'bush', 'trump', 'hitler', 'jesus', 'jimbo'
+]
+
 class DataAnonymizer:
     """Classe pour l'anonymisation des données personnelles"""
     
-    def __init__(self, spacy_model='en_core_web_lg'):
-        """Initialise l'anonymiseur avec le modèle spaCy"""
+    def __init__(self, spacy_model='en_core_web_lg', batch_size=64, n_process=1, hash_key=None,
+                 ner_prefilter=True, gazetteer=NER_GAZETTEER):
+        """Initialise l'anonymiseur avec le modèle spaCy
+        
+        batch_size / n_process: paramètres de nlp.pipe pour les commentaires
+        hash_key: clé HMAC des colonnes hachées (par défaut $ANONYMIZATION_HMAC_KEY;
+        absente ou vide: SHA-256 simple)
+        ner_prefilter: spaCy uniquement sur les textes candidats (voir is_ner_candidate)
+        """
         print(f"🚀 Chargement du modèle spaCy: {spacy_model}")
         self.nlp = spacy.load(spacy_model)
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self._disable_unused_components()
+        
+        if hash_key is None:
+            hash_key = os.getenv(HASH_KEY_ENV)
+        self.hash_key = (hash_key.encode() if isinstance(hash_key, str) else hash_key) or None
+        self._hash_cache: Dict[str, str] = {}
         
         # Entités à anonymiser
         self.sensitive_entities = ['PERSON', 'ORG', 'GPE', 'EMAIL', 'PHONE']
@@ -44,8 +101,42 @@ class DataAnonymizer:
             'ssn': '[SSN]'
         }
         
+        # Patterns compilés une fois, et leur alternance pour repérer en un seul
+        # passage les textes sans aucune donnée personnelle
+        self.compiled_patterns = {
+            name: re.compile(pattern, re.IGNORECASE) for name, pattern in self.patterns.items()
+        }
+        self.pii_regex = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in self.patterns.values()),
+            re.IGNORECASE
+        )
+        # Tous les patterns exigent un chiffre ou un '@': test préalable très rapide
+        self.pii_hint = re.compile(r'[\d@]')
+        
+        # Pré-filtre NER: lettre autre que a-z minuscule, ou terme du gazetteer
+        self.ner_prefilter = ner_prefilter
+        self.ner_skipped = 0  # textes non vides jamais envoyés à spaCy (cumul)
+        self.ner_hint = re.compile(r'[^\W\d_a-z]')
+        self.gazetteer_regex = re.compile(
+            r'\b(?:' + '|'.join(re.escape(term.lower()) for term in gazetteer) + r')\b'
+        ) if gazetteer else None
+        
         print("✅ Anonymiseur initialisé avec succès")
     
+    def _disable_unused_components(self):
+        """Désactive les composants sans effet sur doc.ents
+        
+        tok2vec n'est désactivé que si plus aucun composant actif ne l'écoute.
+        """
+        disabled = [name for name in NER_UNUSED_COMPONENTS if name in self.nlp.pipe_names]
+        if 'tok2vec' in self.nlp.pipe_names:
+            listeners = getattr(self.nlp.get_pipe('tok2vec'), 'listening_components', [])
+            if all(listener in disabled for listener in listeners):
+                disabled.append('tok2vec')
+        if disabled:
+            self.nlp.select_pipes(disable=disabled)
+            print(f"⚡ Composants spaCy désactivés: {disabled}")
+    
     def chunk_by_words(self, text: str, max_chars: int = 1000) -> List[str]:
         """Découpe le texte par mots sans casser les entités"""
         if len(text) <= max_chars:
@@ -87,10 +178,24 @@ class DataAnonymizer:
         
         return chunks
 
+    def is_ner_candidate(self, text: str) -> bool:
+        """Le texte peut-il contenir une entité PERSON/ORG/GPE?
+        
+        Heuristique: majuscule ou lettre non ASCII, sinon terme du gazetteer. Un nom
+        écrit en minuscules hors gazetteer n'est pas vu par spaCy: voir
+        check_ner_prefilter pour mesurer ce risque.
+        """
+        if self.ner_hint.search(text):
+            return True
+        return self.gazetteer_regex is not None and self.gazetteer_regex.search(text) is not None
+    
     def anonymize_with_ner(self, text: str) -> Tuple[str, Dict]:
         """Anonymise un texte en utilisant spaCy NER avec chunking par mots"""
         if not isinstance(text, str) or len(text.strip()) == 0:
             return text, {}
+        if self.ner_prefilter and not self.is_ner_candidate(text):
+            self.ner_skipped += 1
+            return text, {}
         
         try:
             # Utiliser chunking par mots pour les longs textes
@@ -100,26 +205,7 @@ class DataAnonymizer:
             total_entities_found = {}
             
             for chunk in chunks:
-                doc = self.nlp(chunk)
-                anonymized_chunk = chunk
-                
-                # Remplacer les entités par ordre décroissant de position
-                entities = sorted(doc.ents, key=lambda x: x.start_char, reverse=True)
-                
-                for ent in entities:
-                    if ent.label_ in self.sensitive_entities:
-                        replacement = self.replacements.get(ent.label_, f'[{ent.label_}]')
-                        anonymized_chunk = (
-                            anonymized_chunk[:ent.start_char] + 
-                            replacement + 
-                            anonymized_chunk[ent.end_char:]
-                        )
-                        
-                        if ent.label_ not in total_entities_found:
-                            total_entities_found[ent.label_] = 0
-                        total_entities_found[ent.label_] += 1
-                
-                anonymized_chunks.append(anonymized_chunk)
+                anonymized_chunks.append(self._anonymize_doc(self.nlp(chunk), total_entities_found))
             
             # Recoller tous les chunks
             final_text = " ".join(anonymized_chunks)
@@ -129,50 +215,201 @@ class DataAnonymizer:
             print(f"⚠️ Erreur NER: {str(e)[:50]}")
             return text, {}
     
+    def _anonymize_doc(self, doc, entities_found: Dict) -> str:
+        """Remplace les entités sensibles d'un chunk analysé (compteurs ajoutés à entities_found)"""
+        anonymized_chunk = doc.text
+        
+        # Remplacer les entités par ordre décroissant de position
+        entities = sorted(doc.ents, key=lambda x: x.start_char, reverse=True)
+        
+        for ent in entities:
+            if ent.label_ in self.sensitive_entities:
+                replacement = self.replacements.get(ent.label_, f'[{ent.label_}]')
+                anonymized_chunk = (
+                    anonymized_chunk[:ent.start_char] + 
+                    replacement + 
+                    anonymized_chunk[ent.end_char:]
+                )
+                entities_found[ent.label_] = entities_found.get(ent.label_, 0) + 1
+        
+        return anonymized_chunk
+    
+    def anonymize_texts(self, texts: Iterable) -> Iterator[Tuple[str, Dict]]:
+        """Équivalent de anonymize_with_ner sur une séquence de textes, via nlp.pipe
+        
+        Les chunks de tous les textes passent dans un seul flux nlp.pipe (batch_size,
+        n_process); les résultats sont produits dans l'ordre des textes. Avec le
+        pré-filtre, les textes non candidats sont rendus sans passer par spaCy.
+        """
+        # (texte, nombre de chunks) dans l'ordre où les chunks sont envoyés à spaCy
+        pending = deque()
+        
+        def chunk_stream():
+            for text in texts:
+                if not isinstance(text, str) or len(text.strip()) == 0:
+                    pending.append((text, 0))
+                    continue
+                if self.ner_prefilter and not self.is_ner_candidate(text):
+                    self.ner_skipped += 1
+                    pending.append((text, 0))
+                    continue
+                chunks = self.chunk_by_words(text, max_chars=1000)
+                pending.append((text, len(chunks)))
+                yield from chunks
+        
+        docs = self.nlp.pipe(chunk_stream(), batch_size=self.batch_size, n_process=self.n_process)
+        for doc in docs:
+            # Textes vides ou non textuels: rendus tels quels
+            while pending[0][1] == 0:
+                yield pending.popleft()[0], {}
+            
+            _, n_chunks = pending.popleft()
+            entities_found = {}
+            anonymized_chunks = [self._anonymize_doc(doc, entities_found)]
+            for _ in range(n_chunks - 1):
+                anonymized_chunks.append(self._anonymize_doc(next(docs), entities_found))
+            yield " ".join(anonymized_chunks), entities_found
+        
+        while pending:
+            yield pending.popleft()[0], {}
+    
+    def check_ner_prefilter(self, texts: Iterable, max_examples: int = 5) -> Dict:
+        """Rappel du pré-filtre sur un échantillon étiqueté par le pipeline spaCy complet
+        
+        Un texte est positif si spaCy y trouve une entité sensible sans pré-filtre;
+        recall = part des positifs que le pré-filtre envoie bien à spaCy.
+        """
+        texts = [text for text in texts if isinstance(text, str) and len(text.strip()) > 0]
+        ner_prefilter, self.ner_prefilter = self.ner_prefilter, False
+        try:
+            labels = [bool(entities) for _, entities in self.anonymize_texts(texts)]
+        finally:
+            self.ner_prefilter = ner_prefilter
+        candidates = [self.is_ner_candidate(text) for text in texts]
+        
+        positives = sum(labels)
+        missed = [text for text, label, candidate in zip(texts, labels, candidates)
+                  if label and not candidate]
+        return {
+            'texts': len(texts),
+            'with_entities': positives,
+            'skipped': len(texts) - sum(candidates),
+            'skip_rate': (len(texts) - sum(candidates)) / len(texts) if texts else 0.0,
+            'missed': len(missed),
+            'recall': (positives - len(missed)) / positives if positives else 1.0,
+            'missed_examples': missed[:max_examples]
+        }
+    
     def anonymize_with_patterns(self, text: str) -> Tuple[str, Dict]:
-        """Anonymise un texte en utilisant des patterns regex"""
+        """Anonymise un texte en utilisant des patterns regex
+        
+        Les patterns s'appliquent l'un après l'autre, dans l'ordre: un pattern peut
+        masquer une partie d'un match d'un pattern suivant (ex: [PHONE] au milieu
+        d'un numéro de carte), une alternance unique ne donnerait pas le même texte.
+        """
         if not isinstance(text, str):
             return text, {}
         
+        patterns_found = {}
+        
+        # Aucun pattern ne correspond au texte d'origine: il reste inchangé
+        if not self.pii_hint.search(text) or not self.pii_regex.search(text):
+            return text, patterns_found
+        
         anonymized_text = text
+        for pattern_name, pattern in self.compiled_patterns.items():
+            replacement = self.replacements.get(pattern_name, f'[{pattern_name.upper()}]')
+            anonymized_text, count = pattern.subn(replacement, anonymized_text)
+            if count:
+                patterns_found[pattern_name] = count
+        
+        return anonymized_text, patterns_found
+    
+    def anonymize_series_with_patterns(self, texts: pd.Series) -> Tuple[pd.Series, Dict]:
+        """Version colonne de anonymize_with_patterns (opérations vectorisées .str de pandas)
+        
+        L'alternance écarte d'abord les textes sans donnée personnelle; les autres
+        reçoivent les patterns un par un, dans l'ordre (même résultat que par texte).
+        """
         patterns_found = {}
+        if not (texts.dtype == object or isinstance(texts.dtype, pd.StringDtype)):
+            return texts.copy(), patterns_found
+        
+        if (PYARROW_AVAILABLE and isinstance(texts.dtype, pd.StringDtype)
+                and texts.dtype.storage.startswith('pyarrow')):
+            # Colonnes Arrow: test préalable dans pyarrow.compute (RE2, \p{Nd} = \d Unicode de re)
+            matches = pc.match_substring_regex(texts.array.__arrow_array__(), pattern=r'[\p{Nd}@]')
+            has_pii = matches.fill_null(False).to_numpy(zero_copy_only=False).astype(bool)
+        else:
+            has_pii = texts.str.contains(self.pii_hint, na=False).to_numpy(dtype=bool)
         
-        for pattern_name, pattern in self.patterns.items():
-            matches = re.findall(pattern, anonymized_text, re.IGNORECASE)
-            if matches:
-                patterns_found[pattern_name] = len(matches)
+        # Patterns exacts (module re) sur les seuls candidats
+        candidates = texts[has_pii].astype(object)
+        keep = candidates.str.contains(self.pii_regex, na=False).to_numpy(dtype=bool)
+        has_pii[has_pii] = keep
+        if not has_pii.any():
+            return texts.copy(), patterns_found
+        
+        candidates = candidates[keep]
+        for pattern_name, pattern in self.compiled_patterns.items():
+            count = int(candidates.str.count(pattern).sum())
+            if count:
+                patterns_found[pattern_name] = count
                 replacement = self.replacements.get(pattern_name, f'[{pattern_name.upper()}]')
-                anonymized_text = re.sub(pattern, replacement, anonymized_text, flags=re.IGNORECASE)
+                candidates = candidates.str.replace(pattern, replacement, regex=True)
         
-        return anonymized_text, patterns_found
+        anonymized = texts.copy()
+        anonymized[has_pii] = candidates.to_numpy()
+        return anonymized, patterns_found
+    
+    def hash_value(self, value: str) -> str:
+        """Empreinte tronquée d'une valeur (HMAC-SHA256 si une clé est configurée)"""
+        if self.hash_key is not None:
+            digest = hmac.new(self.hash_key, value.encode(), hashlib.sha256)
+        else:
+            digest = hashlib.sha256(value.encode())
+        return digest.hexdigest()[:HASH_LENGTH]
+    
+    def hash_values(self, values: Iterable[str]) -> List[str]:
+        """Empreintes de valeurs distinctes, mémorisées d'un appel (et d'un morceau) à l'autre"""
+        if len(self._hash_cache) > HASH_CACHE_SIZE:
+            self._hash_cache.clear()
+        cache = self._hash_cache
+        digests = []
+        for value in values:
+            digest = cache.get(value)
+            if digest is None:
+                digest = cache[value] = self.hash_value(value)
+            digests.append(digest)
+        return digests
     
     def anonymize_column(self, column_data: pd.Series, method='hash') -> pd.Series:
-        """Anonymise une colonne de données personnelles"""
+        """Anonymise une colonne de données personnelles (valeurs manquantes conservées)"""
+        present = column_data.notna().to_numpy(dtype=bool)
         if method == 'hash':
-            # Hashage irréversible
-            return column_data.astype(str).apply(
-                lambda x: hashlib.sha256(x.encode()).hexdigest()[:8] if pd.notna(x) else x
-            )
+            # Hashage irréversible: une empreinte par valeur distincte, puis
+            # diffusion vectorisée sur les lignes (pseudos et pays se répètent)
+            codes, uniques = pd.factorize(column_data[present].astype(str))
+            values = column_data.to_numpy(dtype=object, copy=True)
+            values[present] = np.array(self.hash_values(uniques), dtype=object)[codes]
+            return pd.Series(values, index=column_data.index, name=column_data.name)
         elif method == 'mask':
             # Masquage simple
-            return column_data.astype(str).apply(
-                lambda x: '[MASKED]' if pd.notna(x) and x != 'nan' else x
-            )
+            values = column_data.to_numpy(dtype=object, copy=True)
+            values[present] = '[MASKED]'
+            return pd.Series(values, index=column_data.index, name=column_data.name)
         else:
             return column_data
     
-    def anonymize_dataframe(self, df: pd.DataFrame, save_stats=True) -> Tuple[pd.DataFrame, Dict]:
-        """Anonymise un DataFrame complet"""
-        df_anonymized = df.copy()
-        stats = {
-            'rows_processed': len(df),
-            'columns_anonymized': [],
-            'text_anonymization': {
-                'ner_entities': {},
-                'regex_patterns': {},
-                'texts_modified': 0
-            }
-        }
+    def anonymize_dataframe(self, df: pd.DataFrame, save_stats=True,
+                            copy=True) -> Tuple[pd.DataFrame, Dict]:
+        """Anonymise un DataFrame complet
+        
+        copy=False: modifie df en place (ex. morceau lu depuis un fichier).
+        """
+        df_anonymized = df.copy() if copy else df
+        stats = new_stats()
+        stats['rows_processed'] = len(df)
         
         print(f"🔄 Anonymisation de {len(df)} lignes...")
         
@@ -193,37 +430,73 @@ class DataAnonymizer:
         
         # 2. Anonymiser les textes avec NER et patterns
         if 'comment_text' in df_anonymized.columns:
-            print("  📝 Anonymisation des commentaires...")
+            print(f"  📝 Anonymisation des commentaires "
+                  f"(batch_size={self.batch_size}, n_process={self.n_process})...")
+            
+            texts = df_anonymized['comment_text']
+            anonymized_texts = []
+            start_time = time.perf_counter()
+            ner_skipped_before = self.ner_skipped
             
-            for idx, text in enumerate(df_anonymized['comment_text']):
+            # 2a. NER (nlp.pipe), texte par texte dans l'ordre
+            ner_stats = stats['text_anonymization']['ner_entities']
+            for idx, (anonymized_text, ner_entities) in enumerate(self.anonymize_texts(texts)):
                 if idx % 1000 == 0 and idx > 0:
-                    print(f"    Progression: {idx}/{len(df_anonymized)}")
-                
-                # Appliquer NER
-                anonymized_text, ner_entities = self.anonymize_with_ner(text)
-                
-                # Appliquer patterns regex
-                anonymized_text, regex_patterns = self.anonymize_with_patterns(anonymized_text)
-                
-                # Mettre à jour le DataFrame
-                if anonymized_text != text:
-                    df_anonymized.loc[idx, 'comment_text'] = anonymized_text
-                    stats['text_anonymization']['texts_modified'] += 1
-                
-                # Accumuler les statistiques
+                    elapsed = time.perf_counter() - start_time
+                    print(f"    Progression: {idx}/{len(df_anonymized)} "
+                          f"({idx / elapsed:.0f} lignes/s)")
+                anonymized_texts.append(anonymized_text)
                 for entity, count in ner_entities.items():
-                    if entity not in stats['text_anonymization']['ner_entities']:
-                        stats['text_anonymization']['ner_entities'][entity] = 0
-                    stats['text_anonymization']['ner_entities'][entity] += count
-                
-                for pattern, count in regex_patterns.items():
-                    if pattern not in stats['text_anonymization']['regex_patterns']:
-                        stats['text_anonymization']['regex_patterns'][pattern] = 0
-                    stats['text_anonymization']['regex_patterns'][pattern] += count
+                    ner_stats[entity] = ner_stats.get(entity, 0) + count
+            
+            # 2b. Patterns regex sur toute la colonne issue de la NER (même dtype que l'entrée)
+            column_dtype = texts.dtype if isinstance(texts.dtype, pd.StringDtype) else object
+            anonymized, regex_patterns = self.anonymize_series_with_patterns(
+                pd.Series(anonymized_texts, index=texts.index, dtype=column_dtype)
+            )
+            stats['text_anonymization']['regex_patterns'] = regex_patterns
+            
+            # Textes modifiés: comparaison des colonnes (valeurs manquantes inchangées)
+            changed = anonymized.ne(texts).to_numpy(dtype=bool, na_value=True)
+            unchanged_missing = (anonymized.isna() & texts.isna()).to_numpy(dtype=bool)
+            texts_modified = int((changed & ~unchanged_missing).sum())
+            stats['text_anonymization']['texts_modified'] = texts_modified
+            
+            # Mettre à jour le DataFrame en une seule affectation (par position)
+            df_anonymized['comment_text'] = anonymized.array
+            # Textes écartés par le pré-filtre, comptés au passage par anonymize_texts
+            stats['text_anonymization']['ner_skipped'] = self.ner_skipped - ner_skipped_before
+            
+            elapsed = time.perf_counter() - start_time
+            rows_per_second = len(texts) / elapsed if elapsed > 0 else 0.0
+            stats['text_anonymization']['rows_per_second'] = rows_per_second
+            print(f"  ⚡ Débit: {stats['text_anonymization']['rows_per_second']:.0f} lignes/s "
+                  f"({stats['text_anonymization']['ner_skipped']:,} textes sans passage par spaCy)")
         
         print("✅ Anonymisation terminée")
         return df_anonymized, stats
     
+    def anonymize_file(self, input_path: str, output_path: str, chunksize: int = 50000,
+                       max_rows: Optional[int] = None, resume: bool = True) -> Dict:
+        """Anonymise un fichier CSV/Parquet par morceaux de `chunksize` lignes
+        
+        Chaque morceau est anonymisé puis ajouté à la sortie (CSV, ou dossier de
+        fichiers part-NNNNN.parquet si output_path se termine par .parquet): la
+        mémoire reste bornée quelle que soit la taille du fichier. Après chaque
+        morceau, un checkpoint (lignes traitées, taille de la sortie, statistiques
+        cumulées) permet de reprendre après une interruption.
+        """
+        return stream_file(input_path, output_path, self._anonymize_chunks, chunksize,
+                           max_rows, resume)
+    
+    def _anonymize_chunks(self, chunks: Iterable[Tuple[int, pd.DataFrame]]
+                          ) -> Iterator[Tuple[int, pd.DataFrame, Dict]]:
+        """Anonymise les morceaux dans ce processus, dans l'ordre"""
+        for chunk_index, chunk in chunks:
+            print(f"\n📦 Morceau {chunk_index + 1} ({len(chunk):,} lignes)")
+            chunk_anonymized, chunk_stats = self.anonymize_dataframe(chunk, copy=False)
+            yield chunk_index, chunk_anonymized, chunk_stats
+    
     def save_anonymized_data(self, df: pd.DataFrame, output_path: str, stats: Dict):
         """Sauvegarde les données anonymisées et les statistiques"""
         # Sauvegarder le DataFrame
@@ -231,13 +504,25 @@ class DataAnonymizer:
         print(f"💾 Données anonymisées sauvegardées: {output_path}")
         
         # Sauvegarder les statistiques
-        stats_path = output_path.replace('.csv', '_stats.txt')
+        self.save_stats(stats, os.path.splitext(output_path)[0] + '_stats.txt')
+    
+    @staticmethod
+    def save_stats(stats: Dict, stats_path: str):
+        """Écrit le rapport d'anonymisation"""
         with open(stats_path, 'w', encoding='utf-8') as f:
             f.write("RAPPORT D'ANONYMISATION\n")
             f.write("=" * 50 + "\n\n")
             f.write(f"Lignes traitées: {stats['rows_processed']:,}\n")
             f.write(f"Colonnes anonymisées: {stats['columns_anonymized']}\n")
-            f.write(f"Textes modifiés: {stats['text_anonymization']['texts_modified']}\n\n")
+            f.write(f"Textes modifiés: {stats['text_anonymization']['texts_modified']}\n")
+            text_stats = stats['text_anonymization']
+            f.write(f"Textes sans passage par spaCy (pré-filtre): "
+                    f"{text_stats.get('ner_skipped', 0):,}\n")
+            if 'rows_per_second' in text_stats:
+                f.write(f"Débit (commentaires): {text_stats['rows_per_second']:.0f} lignes/s\n")
+            if 'peak_rss_mb' in stats:
+                f.write(f"Mémoire résidente max: {stats['peak_rss_mb']:.0f} Mo\n")
+            f.write("\n")
             
             f.write("ENTITÉS NER DÉTECTÉES:\n")
             for entity, count in stats['text_anonymization']['ner_entities'].items():
@@ -246,11 +531,347 @@ class DataAnonymizer:
             f.write("\nPATTERNS REGEX DÉTECTÉS:\n")
             for pattern, count in stats['text_anonymization']['regex_patterns'].items():
                 f.write(f"  {pattern}: {count}\n")
+            
+            if stats.get('workers'):
+                f.write("\nWORKERS:\n")
+                for pid, worker in stats['workers'].items():
+                    rate = worker['rows'] / worker['seconds'] if worker['seconds'] > 0 else 0.0
+                    f.write(f"  {pid}: {worker['rows']:,} lignes, {rate:.0f} lignes/s\n")
         
         print(f"📊 Statistiques sauvegardées: {stats_path}")
 
-def main(max_rows=None):
-    """Fonction principale d'anonymisation"""
+def new_stats() -> Dict:
+    """Statistiques vides (format de anonymize_dataframe)"""
+    return {
+        'rows_processed': 0,
+        'columns_anonymized': [],
+        'text_anonymization': {
+            'ner_entities': {},
+            'regex_patterns': {},
+            'texts_modified': 0,
+            'ner_skipped': 0
+        }
+    }
+
+def merge_stats(total: Dict, chunk_stats: Dict):
+    """Ajoute les statistiques d'un morceau aux statistiques cumulées"""
+    total['rows_processed'] += chunk_stats['rows_processed']
+    for col in chunk_stats['columns_anonymized']:
+        if col not in total['columns_anonymized']:
+            total['columns_anonymized'].append(col)
+    
+    text_total, text_chunk = total['text_anonymization'], chunk_stats['text_anonymization']
+    text_total['texts_modified'] += text_chunk['texts_modified']
+    text_total['ner_skipped'] = text_total.get('ner_skipped', 0) + text_chunk.get('ner_skipped', 0)
+    for key in ('ner_entities', 'regex_patterns'):
+        for name, count in text_chunk[key].items():
+            text_total[key][name] = text_total[key].get(name, 0) + count
+    
+    # Exécution parallèle: lignes et temps par worker
+    for pid, worker in chunk_stats.get('workers', {}).items():
+        worker_total = total.setdefault('workers', {}).setdefault(pid, {'rows': 0, 'seconds': 0.0})
+        worker_total['rows'] += worker['rows']
+        worker_total['seconds'] += worker['seconds']
+
+def peak_rss_mb() -> float:
+    """Mémoire résidente maximale du processus (Mo, 0 si non disponible)"""
+    if resource is None:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # ko sous Linux
+
+def read_chunks(input_path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Morceaux de `chunksize` lignes d'un fichier CSV ou Parquet"""
+    if input_path.endswith('.parquet'):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow est requis pour lire du Parquet")
+        for batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(input_path, chunksize=chunksize)
+
+def reset_output(output_path: str, output_format: str):
+    """Vide la sortie avant un nouveau traitement"""
+    if output_format == 'parquet':
+        os.makedirs(output_path, exist_ok=True)
+        for name in os.listdir(output_path):
+            if name.startswith('part-'):
+                os.remove(os.path.join(output_path, name))
+    else:
+        open(output_path, 'w').close()
+
+def parquet_schema(df: pd.DataFrame) -> 'pa.Schema':
+    """Schéma commun à tous les fichiers part-NNNNN, fixé sur le premier morceau
+    
+    Une colonne entièrement vide dans ce morceau (type null, ou float NaN lu
+    depuis un CSV) est promue en chaîne: les morceaux suivants restent lisibles
+    ensemble même si elle s'y remplit.
+    """
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow est requis pour écrire du Parquet")
+    schema = pa.Schema.from_pandas(df, preserve_index=False).remove_metadata()
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type) or df[field.name].isna().all():
+            schema = schema.set(i, pa.field(field.name, pa.string()))
+    return schema
+
+def encode_schema(schema: 'pa.Schema') -> str:
+    """Schéma Arrow sérialisé (base64) pour le checkpoint JSON"""
+    return base64.b64encode(schema.serialize().to_pybytes()).decode('ascii')
+
+def decode_schema(encoded: str) -> 'pa.Schema':
+    return pa.ipc.read_schema(pa.py_buffer(base64.b64decode(encoded)))
+
+def write_chunk(df: pd.DataFrame, output_path: str, output_format: str, chunk_index: int,
+                schema: Optional['pa.Schema'] = None) -> int:
+    """Ajoute un morceau anonymisé à la sortie; retourne la taille du CSV (octets) après écriture
+    
+    Parquet: chaque morceau est écrit avec le même `schema` (voir parquet_schema).
+    """
+    if output_format == 'parquet':
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow est requis pour écrire du Parquet")
+        # Colonnes promues en chaîne: valeurs non vides converties (ex. float lu depuis un CSV)
+        promoted = {
+            field.name: df[field.name].astype(object).where(df[field.name].isna(),
+                                                            df[field.name].astype(str))
+            for field in schema
+            if pa.types.is_string(field.type) and df[field.name].dtype != object
+            and not isinstance(df[field.name].dtype, pd.StringDtype)
+        }
+        table = pa.Table.from_pandas(df.assign(**promoted), schema=schema, preserve_index=False)
+        part_path = os.path.join(output_path, f'part-{chunk_index:05d}.parquet')
+        pq.write_table(table, part_path + '.tmp')
+        os.replace(part_path + '.tmp', part_path)
+        return 0
+    
+    with open(output_path, 'a', encoding='utf-8', newline='') as f:
+        df.to_csv(f, index=False, header=f.tell() == 0)
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+def input_signature(input_path: str, chunksize: int, output_format: str) -> Dict:
+    """Identifie le fichier d'entrée et les paramètres d'un checkpoint"""
+    stat = os.stat(input_path)
+    return {
+        'path': os.path.abspath(input_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'chunksize': chunksize,
+        'output_format': output_format
+    }
+
+def load_checkpoint(checkpoint_path: str) -> Optional[Dict]:
+    if not os.path.exists(checkpoint_path):
+        return None
+    with open(checkpoint_path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_checkpoint(checkpoint_path: str, checkpoint: Dict):
+    """Écriture atomique (fichier temporaire puis renommage)"""
+    with open(checkpoint_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(checkpoint_path + '.tmp', checkpoint_path)
+
+def stream_file(input_path: str, output_path: str, anonymize_chunks, chunksize: int,
+                max_rows: Optional[int] = None, resume: bool = True) -> Dict:
+    """Lecture par morceaux, anonymisation, écriture ordonnée et checkpoint (voir anonymize_file)
+    
+    anonymize_chunks: fonction qui reçoit les (index, morceau) à traiter et produit
+    les (index, morceau anonymisé, statistiques) dans le même ordre
+    """
+    output_format = 'parquet' if output_path.endswith('.parquet') else 'csv'
+    checkpoint_path = os.path.splitext(output_path)[0] + '.checkpoint.json'
+    source = input_signature(input_path, chunksize, output_format)
+    
+    checkpoint = load_checkpoint(checkpoint_path) if resume else None
+    if checkpoint is not None and checkpoint['source'] != source:
+        print("⚠️ Checkpoint d'un autre fichier ou d'autres paramètres: reprise depuis le début")
+        checkpoint = None
+    
+    if checkpoint is None:
+        checkpoint = {'source': source, 'chunks_done': 0, 'rows_done': 0, 'output_size': 0,
+                      'stats': new_stats()}
+        reset_output(output_path, output_format)
+    else:
+        print(f"♻️ Reprise après {checkpoint['rows_done']:,} lignes "
+              f"({checkpoint['chunks_done']} morceaux)")
+        if output_format == 'csv':
+            # Écarter un morceau partiellement écrit avant l'interruption
+            with open(output_path, 'r+b') as f:
+                f.truncate(checkpoint['output_size'])
+    
+    def pending_chunks():
+        rows_scheduled = checkpoint['rows_done']
+        for chunk_index, chunk in enumerate(read_chunks(input_path, chunksize)):
+            if chunk_index < checkpoint['chunks_done']:
+                continue  # déjà anonymisé lors d'une exécution précédente
+            if max_rows is not None:
+                remaining = max_rows - rows_scheduled
+                if remaining <= 0:
+                    return
+                chunk = chunk.head(remaining).copy()
+            rows_scheduled += len(chunk)
+            yield chunk_index, chunk
+    
+    stats = checkpoint['stats']
+    start_time = time.perf_counter()
+    rows_this_run = 0
+    
+    for chunk_index, chunk_anonymized, chunk_stats in anonymize_chunks(pending_chunks()):
+        schema = None
+        if output_format == 'parquet':
+            # Schéma fixé au premier morceau et conservé dans le checkpoint pour la reprise
+            if 'schema' not in checkpoint:
+                checkpoint['schema'] = encode_schema(parquet_schema(chunk_anonymized))
+            schema = decode_schema(checkpoint['schema'])
+        output_size = write_chunk(chunk_anonymized, output_path, output_format, chunk_index, schema)
+        
+        merge_stats(stats, chunk_stats)
+        rows_this_run += len(chunk_anonymized)
+        checkpoint.update(chunks_done=chunk_index + 1,
+                          rows_done=checkpoint['rows_done'] + len(chunk_anonymized),
+                          output_size=output_size)
+        save_checkpoint(checkpoint_path, checkpoint)
+        
+        elapsed = time.perf_counter() - start_time
+        print(f"  ⏱️ {checkpoint['rows_done']:,} lignes au total, "
+              f"{rows_this_run / elapsed:.0f} lignes/s, RSS max {peak_rss_mb():.0f} Mo")
+    
+    elapsed = time.perf_counter() - start_time
+    stats['text_anonymization']['rows_per_second'] = rows_this_run / elapsed if elapsed > 0 else 0.0
+    stats['peak_rss_mb'] = peak_rss_mb()
+    
+    DataAnonymizer.save_stats(stats, os.path.splitext(output_path)[0] + '_stats.txt')
+    os.remove(checkpoint_path)
+    print(f"💾 Données anonymisées sauvegardées: {output_path}")
+    return stats
+
+# Anonymiseur du processus worker (chargé une fois par _init_shard_worker)
+_worker_anonymizer = None
+
+def _init_shard_worker(spacy_model: str, batch_size: int, hash_key: Optional[str],
+                       ner_prefilter: bool):
+    """Initialisation d'un worker: le modèle spaCy est chargé une seule fois par processus"""
+    global _worker_anonymizer
+    _worker_anonymizer = DataAnonymizer(spacy_model, batch_size=batch_size, hash_key=hash_key,
+                                        ner_prefilter=ner_prefilter)
+
+def _anonymize_shard(shard_index: int, shard: pd.DataFrame) -> Tuple[int, pd.DataFrame, Dict]:
+    """Anonymise un shard dans un worker (statistiques + lignes et durée du worker)"""
+    start_time = time.perf_counter()
+    # La progression est affichée par shard dans le processus principal
+    with contextlib.redirect_stdout(io.StringIO()):
+        shard_anonymized, shard_stats = _worker_anonymizer.anonymize_dataframe(shard, copy=False)
+    shard_stats['workers'] = {
+        str(os.getpid()): {'rows': len(shard), 'seconds': time.perf_counter() - start_time}
+    }
+    return shard_index, shard_anonymized, shard_stats
+
+class ShardPool:
+    """Pool de processus qui anonymise des shards et les rend dans l'ordre d'origine
+    
+    Au plus `max_pending` shards sont en cours (lus, envoyés ou en attente
+    d'écriture): la mémoire reste bornée même si un shard est lent.
+    """
+    
+    def __init__(self, spacy_model='en_core_web_lg', workers=None, batch_size=64, max_pending=None,
+                 hash_key=None, ner_prefilter=True):
+        self.spacy_model = spacy_model
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.hash_key = hash_key
+        self.ner_prefilter = ner_prefilter
+        self.max_pending = max_pending or 2 * self.workers
+        self.worker_totals = {}
+    
+    def anonymize_chunks(self, chunks: Iterable[Tuple[int, pd.DataFrame]]
+                         ) -> Iterator[Tuple[int, pd.DataFrame, Dict]]:
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_shard_worker,
+            initargs=(self.spacy_model, self.batch_size, self.hash_key, self.ner_prefilter)
+        )
+        chunks = iter(chunks)
+        pending = deque()
+        
+        def submit_next() -> bool:
+            item = next(chunks, None)
+            if item is None:
+                return False
+            pending.append(executor.submit(_anonymize_shard, *item))
+            return True
+        
+        try:
+            while len(pending) < self.max_pending and submit_next():
+                pass
+            while pending:
+                # Attente du plus ancien shard: les résultats sortent dans l'ordre des lignes
+                shard_index, shard_anonymized, shard_stats = pending.popleft().result()
+                submit_next()
+                self._report(shard_index, shard_stats)
+                yield shard_index, shard_anonymized, shard_stats
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _report(self, shard_index: int, shard_stats: Dict):
+        """Progression par worker"""
+        for pid, worker in shard_stats['workers'].items():
+            total = self.worker_totals.setdefault(pid, {'rows': 0, 'seconds': 0.0})
+            total['rows'] += worker['rows']
+            total['seconds'] += worker['seconds']
+            print(f"  👷 Worker {pid}: shard {shard_index + 1} ({worker['rows']:,} lignes, "
+                  f"{worker['rows'] / worker['seconds']:.0f} lignes/s) - "
+                  f"{total['rows']:,} lignes au total, "
+                  f"{total['rows'] / total['seconds']:.0f} lignes/s")
+
+def anonymize_file_sharded(input_path: str, output_path: str, spacy_model: str = 'en_core_web_lg',
+                           workers: Optional[int] = None, shard_size: int = 10000,
+                           batch_size: int = 64, max_rows: Optional[int] = None,
+                           resume: bool = True,
+                           hash_key: Optional[str] = None, ner_prefilter: bool = True) -> Dict:
+    """Anonymise un fichier sur tous les cœurs: shards ordonnés de `shard_size` lignes
+    
+    Chaque worker charge le modèle spaCy une fois (compter sa mémoire par worker);
+    les shards anonymisés sont écrits et leurs statistiques fusionnées dans l'ordre
+    d'origine, avec le même checkpoint que DataAnonymizer.anonymize_file.
+    """
+    pool = ShardPool(spacy_model, workers, batch_size, hash_key=hash_key,
+                     ner_prefilter=ner_prefilter)
+    print(f"🧵 {pool.workers} workers, shards de {shard_size:,} lignes")
+    return stream_file(input_path, output_path, pool.anonymize_chunks, shard_size, max_rows, resume)
+
+def check_prefilter(sample_size=2000, seed=42):
+    """Mesure le rappel du pré-filtre NER sur un échantillon de train_advanced.csv"""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    input_path = os.path.join(current_dir, '..', 'data', 'raw', 'train_advanced.csv')
+    
+    df = pd.read_csv(input_path, usecols=['comment_text'])
+    sample = df['comment_text'].sample(min(sample_size, len(df)), random_state=seed)
+    print(f"🔍 Contrôle du pré-filtre NER sur {len(sample):,} commentaires "
+          f"(étiquettes: spaCy complet)")
+    
+    report = DataAnonymizer().check_ner_prefilter(sample)
+    print(f"  ⏭️ Textes écartés: {report['skipped']:,}/{report['texts']:,} "
+          f"({report['skip_rate']:.1%})")
+    print(f"  🎯 Rappel: {report['recall']:.2%} ({report['missed']} texte(s) avec entité manqué(s) "
+          f"sur {report['with_entities']:,})")
+    for text in report['missed_examples']:
+        print(f"    ⚠️ {text[:100]!r}")
+    return report
+
+def main(max_rows=None, batch_size=64, n_process=1, chunksize=None, output_format='csv',
+         workers=None, ner_prefilter=True, data_dir=None, spacy_model='en_core_web_lg'):
+    """Fonction principale d'anonymisation
+    
+    chunksize: traitement par morceaux avec checkpoint (mémoire bornée, reprise
+    après interruption), sortie CSV ou Parquet selon output_format (Parquet passe
+    toujours par ce mode, par morceaux de 50 000 lignes par défaut)
+    workers: shards traités en parallèle par un pool de processus (par morceaux
+    de chunksize lignes, 10 000 par défaut)
+    ner_prefilter: spaCy uniquement sur les textes candidats (majuscule ou gazetteer)
+    data_dir: dossier contenant raw/ et anonymized/ (par défaut ../data)
+    """
     print("🛡️ DIGITAL SOCIAL SCORE - ANONYMISATION RGPD")
     print("=" * 60)
     
@@ -258,8 +879,8 @@ def main(max_rows=None):
         print(f"🔢 MODE TEST: Limitation à {max_rows:,} lignes par fichier")
     
     # Chemins des fichiers
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(current_dir, '..', 'data')
+    if data_dir is None:
+        data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
     raw_dir = os.path.join(data_dir, 'raw')
     anonymized_dir = os.path.join(data_dir, 'anonymized')
     
@@ -272,17 +893,43 @@ def main(max_rows=None):
         {'input': 'test_advanced.csv', 'output': 'test_anonymized.csv'}
     ]
     
-    # Initialiser l'anonymiseur
-    anonymizer = DataAnonymizer()
+    # Initialiser l'anonymiseur (en mode parallèle, chaque worker charge le sien)
+    anonymizer = None if workers else DataAnonymizer(spacy_model, batch_size=batch_size,
+                                                     n_process=n_process,
+                                                     ner_prefilter=ner_prefilter)
+    
+    # Sortie Parquet: uniquement via l'écriture par morceaux (fichiers part-NNNNN.parquet)
+    if output_format == 'parquet' and not chunksize and not workers:
+        chunksize = 50000
     
     # Traiter chaque fichier
     for file_info in files_to_process:
         input_path = os.path.join(raw_dir, file_info['input'])
         output_path = os.path.join(anonymized_dir, file_info['output'])
+        if output_format == 'parquet':
+            output_path = output_path.replace('.csv', '.parquet')
         
         print(f"\n📁 Traitement: {file_info['input']}")
         
         try:
+            if workers:
+                stats = anonymize_file_sharded(input_path, output_path, spacy_model=spacy_model,
+                                               workers=workers, shard_size=chunksize or 10000,
+                                               batch_size=batch_size,
+                                               max_rows=max_rows, ner_prefilter=ner_prefilter)
+                print(f"✅ Fichier traité avec succès! ({stats['rows_processed']:,} lignes, "
+                      f"{stats['text_anonymization']['rows_per_second']:.0f} lignes/s)")
+                continue
+            
+            if chunksize:
+                # Lecture, anonymisation et écriture morceau par morceau
+                stats = anonymizer.anonymize_file(input_path, output_path, chunksize=chunksize,
+                                                  max_rows=max_rows)
+                print(f"✅ Fichier traité avec succès! ({stats['rows_processed']:,} lignes, "
+                      f"RSS max {stats['peak_rss_mb']:.0f} Mo)")
+                print(f"   📝 Textes modifiés: {stats['text_anonymization']['texts_modified']}")
+                continue
+            
             # Charger les données
             df = pd.read_csv(input_path)
             print(f"📊 Chargé: {df.shape[0]} lignes, {df.shape[1]} colonnes")
@@ -314,8 +961,32 @@ def main(max_rows=None):
     print(f"🛡️ Données conformes RGPD - Anonymisation irréversible")
 
 if __name__ == "__main__":
-    # Pour tester avec 20 000 lignes, décommentez la ligne suivante:
-    # main(max_rows=20000)
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Anonymisation RGPD des jeux de données Digital Social Score")
+    parser.add_argument('--max-rows', type=int,
+                        help="limiter le nombre de lignes par fichier (test)")
+    parser.add_argument('--batch-size', type=int, default=64, help="taille des lots nlp.pipe")
+    parser.add_argument('--n-process', type=int, default=1, help="processus nlp.pipe")
+    parser.add_argument('--chunksize', type=int,
+                        help="traitement par morceaux de N lignes avec reprise")
+    parser.add_argument('--output-format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--workers', type=int, help="pool de N processus (un modèle spaCy chacun)")
+    parser.add_argument('--no-ner-prefilter', action='store_true',
+                        help="envoyer tous les textes à spaCy")
+    parser.add_argument('--check-prefilter', type=int, metavar='N',
+                        help="mesurer le rappel du pré-filtre NER sur N commentaires, "
+                             "sans anonymiser")
+    args = parser.parse_args()
+    
+    if args.check_prefilter:
+        check_prefilter(args.check_prefilter)
+        raise SystemExit(0)
     
-    # Pour traiter tout le dataset:
-    main()
\ No newline at end of file
+    # Pour tester avec 20 000 lignes: python anonymize.py --max-rows 20000
+    # Gros fichiers (mémoire bornée, reprise): python anonymize.py --chunksize 50000
+    # Tous les cœurs: python anonymize.py --workers 8 --chunksize 10000
+    main(max_rows=args.max_rows, batch_size=args.batch_size, n_process=args.n_process,
+         chunksize=args.chunksize, output_format=args.output_format, workers=args.workers,
+         ner_prefilter=not args.no_ner_prefilter)
\ No newline at end of file
@@ -0,0 +1,74 @@
+import importlib.util
+import os
+import random
+import sys
+
+import pandas as pd
+import pytest
+import spacy
+
+# Les scripts d'anonymisation ne sont pas un package: import direct depuis scripts/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+ENTITY_PATTERNS = [
+    {'label': 'PERSON', 'pattern': 'John Smith'},
+    {'label': 'PERSON', 'pattern': 'Alice'},
+    {'label': 'PERSON', 'pattern': [{'LOWER': 'bob'}, {'LOWER': 'marley'}]},
+    {'label': 'ORG', 'pattern': 'Google'},
+    {'label': 'ORG', 'pattern': 'Acme Corp'},
+    {'label': 'GPE', 'pattern': 'Paris'},
+    {'label': 'GPE', 'pattern': 'London'},
+    {'label': 'DATE', 'pattern': 'Monday'},
+]
+
+# Lecture/écriture Parquet et colonnes string[pyarrow]
+requires_pyarrow = pytest.mark.skipif(importlib.util.find_spec('pyarrow') is None,
+                                      reason="pyarrow non installé")
+
+SENTENCES = [
+    "I met John Smith in Paris last Monday.",
+    "Alice works at Google and lives in London.",
+    "bob marley was great, contact me at bob.m@example.com",
+    "Call 555-123-4567 or write to alice@acme.org please",
+    "this comment has nothing personal in it",
+    "my ip is 192.168.0.12 and card 4111 1111 1111 1111",
+    "SSN 123-45-6789 leaked by Acme Corp",
+    "you are all wrong about this article",
+    "",
+    "   ",
+]
+
+
+@pytest.fixture(scope='session')
+def spacy_model_path(tmp_path_factory):
+    """Pipeline spaCy vierge + EntityRuler (sans téléchargement de en_core_web_lg)"""
+    nlp = spacy.blank('en')
+    ruler = nlp.add_pipe('entity_ruler')
+    ruler.add_patterns(ENTITY_PATTERNS)
+    path = tmp_path_factory.mktemp('spacy') / 'ruler_model'
+    nlp.to_disk(path)
+    return str(path)
+
+
+def make_comments(n: int, seed: int = 0) -> list:
+    """Commentaires générés: entités, PII regex, textes longs (> 1000 caractères) et vides"""
+    rng = random.Random(seed)
+    comments = []
+    for _ in range(n):
+        if rng.random() < 0.1:
+            comments.append(" ".join(rng.choice(SENTENCES) for _ in range(40)))
+        else:
+            comments.append(" ".join(rng.choice(SENTENCES) for _ in range(rng.randint(1, 3))))
+    return comments
+
+
+@pytest.fixture
+def comments_df():
+    comments = make_comments(200)
+    rng = random.Random(1)
+    return pd.DataFrame({
+        'id': range(len(comments)),
+        'comment_text': comments,
+        'username': [f"user{rng.randint(0, 20)}" for _ in comments],
+        'country': [rng.choice(['France', 'Spain', None]) for _ in comments],
+    })
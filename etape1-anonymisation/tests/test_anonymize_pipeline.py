@@ -0,0 +1,70 @@
+import pytest
+import pandas as pd
+
+from anonymize import DataAnonymizer
+
+
+def reference_anonymize_texts(anonymizer, df):
+    """Ancienne boucle: un appel nlp() par chunk, écriture cellule par cellule"""
+    df_reference = df.copy()
+    texts_modified = 0
+    for idx, text in enumerate(df_reference['comment_text']):
+        anonymized_text, _ = anonymizer.anonymize_with_ner(text)
+        anonymized_text, _ = anonymizer.anonymize_with_patterns(anonymized_text)
+        if anonymized_text != text:
+            df_reference.loc[idx, 'comment_text'] = anonymized_text
+            texts_modified += 1
+    return df_reference['comment_text'], texts_modified
+
+
+def test_pipe_matches_row_by_row(spacy_model_path, comments_df):
+    """nlp.pipe par lots: même texte anonymisé et mêmes statistiques que la boucle ligne à ligne"""
+    anonymizer = DataAnonymizer(spacy_model_path, batch_size=16)
+    expected, expected_modified = reference_anonymize_texts(anonymizer, comments_df)
+
+    df_anonymized, stats = anonymizer.anonymize_dataframe(comments_df)
+
+    pd.testing.assert_series_equal(df_anonymized['comment_text'], expected)
+    assert stats['text_anonymization']['texts_modified'] == expected_modified
+    assert stats['text_anonymization']['ner_entities']['PERSON'] > 0
+    assert 'DATE' not in stats['text_anonymization']['ner_entities']
+    assert stats['text_anonymization']['rows_per_second'] > 0
+
+
+def test_anonymize_texts_keeps_order_with_empty_and_long_texts(spacy_model_path):
+    """Textes vides, NaN et textes découpés en plusieurs chunks restent alignés"""
+    anonymizer = DataAnonymizer(spacy_model_path, batch_size=2)
+    long_text = "Alice from Paris says hi. " * 80
+    texts = ["", None, long_text, "   ", "John Smith", float('nan')]
+
+    results = list(anonymizer.anonymize_texts(texts))
+
+    assert len(results) == len(texts)
+    assert [text for text, _ in results][:2] == ["", None]
+    assert results[2] == anonymizer.anonymize_with_ner(long_text)
+    assert results[2][1] == {'PERSON': 80, 'GPE': 80}
+    assert results[4] == ("[PERSON]", {'PERSON': 1})
+    assert results[5][1] == {}
+
+
+def test_pipe_with_worker_processes(spacy_model_path, comments_df):
+    """n_process > 1: résultat identique au traitement mono-processus"""
+    single, _ = DataAnonymizer(spacy_model_path).anonymize_dataframe(comments_df)
+    multi_anonymizer = DataAnonymizer(spacy_model_path, n_process=2, batch_size=8)
+    multi, _ = multi_anonymizer.anonymize_dataframe(comments_df)
+    pd.testing.assert_frame_equal(single, multi)
+
+
+@pytest.mark.parametrize('dtype', [object, 'string'])
+def test_column_patterns_keep_dtype_and_skip_missing(spacy_model_path, dtype):
+    """Patterns appliqués à la colonne: dtype conservé, valeurs manquantes non modifiées"""
+    texts = ["Alice wrote to bob@example.com", None, "nothing here", "call 555-123-4567"]
+    df = pd.DataFrame({'comment_text': pd.Series(texts, dtype=dtype)})
+    df_anonymized, stats = DataAnonymizer(spacy_model_path).anonymize_dataframe(df)
+
+    assert df_anonymized['comment_text'].dtype == df['comment_text'].dtype
+    assert list(df_anonymized['comment_text'].fillna('')) == [
+        "[PERSON] wrote to [EMAIL]", "", "nothing here", "call 555-[PHONE]"
+    ]
+    assert stats['text_anonymization']['texts_modified'] == 2
+    assert stats['text_anonymization']['regex_patterns'] == {'email': 1, 'phone': 1}
@@ -0,0 +1,52 @@
+import hashlib
+import hmac
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from anonymize import DataAnonymizer
+
+
+def reference_hash(column):
+    """Implémentation d'origine (apply ligne par ligne)"""
+    return column.astype(str).apply(lambda x: hashlib.sha256(x.encode()).hexdigest()[:8])
+
+
+@pytest.fixture(scope='module')
+def anonymizer(spacy_model_path):
+    return DataAnonymizer(spacy_model_path, hash_key='')
+
+
+@pytest.mark.parametrize('column', [
+    pd.Series(['alice', 'bob', 'alice', None, 'Zoë', '']),
+    pd.Series([1, 2, 2, 3]),
+    pd.Series([1.5, np.nan, 3.0]),
+    pd.Series(['FR', None, 'US', 'FR'], dtype='string'),
+])
+def test_hash_matches_reference_and_keeps_missing(anonymizer, column):
+    """Empreintes identiques à l'ancien SHA-256 tronqué; valeurs manquantes non hachées"""
+    hashed = anonymizer.anonymize_column(column, 'hash')
+    present = column.notna()
+    assert hashed.index.equals(column.index)
+    assert list(hashed[present]) == list(reference_hash(column[present]))
+    assert hashed[~present].isna().all()
+
+    masked = anonymizer.anonymize_column(column, 'mask')
+    assert (masked[present] == '[MASKED]').all()
+    assert masked[~present].isna().all()
+
+
+def test_hmac_key_and_memoization(spacy_model_path, monkeypatch):
+    """Clé HMAC (argument ou variable d'environnement); une empreinte par valeur distincte"""
+    monkeypatch.setenv('ANONYMIZATION_HMAC_KEY', 'secret')
+    anonymizer = DataAnonymizer(spacy_model_path)
+    column = pd.Series(['alice', 'bob'] * 500)
+
+    hashed = anonymizer.anonymize_column(column, 'hash')
+    expected = hmac.new(b'secret', b'alice', hashlib.sha256).hexdigest()[:8]
+    assert hashed[0] == expected
+    assert hashed[0] != reference_hash(column)[0]
+    assert anonymizer._hash_cache == {'alice': expected, 'bob': hashed[1]}
+    other = DataAnonymizer(spacy_model_path, hash_key='other')
+    assert other.anonymize_column(column)[0] != expected
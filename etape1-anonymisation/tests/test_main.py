@@ -0,0 +1,26 @@
+import pandas as pd
+
+from anonymize import DataAnonymizer, main
+from conftest import make_comments, requires_pyarrow
+
+
+@requires_pyarrow
+def test_main_parquet_without_chunksize(spacy_model_path, tmp_path):
+    """--output-format parquet sans --chunksize: vrai Parquet lisible, rapport à part"""
+    comments = make_comments(60, seed=7)
+    df = pd.DataFrame({
+        'id': range(len(comments)),
+        'comment_text': comments,
+        'username': [f"user{i % 5}" for i in range(len(comments))],
+    })
+    (tmp_path / 'raw').mkdir()
+    df.to_csv(tmp_path / 'raw' / 'train_advanced.csv', index=False)
+    raw = pd.read_csv(tmp_path / 'raw' / 'train_advanced.csv')
+    expected, _ = DataAnonymizer(spacy_model_path).anonymize_dataframe(raw)
+
+    main(output_format='parquet', data_dir=str(tmp_path), spacy_model=spacy_model_path)
+
+    output = pd.read_parquet(tmp_path / 'anonymized' / 'train_anonymized.parquet')
+    pd.testing.assert_frame_equal(output.fillna(''), expected.fillna(''))
+    report = (tmp_path / 'anonymized' / 'train_anonymized_stats.txt').read_text(encoding='utf-8')
+    assert report.startswith("RAPPORT D'ANONYMISATION")
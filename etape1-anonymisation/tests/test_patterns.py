@@ -0,0 +1,83 @@
+import random
+import re
+
+import pandas as pd
+import pytest
+
+from anonymize import DataAnonymizer
+from conftest import requires_pyarrow
+
+FRAGMENTS = [
+    "john@x.com", "a.b-c@mail.co.uk", "user.123@host.org5551234", "555-123-4567", "+1-555-123-4567",
+    "(555)123-4567", "5551234567", "ddd-555-1234", "192.168.0.1", "999.999.999.999", "1.2.3.4.5",
+    "4111 1111 1111 1111", "4111-1111-1111-1111", "4111111111111111", "123-45-6789",
+    "hello", "World", "x", "42", "2024", "@", "-", ".", "1",
+]
+SEPARATORS = ["", " ", "-", ".", "@", ",", "/", ":"]
+
+
+@pytest.fixture(scope='module')
+def anonymizer(spacy_model_path):
+    return DataAnonymizer(spacy_model_path)
+
+
+def reference_patterns(anonymizer, text):
+    """Implémentation d'origine: re.findall puis re.sub, pattern par pattern"""
+    if not isinstance(text, str):
+        return text, {}
+    anonymized_text = text
+    patterns_found = {}
+    for pattern_name, pattern in anonymizer.patterns.items():
+        matches = re.findall(pattern, anonymized_text, re.IGNORECASE)
+        if matches:
+            patterns_found[pattern_name] = len(matches)
+            replacement = anonymizer.replacements.get(pattern_name, f'[{pattern_name.upper()}]')
+            anonymized_text = re.sub(pattern, replacement, anonymized_text, flags=re.IGNORECASE)
+    return anonymized_text, patterns_found
+
+
+def generated_texts(n, seed=0):
+    """PII collées ou séparées (chevauchements entre patterns) et textes sans PII"""
+    rng = random.Random(seed)
+    texts = ["".join(rng.choice(FRAGMENTS) + rng.choice(SEPARATORS)
+                     for _ in range(rng.randint(1, 6)))
+             for _ in range(n)]
+    return texts + ["nothing personal here", "", "Ünïcödé ١٢٣-٤٥٦٧ text"]
+
+
+def test_patterns_match_original_per_pattern_order(anonymizer):
+    """Même texte et mêmes compteurs (même ordre) que l'implémentation d'origine"""
+    for text in generated_texts(5000):
+        assert anonymizer.anonymize_with_patterns(text) == reference_patterns(anonymizer, text)
+
+
+def test_patterns_apply_in_order(anonymizer):
+    """Le pattern phone passe avant credit_card, comme dans la boucle d'origine"""
+    text, found = anonymizer.anonymize_with_patterns(
+        "card 4111-1111-1111-1111, mail bob@example.com")
+    assert text == "card 4111-[PHONE]-1111, mail [EMAIL]"
+    assert found == {'email': 1, 'phone': 1}
+
+
+@pytest.mark.parametrize('dtype', [
+    object,
+    pytest.param('string[pyarrow]', marks=requires_pyarrow),
+])
+def test_series_variant_matches_scalar(anonymizer, dtype):
+    """Version colonne (objets Python ou Arrow): mêmes textes et compteurs, manquants conservés"""
+    texts = pd.Series(generated_texts(2000, seed=1) + [None, None], index=range(10, 2015),
+                      dtype=dtype)
+    anonymized, found = anonymizer.anonymize_series_with_patterns(texts)
+
+    expected_totals = {}
+    for position, text in enumerate(texts):
+        expected_text, expected_found = reference_patterns(anonymizer, text)
+        if isinstance(text, str):
+            assert anonymized.iloc[position] == expected_text
+        for name, count in expected_found.items():
+            expected_totals[name] = expected_totals.get(name, 0) + count
+
+    assert found == expected_totals
+    assert anonymized.iloc[-2:].isna().all()
+    assert anonymized.index.equals(texts.index)
+    assert anonymized.dtype == texts.dtype
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from anonymize import DataAnonymizer
+from conftest import SENTENCES
+
+
+def test_prefilter_skips_lowercase_texts(spacy_model_path, comments_df):
+    """Textes sans majuscule ni terme du gazetteer écartés de spaCy et comptés; même résultat"""
+    texts = ["you are all wrong about this article", "Alice lives in Paris",
+             "thanks, see you at google", ""]
+    anonymizer = DataAnonymizer(spacy_model_path)
+    assert [anonymizer.is_ner_candidate(text) for text in texts[:3]] == [False, True, True]
+
+    full = DataAnonymizer(spacy_model_path, ner_prefilter=False)
+    assert list(anonymizer.anonymize_texts(texts)) == list(full.anonymize_texts(texts))
+
+    # "bob marley" (minuscules, hors gazetteer) est le cas manqué: voir le contrôle de rappel
+    df = comments_df[~comments_df['comment_text'].str.contains('bob marley')].reset_index(drop=True)
+    df_anonymized, stats = anonymizer.anonymize_dataframe(df)
+    expected, _ = full.anonymize_dataframe(df)
+    pd.testing.assert_frame_equal(df_anonymized, expected)
+    assert stats['text_anonymization']['ner_skipped'] > 0
+
+
+def test_recall_check_reports_missed_entities(spacy_model_path):
+    """Contrôle de rappel: entité écartée par le pré-filtre signalée, corrigée par le gazetteer"""
+    report = DataAnonymizer(spacy_model_path).check_ner_prefilter(SENTENCES)
+    assert report['texts'] == 8
+    assert report['with_entities'] == 4
+    assert report['missed_examples'] == ["bob marley was great, contact me at bob.m@example.com"]
+    assert report['recall'] == 0.75
+    assert report['skipped'] == 4
+
+    anonymizer = DataAnonymizer(spacy_model_path, gazetteer=['bob marley'])
+    report = anonymizer.check_ner_prefilter(SENTENCES)
+    assert report['recall'] == 1.0 and report['missed'] == 0
+
+
+def test_prefilter_screens_each_text_once(spacy_model_path, comments_df):
+    """Textes écartés comptés par anonymize_texts: un seul test du pré-filtre par texte"""
+    anonymizer = DataAnonymizer(spacy_model_path)
+    texts = comments_df['comment_text']
+    expected = sum(1 for text in texts if text.strip() and not anonymizer.is_ner_candidate(text))
+
+    calls = []
+    is_ner_candidate = anonymizer.is_ner_candidate
+    anonymizer.is_ner_candidate = lambda text: calls.append(text) or is_ner_candidate(text)
+    _, stats = anonymizer.anonymize_dataframe(comments_df)
+
+    assert stats['text_anonymization']['ner_skipped'] == expected > 0
+    assert len(calls) == sum(1 for text in texts if text.strip())
@@ -0,0 +1,32 @@
+import pandas as pd
+
+from anonymize import DataAnonymizer, anonymize_file_sharded
+from conftest import make_comments
+
+
+def test_sharded_matches_single_process(spacy_model_path, tmp_path):
+    """Pool de processus: même fichier, ordre d'origine et statistiques identiques au séquentiel"""
+    comments = make_comments(230, seed=5)
+    df = pd.DataFrame({
+        'id': range(len(comments)),
+        'comment_text': comments,
+        'username': [f"user{i % 13}" for i in range(len(comments))],
+    })
+    input_csv = str(tmp_path / 'train_advanced.csv')
+    df.to_csv(input_csv, index=False)
+
+    expected = str(tmp_path / 'expected.csv')
+    expected_stats = DataAnonymizer(spacy_model_path).anonymize_file(input_csv, expected,
+                                                                     chunksize=40)
+
+    output = str(tmp_path / 'sharded.csv')
+    stats = anonymize_file_sharded(input_csv, output, spacy_model=spacy_model_path, workers=2,
+                                   shard_size=40)
+
+    with open(output, 'rb') as sharded, open(expected, 'rb') as single:
+        assert sharded.read() == single.read()
+    assert stats['rows_processed'] == 230
+    for key in ('texts_modified', 'ner_entities', 'regex_patterns'):
+        assert stats['text_anonymization'][key] == expected_stats['text_anonymization'][key]
+    assert sum(worker['rows'] for worker in stats['workers'].values()) == 230
+    assert 'WORKERS:' in (tmp_path / 'sharded_stats.txt').read_text(encoding='utf-8')
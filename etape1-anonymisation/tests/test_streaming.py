@@ -0,0 +1,140 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from anonymize import DataAnonymizer
+from conftest import make_comments, requires_pyarrow
+
+
+@pytest.fixture
+def input_csv(tmp_path):
+    comments = make_comments(230, seed=3)
+    df = pd.DataFrame({
+        'id': range(len(comments)),
+        'comment_text': comments,
+        'username': [f"user{i % 17}" for i in range(len(comments))],
+        'toxic': [i % 2 for i in range(len(comments))],
+    })
+    path = tmp_path / 'train_advanced.csv'
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def test_chunked_csv_matches_in_memory(spacy_model_path, input_csv, tmp_path):
+    """Par morceaux: même fichier et mêmes statistiques que le traitement en mémoire"""
+    anonymizer = DataAnonymizer(spacy_model_path)
+    expected_df, expected_stats = anonymizer.anonymize_dataframe(pd.read_csv(input_csv))
+    anonymizer.save_anonymized_data(expected_df, str(tmp_path / 'expected.csv'), expected_stats)
+
+    output = str(tmp_path / 'chunked.csv')
+    stats = anonymizer.anonymize_file(input_csv, output, chunksize=50)
+
+    with open(output, 'rb') as chunked, open(tmp_path / 'expected.csv', 'rb') as expected:
+        assert chunked.read() == expected.read()
+    assert stats['rows_processed'] == 230
+    for key in ('texts_modified', 'ner_entities', 'regex_patterns'):
+        assert stats['text_anonymization'][key] == expected_stats['text_anonymization'][key]
+    assert os.path.exists(tmp_path / 'chunked_stats.txt')
+    assert not os.path.exists(tmp_path / 'chunked.checkpoint.json')
+
+
+@pytest.mark.parametrize('output_name', [
+    'resumed.csv',
+    pytest.param('resumed.parquet', marks=requires_pyarrow),
+])
+def test_resume_after_interruption(spacy_model_path, input_csv, tmp_path, monkeypatch, output_name):
+    """Interruption au 3e morceau (après écriture partielle): la reprise donne le même résultat"""
+    anonymizer = DataAnonymizer(spacy_model_path)
+    reference = str(tmp_path / ('reference' + os.path.splitext(output_name)[1]))
+    reference_stats = anonymizer.anonymize_file(input_csv, reference, chunksize=50)
+
+    output = str(tmp_path / output_name)
+    original = DataAnonymizer.anonymize_dataframe
+    calls = []
+
+    def crash_on_third_chunk(self, df, save_stats=True, copy=True):
+        calls.append(len(df))
+        if len(calls) == 3:
+            if output.endswith('.csv'):
+                with open(output, 'a', encoding='utf-8') as f:
+                    f.write('partial,row')  # écriture interrompue
+            raise KeyboardInterrupt
+        return original(self, df, save_stats, copy)
+
+    monkeypatch.setattr(DataAnonymizer, 'anonymize_dataframe', crash_on_third_chunk)
+    with pytest.raises(KeyboardInterrupt):
+        anonymizer.anonymize_file(input_csv, output, chunksize=50)
+
+    checkpoint_path = os.path.splitext(output)[0] + '.checkpoint.json'
+    with open(checkpoint_path) as f:
+        assert json.load(f)['rows_done'] == 100
+
+    monkeypatch.setattr(DataAnonymizer, 'anonymize_dataframe', original)
+    stats = anonymizer.anonymize_file(input_csv, output, chunksize=50)
+
+    if output.endswith('.csv'):
+        pd.testing.assert_frame_equal(pd.read_csv(output), pd.read_csv(reference))
+    else:
+        pd.testing.assert_frame_equal(pd.read_parquet(output), pd.read_parquet(reference))
+    assert stats['rows_processed'] == reference_stats['rows_processed'] == 230
+    ner_entities = stats['text_anonymization']['ner_entities']
+    assert ner_entities == reference_stats['text_anonymization']['ner_entities']
+    assert not os.path.exists(checkpoint_path)
+
+
+def test_checkpoint_ignored_when_input_changes(spacy_model_path, input_csv, tmp_path):
+    """Checkpoint d'un autre fichier d'entrée: traitement complet depuis le début"""
+    output = str(tmp_path / 'out.csv')
+    checkpoint_path = str(tmp_path / 'out.checkpoint.json')
+    with open(checkpoint_path, 'w') as f:
+        json.dump({'source': {'path': 'other.csv'}, 'chunks_done': 4, 'rows_done': 200,
+                   'output_size': 10, 'stats': {}}, f)
+
+    stats = DataAnonymizer(spacy_model_path).anonymize_file(input_csv, output, chunksize=100,
+                                                            max_rows=150)
+
+    assert stats['rows_processed'] == 150
+    assert len(pd.read_csv(output)) == 150
+
+
+@requires_pyarrow
+def test_parquet_schema_with_column_empty_in_first_chunk(spacy_model_path, tmp_path, monkeypatch):
+    """Colonnes vides dans le premier morceau: schéma commun (en chaîne), conservé à la reprise"""
+    comments = make_comments(100, seed=4)
+    input_csv = str(tmp_path / 'sparse.csv')
+    pd.DataFrame({
+        'id': range(100),
+        'comment_text': comments,
+        'country': [None] * 50 + ['France', 'Spain'] * 25,
+        'email': [None] * 50 + [f"user{i}@example.com" for i in range(50)],
+        'score': [None] * 50 + [i / 100 for i in range(50)],
+    }).to_csv(input_csv, index=False)
+
+    anonymizer = DataAnonymizer(spacy_model_path)
+    output = str(tmp_path / 'out.parquet')
+    original = DataAnonymizer.anonymize_dataframe
+    calls = []
+
+    def crash_on_third_chunk(self, df, save_stats=True, copy=True):
+        calls.append(len(df))
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return original(self, df, save_stats, copy)
+
+    monkeypatch.setattr(DataAnonymizer, 'anonymize_dataframe', crash_on_third_chunk)
+    with pytest.raises(KeyboardInterrupt):
+        anonymizer.anonymize_file(input_csv, output, chunksize=25)
+    with open(tmp_path / 'out.checkpoint.json') as f:
+        assert 'schema' in json.load(f)
+
+    monkeypatch.setattr(DataAnonymizer, 'anonymize_dataframe', original)
+    anonymizer.anonymize_file(input_csv, output, chunksize=25)
+
+    result = pd.read_parquet(output)
+    assert list(result['id']) == list(range(100))
+    assert result['country'][:50].isna().all() and (result['country'][50:] == '[MASKED]').all()
+    assert result['email'][:50].isna().all()
+    assert result['email'][50:].str.fullmatch('[0-9a-f]{8}').all()
+    assert result['score'][:50].isna().all() and list(result['score'][50:52]) == ['0.0', '0.01']
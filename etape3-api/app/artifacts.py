@@ -0,0 +1,60 @@
+"""
+Préparation des artefacts de démarrage rapide
+
+- Modèle simple: artefact compact (JSON + .npy) chargé sans sklearn ni pickle
+- BERT: model.safetensors, projeté en mémoire au chargement
+
+Usage (depuis etape3-api/, avec les modèles entraînés de l'étape 2):
+    python -m app.artifacts [--simple] [--bert]
+"""
+import argparse
+import logging
+import pickle
+
+from .config import BERT_MODEL_PATH, SIMPLE_MODEL_PATH, SIMPLE_COMPACT_PATH
+from .fast_scorer import export_compact_scorer
+
+logger = logging.getLogger(__name__)
+
+
+def export_simple_model():
+    """Exporte TF-IDF + régression logistique (pickles) vers l'artefact compact"""
+    with open(SIMPLE_MODEL_PATH / "best_simple_model.pkl", 'rb') as f:
+        model = pickle.load(f)
+    with open(SIMPLE_MODEL_PATH / "tfidf_vectorizer.pkl", 'rb') as f:
+        vectorizer = pickle.load(f)
+
+    export_compact_scorer(vectorizer, model, SIMPLE_COMPACT_PATH)
+    print(f"✅ Modèle simple: {SIMPLE_COMPACT_PATH}")
+
+
+def export_bert_safetensors():
+    """Réécrit les poids BERT au format safetensors (si seul pytorch_model.bin existe)"""
+    safetensors_path = BERT_MODEL_PATH / "model.safetensors"
+    if safetensors_path.exists():
+        print(f"✅ BERT: {safetensors_path} existe déjà")
+        return
+
+    from transformers import AutoModelForSequenceClassification
+
+    model = AutoModelForSequenceClassification.from_pretrained(str(BERT_MODEL_PATH))
+    model.save_pretrained(str(BERT_MODEL_PATH), safe_serialization=True)
+    print(f"✅ BERT: {safetensors_path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Artefacts de démarrage rapide")
+    parser.add_argument("--simple", action="store_true", help="artefact compact du modèle simple")
+    parser.add_argument("--bert", action="store_true", help="poids BERT en safetensors")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    export_all = not args.simple and not args.bert
+    if args.simple or export_all:
+        export_simple_model()
+    if args.bert or export_all:
+        export_bert_safetensors()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Protection des endpoints d'administration
+
+Reprend le schéma clé d'API de etape4-securite/app/auth.py (en-tête
+X-API-Key, clés MASTER_API_KEY / ADMIN_API_KEY donnant le rôle admin), sans
+ses dépendances JWT: le module de l'étape 4 n'est pas installé dans l'image
+de l'API.
+"""
+import hmac
+from typing import Optional
+
+from fastapi import HTTPException, Security, status
+from fastapi.security import APIKeyHeader
+
+from .config import ADMIN_API_KEYS
+
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+
+
+def verify_admin_api_key(api_key: str) -> bool:
+    """Comparaison à temps constant avec les clés admin configurées"""
+    return any(hmac.compare_digest(api_key.encode(), key.encode()) for key in ADMIN_API_KEYS)
+
+
+def require_admin(api_key: Optional[str] = Security(api_key_header)) -> str:
+    """Dépendance FastAPI: clé d'API admin obligatoire"""
+    if not ADMIN_API_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administration désactivée (ADMIN_API_KEY non défini)"
+        )
+    if not api_key:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="API Key manquante")
+    if not verify_admin_api_key(api_key):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="API Key invalide")
+    return "admin"
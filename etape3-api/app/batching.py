@@ -0,0 +1,108 @@
+"""
+Micro-batching asynchrone pour l'inférence BERT
+Regroupe les requêtes concurrentes en un seul passage du modèle
+"""
+import asyncio
+import time
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+from .config import BERT_BATCH_MAX_SIZE, BERT_BATCH_MAX_WAIT_MS
+
+# Métriques Prometheus optionnelles (même logique que main.py)
+try:
+    from .metrics import inference_batch_size, inference_queue_wait
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    File d'attente de micro-batching
+
+    Les textes soumis sont accumulés jusqu'à `max_batch_size` éléments ou
+    `max_wait_ms` millisecondes, puis envoyés en une seule fois à `batch_fn`
+    (exécutée hors de la boucle asyncio, via `runner` si fourni, sinon dans
+    l'exécuteur par défaut). Chaque appelant reçoit son propre résultat.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[str]], List[Any]],
+        max_batch_size: int = BERT_BATCH_MAX_SIZE,
+        max_wait_ms: float = BERT_BATCH_MAX_WAIT_MS,
+        model_type: str = "bert",
+        runner: Optional[Callable[..., Awaitable[Any]]] = None
+    ):
+        self.batch_fn = batch_fn
+        self.runner = runner
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.model_type = model_type
+
+        self._pending: List[Tuple[str, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, text: str) -> Any:
+        """Ajoute un texte à la file et attend le résultat de son lot"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Détache le lot courant et lance son traitement"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        # Ignorer les appelants qui ont abandonné (client déconnecté)
+        batch = [item for item in self._pending if not item[1].done()]
+        self._pending = []
+
+        for start in range(0, len(batch), self.max_batch_size):
+            task = asyncio.ensure_future(self._run_batch(batch[start:start + self.max_batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future, float]]):
+        """Exécute un lot dans un thread et distribue les résultats"""
+        texts = [text for text, _, _ in batch]
+
+        if METRICS_ENABLED:
+            now = time.perf_counter()
+            inference_batch_size.labels(model_type=self.model_type).observe(len(batch))
+            for _, _, enqueued_at in batch:
+                inference_queue_wait.labels(model_type=self.model_type).observe(now - enqueued_at)
+
+        try:
+            if self.runner is not None:
+                results = await self.runner(self.batch_fn, texts)
+            else:
+                loop = asyncio.get_running_loop()
+                results = await loop.run_in_executor(None, self.batch_fn, texts)
+        except Exception as e:
+            logger.error(f"Erreur lors de l'inférence du lot ({len(batch)} textes): {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    @property
+    def pending_count(self) -> int:
+        """Nombre de textes en attente dans la file"""
+        return len(self._pending)
@@ -0,0 +1,292 @@
+"""
+Cache des résultats d'analyse de toxicité
+Conforme RGPD: seule l'empreinte SHA-256 (salée) du texte est conservée, jamais le texte
+
+Deux niveaux: un cache LRU/TTL local au processus, et un cache Redis optionnel
+partagé entre les réplicas (avec repli transparent sur le local si Redis tombe).
+"""
+import hashlib
+import hmac
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .config import (
+    SCORE_CACHE_MAX_SIZE, SCORE_CACHE_TTL_SECONDS, SCORE_CACHE_SALT,
+    SCORE_CACHE_REDIS_ENABLED, REDIS_URL, REDIS_SOCKET_TIMEOUT, REDIS_RETRY_INTERVAL
+)
+
+# Métriques Prometheus optionnelles
+try:
+    from .metrics import (
+        score_cache_hits, score_cache_misses, score_cache_evictions, score_cache_errors
+    )
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+# Client Redis optionnel (cache partagé entre réplicas)
+try:
+    import redis
+    REDIS_INSTALLED = True
+except ImportError:
+    redis = None
+    REDIS_INSTALLED = False
+
+logger = logging.getLogger(__name__)
+
+# Valeur mise en cache: (probabilité toxique, confiance)
+CachedScore = Tuple[float, float]
+
+
+def make_cache_key(
+    cleaned_text: str,
+    model_name: str,
+    model_version: str,
+    salt: str = SCORE_CACHE_SALT
+) -> str:
+    """Empreinte salée (HMAC-SHA256) du triplet (texte nettoyé, modèle, version)"""
+    payload = f"{model_name}\x00{model_version}\x00{cleaned_text}".encode("utf-8")
+    if salt:
+        return hmac.new(salt.encode("utf-8"), payload, hashlib.sha256).hexdigest()
+    return hashlib.sha256(payload).hexdigest()
+
+
+class ResultCache:
+    """
+    Cache LRU borné avec expiration (TTL), sûr entre threads
+
+    Les clés sont des empreintes (voir `make_cache_key`) et les valeurs des
+    scores numériques: aucun texte brut n'est stocké.
+    """
+
+    def __init__(self, max_size: int = SCORE_CACHE_MAX_SIZE, ttl_seconds: float = SCORE_CACHE_TTL_SECONDS):
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, CachedScore]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, model_type: str = "unknown") -> Optional[CachedScore]:
+        """Retourne le score en cache ou None (entrée absente ou expirée)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    if METRICS_ENABLED:
+                        score_cache_hits.labels(model_type=model_type, tier="local").inc()
+                    return value
+
+                # Entrée expirée
+                del self._entries[key]
+                if METRICS_ENABLED:
+                    score_cache_evictions.labels(model_type=model_type, reason="ttl").inc()
+
+        if METRICS_ENABLED:
+            score_cache_misses.labels(model_type=model_type, tier="local").inc()
+        return None
+
+    def get_many(self, keys: List[str], model_type: str = "unknown") -> List[Optional[CachedScore]]:
+        """Lecture groupée (None pour chaque clé absente)"""
+        return [self.get(key, model_type) for key in keys]
+
+    def set(self, key: str, value: CachedScore, model_type: str = "unknown"):
+        """Ajoute ou rafraîchit une entrée, en évinçant la moins récemment utilisée"""
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                if METRICS_ENABLED:
+                    score_cache_evictions.labels(model_type=model_type, reason="lru").inc()
+
+    def set_many(self, items: Dict[str, CachedScore], model_type: str = "unknown"):
+        """Écriture groupée"""
+        for key, value in items.items():
+            self.set(key, value, model_type)
+
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_info(self) -> Dict:
+        """Informations sur le cache (pour /models/info)"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+class RedisScoreCache:
+    """
+    Cache de scores partagé entre réplicas, stocké dans Redis
+
+    Lectures groupées par MGET pipeliné. En cas d'erreur Redis, le cache se
+    désactive pendant `retry_interval` secondes (les lectures retournent None)
+    pour ne pas ralentir les requêtes.
+    """
+
+    KEY_PREFIX = "dss:score:"
+
+    def __init__(self, client, ttl_seconds: float = SCORE_CACHE_TTL_SECONDS,
+                 retry_interval: float = REDIS_RETRY_INTERVAL):
+        self.client = client
+        self.ttl_seconds = max(1, int(ttl_seconds))
+        self.retry_interval = retry_interval
+        self._unavailable_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Redis est-il considéré comme joignable"""
+        return time.monotonic() >= self._unavailable_until
+
+    def _mark_unavailable(self, error: Exception, model_type: str):
+        if self.available:
+            logger.warning(f"⚠️ Cache Redis indisponible, repli sur le cache local: {error}")
+        self._unavailable_until = time.monotonic() + self.retry_interval
+        if METRICS_ENABLED:
+            score_cache_errors.labels(model_type=model_type).inc()
+
+    @staticmethod
+    def _encode(value: CachedScore) -> str:
+        return f"{value[0]!r}:{value[1]!r}"
+
+    @staticmethod
+    def _decode(raw) -> Optional[CachedScore]:
+        """Score stocké, ou None (absent, ou valeur illisible traitée comme un défaut de cache)"""
+        if raw is None:
+            return None
+        try:
+            if isinstance(raw, bytes):
+                raw = raw.decode("utf-8")
+            toxic_prob, confidence = raw.split(":")
+            return float(toxic_prob), float(confidence)
+        except (ValueError, UnicodeDecodeError):
+            logger.debug("Valeur illisible dans le cache Redis, ignorée")
+            return None
+
+    def get_many(self, keys: List[str], model_type: str = "unknown") -> List[Optional[CachedScore]]:
+        """Lecture groupée via un MGET pipeliné"""
+        if not keys or not self.available:
+            return [None] * len(keys)
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.mget([self.KEY_PREFIX + key for key in keys])
+            raw_values = pipe.execute()[0]
+        except Exception as e:
+            self._mark_unavailable(e, model_type)
+            return [None] * len(keys)
+
+        values = [self._decode(raw) for raw in raw_values]
+        if METRICS_ENABLED:
+            hits = sum(1 for value in values if value is not None)
+            score_cache_hits.labels(model_type=model_type, tier="redis").inc(hits)
+            score_cache_misses.labels(model_type=model_type, tier="redis").inc(len(values) - hits)
+        return values
+
+    def set_many(self, items: Dict[str, CachedScore], model_type: str = "unknown"):
+        """Écriture groupée pipelinée (avec expiration)"""
+        if not items or not self.available:
+            return
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(self.KEY_PREFIX + key, self._encode(value), ex=self.ttl_seconds)
+            pipe.execute()
+        except Exception as e:
+            self._mark_unavailable(e, model_type)
+
+    def get_info(self) -> Dict:
+        """Informations sur le cache (pour /models/info)"""
+        return {
+            "available": self.available,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+class TieredScoreCache:
+    """
+    Cache à deux niveaux: local (LRU/TTL) puis Redis partagé (optionnel)
+
+    Les scores trouvés dans Redis sont recopiés dans le cache local.
+    """
+
+    def __init__(self, local: ResultCache, remote: Optional[RedisScoreCache] = None):
+        self.local = local
+        self.remote = remote
+
+    def get_many(self, keys: List[str], model_type: str = "unknown") -> List[Optional[CachedScore]]:
+        """Lecture groupée: cache local puis Redis pour les clés manquantes"""
+        values = self.local.get_many(keys, model_type)
+
+        if self.remote is not None:
+            missing = [i for i, value in enumerate(values) if value is None]
+            if missing:
+                remote_values = self.remote.get_many([keys[i] for i in missing], model_type)
+                for i, value in zip(missing, remote_values):
+                    if value is not None:
+                        values[i] = value
+                        self.local.set(keys[i], value, model_type)
+
+        return values
+
+    def set_many(self, items: Dict[str, CachedScore], model_type: str = "unknown"):
+        """Écriture groupée dans les deux niveaux"""
+        self.local.set_many(items, model_type)
+        if self.remote is not None:
+            self.remote.set_many(items, model_type)
+
+    def get_info(self) -> Dict:
+        """Informations sur le cache (pour /models/info)"""
+        info = {"local": self.local.get_info()}
+        if self.remote is not None:
+            info["redis"] = self.remote.get_info()
+        return info
+
+
+def create_redis_score_cache(
+    enabled: bool = SCORE_CACHE_REDIS_ENABLED,
+    salt: str = SCORE_CACHE_SALT
+) -> Optional[RedisScoreCache]:
+    """
+    Crée le cache Redis partagé si activé (même REDIS_URL que le rate limiting)
+
+    Exige un SCORE_CACHE_SALT non vide: sans sel, les clés partagées seraient des
+    SHA-256 simples de commentaires courts, réversibles par dictionnaire.
+    """
+    if not enabled:
+        return None
+
+    if not salt:
+        logger.warning("⚠️ Cache Redis activé sans SCORE_CACHE_SALT: désactivé, cache local uniquement")
+        return None
+
+    if not REDIS_INSTALLED:
+        logger.warning("⚠️ Cache Redis activé mais le paquet redis n'est pas installé")
+        return None
+
+    try:
+        client = redis.from_url(
+            REDIS_URL,
+            decode_responses=True,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT
+        )
+        logger.info("✅ Cache Redis partagé configuré pour les scores")
+        return RedisScoreCache(client)
+    except Exception as e:
+        logger.warning(f"⚠️ Cache Redis non configuré, utilisation du cache local: {e}")
+        return None
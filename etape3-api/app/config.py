@@ -9,6 +9,8 @@ BASE_DIR = Path(__file__).parent.parent
 MODEL_DIR = BASE_DIR / "models"
 BERT_MODEL_PATH = BASE_DIR.parent / "etape2-modele-ia" / "models" / "bert_model"
 SIMPLE_MODEL_PATH = BASE_DIR.parent / "etape2-modele-ia" / "models" / "simple_model"
+# Artefact compact du modèle simple (JSON + .npy, chargé sans sklearn): python -m app.artifacts
+SIMPLE_COMPACT_PATH = Path(os.getenv("SIMPLE_COMPACT_PATH", str(SIMPLE_MODEL_PATH / "compact")))
 
 # Configuration API
 API_TITLE = "Digital Social Score API"
@@ -33,9 +35,94 @@ API_VERSION = "1.0.0"
 
 # Paramètres de l'IA
 MAX_TEXT_LENGTH = 5000
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))  # textes max par requête /analyze/batch
 DEFAULT_MODEL = "simple"  # "bert" ou "simple" - simple est plus rapide et léger
+# Modèles activés: les backends des modèles désactivés ne sont jamais importés
+ENABLED_MODELS = [m.strip() for m in os.getenv("ENABLED_MODELS", "bert,simple").split(",") if m.strip()]
 INFERENCE_TIMEOUT = 30  # secondes
 
+# Modèle simple: scoreur NumPy fusionné (TF-IDF + régression logistique) au lieu de sklearn
+SIMPLE_FAST_SCORER_ENABLED = os.getenv("SIMPLE_FAST_SCORER_ENABLED", "true").lower() == "true"
+
+# Micro-batching BERT (regroupe les requêtes concurrentes en un seul passage du modèle)
+BERT_BATCHING_ENABLED = os.getenv("BERT_BATCHING_ENABLED", "true").lower() == "true"
+BERT_BATCH_MAX_SIZE = int(os.getenv("BERT_BATCH_MAX_SIZE", "32"))
+BERT_BATCH_MAX_WAIT_MS = float(os.getenv("BERT_BATCH_MAX_WAIT_MS", "5"))
+
+# Backend d'inférence BERT: "torch" (PyTorch eager) ou "onnx" (onnxruntime CPU)
+BERT_BACKEND = os.getenv("BERT_BACKEND", "torch").lower()
+BERT_ONNX_DIR = Path(os.getenv("BERT_ONNX_DIR", str(BERT_MODEL_PATH / "onnx")))
+BERT_ONNX_QUANTIZE = os.getenv("BERT_ONNX_QUANTIZE", "true").lower() == "true"  # int8 dynamique
+BERT_ONNX_AUTO_EXPORT = os.getenv("BERT_ONNX_AUTO_EXPORT", "true").lower() == "true"
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))  # 0 = choix d'onnxruntime
+
+# Backend torch: précision ("fp32" ou "int8" = quantification dynamique des couches Linear)
+BERT_PRECISION = os.getenv("BERT_PRECISION", "fp32").lower()
+# Poids fp32 lus depuis model.safetensors projeté en mémoire (pages partagées entre workers)
+BERT_MMAP_WEIGHTS = os.getenv("BERT_MMAP_WEIGHTS", "true").lower() == "true"
+TORCH_NUM_THREADS = int(os.getenv("TORCH_NUM_THREADS", "0"))  # 0 = quota CPU du conteneur
+TORCH_INTEROP_THREADS = int(os.getenv("TORCH_INTEROP_THREADS", "1"))
+
+# Tokenisation BERT: tranches de longueur (tokens) pour le padding des lots
+BERT_MAX_LENGTH = 128
+BERT_LENGTH_BUCKETS = [int(b) for b in os.getenv("BERT_LENGTH_BUCKETS", "16,32,64,128").split(",")]
+
+# Textes longs: fenêtres glissantes de BERT_MAX_LENGTH tokens au lieu d'une troncature
+BERT_SLIDING_WINDOW_ENABLED = os.getenv("BERT_SLIDING_WINDOW_ENABLED", "false").lower() == "true"
+BERT_WINDOW_STRIDE = int(os.getenv("BERT_WINDOW_STRIDE", "32"))  # tokens communs entre fenêtres
+BERT_WINDOW_POOLING = os.getenv("BERT_WINDOW_POOLING", "max").lower()  # "max" ou "mean"
+BERT_MAX_WINDOWS = int(os.getenv("BERT_MAX_WINDOWS", "16"))  # fenêtres max par texte
+
+# Échauffement des modèles au démarrage (le pod n'est prêt qu'ensuite)
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_TEXT_WORDS = [int(n) for n in os.getenv("WARMUP_TEXT_WORDS", "3,12,40,100").split(",")]
+
+# Latence par étape: identifiant de trace de la requête (traceparent / X-Cloud-Trace-Context)
+# attaché en exemplar aux histogrammes (exposé au format OpenMetrics)
+STAGE_EXEMPLARS_ENABLED = os.getenv("STAGE_EXEMPLARS_ENABLED", "false").lower() == "true"
+
+# Endpoints d'administration (en-tête X-API-Key, mêmes variables que etape4-securite)
+# Désactivés tant qu'aucune clé n'est définie
+ADMIN_API_KEYS = [key for key in (os.getenv("MASTER_API_KEY", ""), os.getenv("ADMIN_API_KEY", "")) if key]
+
+# Profileur par échantillonnage (/admin/profile)
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "10"))  # profil ponctuel: 100 Hz
+# Mode continu: échantillonnage à faible fréquence, N dernières minutes en mémoire
+PROFILER_CONTINUOUS_ENABLED = os.getenv("PROFILER_CONTINUOUS_ENABLED", "false").lower() == "true"
+PROFILER_CONTINUOUS_INTERVAL_MS = float(os.getenv("PROFILER_CONTINUOUS_INTERVAL_MS", "100"))
+PROFILER_CONTINUOUS_MODE = os.getenv("PROFILER_CONTINUOUS_MODE", "cpu")
+PROFILER_CONTINUOUS_MINUTES = int(os.getenv("PROFILER_CONTINUOUS_MINUTES", "10"))
+
+# Service multi-workers (gunicorn --preload, voir gunicorn.conf.py)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))  # nombre de workers
+# Répertoire des métriques partagées entre workers (mode multiprocess de prometheus_client)
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+# Pools d'inférence dédiés (hors boucle asyncio) - configurables par modèle
+INFERENCE_POOL_WORKERS = {
+    "bert": int(os.getenv("BERT_POOL_WORKERS", "1")),
+    "simple": int(os.getenv("SIMPLE_POOL_WORKERS", "2"))
+}
+INFERENCE_POOL_QUEUE_SIZE = {
+    "bert": int(os.getenv("BERT_POOL_QUEUE_SIZE", "16")),
+    "simple": int(os.getenv("SIMPLE_POOL_QUEUE_SIZE", "64"))
+}
+INFERENCE_RETRY_AFTER = int(os.getenv("INFERENCE_RETRY_AFTER", "1"))  # secondes
+
+# Cache des résultats (empreinte du texte nettoyé -> score, aucun texte stocké)
+SCORE_CACHE_ENABLED = os.getenv("SCORE_CACHE_ENABLED", "true").lower() == "true"
+SCORE_CACHE_MAX_SIZE = int(os.getenv("SCORE_CACHE_MAX_SIZE", "10000"))
+SCORE_CACHE_TTL_SECONDS = float(os.getenv("SCORE_CACHE_TTL_SECONDS", "3600"))
+SCORE_CACHE_SALT = os.getenv("SCORE_CACHE_SALT", "")  # partagé entre réplicas, obligatoire pour Redis
+
+# Cache partagé entre réplicas (même Redis que le rate limiting de l'étape 4);
+# ignoré si SCORE_CACHE_SALT est vide (empreintes non salées réversibles)
+SCORE_CACHE_REDIS_ENABLED = os.getenv("SCORE_CACHE_REDIS_ENABLED", "false").lower() == "true"
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.05"))  # secondes
+REDIS_RETRY_INTERVAL = float(os.getenv("REDIS_RETRY_INTERVAL", "30"))  # secondes
+
 # Rate limiting (requêtes par minute)
 RATE_LIMIT_REQUESTS = 100
 RATE_LIMIT_WINDOW = 60
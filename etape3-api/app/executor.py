@@ -0,0 +1,112 @@
+"""
+Pools d'exécution dédiés à l'inférence
+Sortent les appels bloquants (torch, sklearn) de la boucle asyncio d'uvicorn
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict
+
+from .config import INFERENCE_POOL_WORKERS, INFERENCE_POOL_QUEUE_SIZE, INFERENCE_RETRY_AFTER
+
+# Métriques Prometheus optionnelles
+try:
+    from .metrics import inference_queue_depth, inference_in_flight
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+logger = logging.getLogger(__name__)
+
+
+class InferencePoolFull(Exception):
+    """Levée quand la file d'attente d'un pool d'inférence est pleine"""
+
+    def __init__(self, model_type: str, retry_after: int = INFERENCE_RETRY_AFTER):
+        super().__init__(f"File d'inférence saturée pour le modèle: {model_type}")
+        self.model_type = model_type
+        self.retry_after = retry_after
+
+
+class InferencePool:
+    """
+    Pool de threads borné pour un modèle
+
+    Au plus `max_workers` inférences tournent en parallèle et `max_queue`
+    attendent leur tour; au-delà, `run` lève InferencePoolFull (contrôle d'admission).
+    """
+
+    def __init__(self, model_type: str, max_workers: int, max_queue: int):
+        self.model_type = model_type
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"inference-{model_type}"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Nombre de tâches en attente"""
+        return self._queued
+
+    @property
+    def in_flight(self) -> int:
+        """Nombre de tâches en cours d'exécution"""
+        return self._in_flight
+
+    def _update_gauges(self):
+        if METRICS_ENABLED:
+            inference_queue_depth.labels(model_type=self.model_type).set(self._queued)
+            inference_in_flight.labels(model_type=self.model_type).set(self._in_flight)
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Exécute `fn(*args)` dans le pool et attend son résultat"""
+        with self._lock:
+            if self._queued + self._in_flight >= self.max_workers + self.max_queue:
+                raise InferencePoolFull(self.model_type)
+            self._queued += 1
+            self._update_gauges()
+
+        def task():
+            with self._lock:
+                self._queued -= 1
+                self._in_flight += 1
+                self._update_gauges()
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                    self._update_gauges()
+
+        def on_done(future: Future):
+            # Tâche annulée avant son démarrage: la retirer de la file
+            if future.cancelled():
+                with self._lock:
+                    self._queued -= 1
+                    self._update_gauges()
+
+        future = self._executor.submit(task)
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        """Arrête le pool sans attendre les tâches en cours"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Un pool par modèle, dimensionné par la configuration
+inference_pools: Dict[str, InferencePool] = {
+    model_type: InferencePool(
+        model_type,
+        INFERENCE_POOL_WORKERS[model_type],
+        INFERENCE_POOL_QUEUE_SIZE[model_type]
+    )
+    for model_type in INFERENCE_POOL_WORKERS
+}
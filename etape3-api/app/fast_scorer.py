@@ -0,0 +1,342 @@
+"""
+Scoreur linéaire fusionné pour le modèle simple (TF-IDF + Logistic Regression)
+
+Le vocabulaire TF-IDF, les poids IDF et les coefficients de la régression
+logistique sont extraits une fois au chargement. Le score d'un texte est ensuite
+calculé directement avec NumPy (produit scalaire creux, normalisation, sigmoïde),
+sans construire de matrice scipy ni repasser par la validation générique de sklearn.
+
+Le scoreur est vérifié contre sklearn au chargement (écart max 1e-9) et n'est
+utilisé que s'il reproduit exactement ses probabilités.
+
+Il peut être exporté en artefact compact (JSON + tableaux .npy) chargé sans
+sklearn ni pickle, les tableaux étant projetés en mémoire (mmap) et donc
+partagés entre les workers.
+"""
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Écart maximal toléré avec predict_proba de sklearn
+PARITY_TOLERANCE = 1e-9
+
+# Textes de contrôle utilisés pour la vérification au chargement (en plus du vocabulaire)
+PARITY_PROBE_TEXTS = [
+    "",
+    "hello good day",
+    "you are a stupid idiot",
+    "hate hate hate you",
+    "this is a perfectly normal comment about the weather",
+    "unknownword anotherunknownword",
+]
+
+
+def sigmoid(z: np.ndarray) -> np.ndarray:
+    """Sigmoïde logistique en NumPy pur (forme tanh, sans débordement pour |z| grand)"""
+    return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+# Format de l'artefact compact
+COMPACT_FORMAT_VERSION = 1
+COMPACT_PARAMS_FILE = "scorer.json"
+COMPACT_ARRAYS = ("idf", "coef", "idf_coef")
+
+
+class WordNgramAnalyzer:
+    """
+    Analyseur 'word' de sklearn reconstruit sans sklearn
+
+    Minuscules, tokens par expression régulière, suppression des mots vides
+    puis n-grammes de mots, dans le même ordre que
+    TfidfVectorizer.build_analyzer().
+    """
+
+    def __init__(self, token_pattern: str, lowercase: bool, ngram_range: Sequence[int],
+                 stop_words: Optional[Sequence[str]] = None):
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.ngram_range = tuple(ngram_range)
+        self.stop_words = frozenset(stop_words) if stop_words is not None else None
+        self._findall = re.compile(token_pattern).findall
+
+    @classmethod
+    def from_vectorizer(cls, vectorizer) -> Optional["WordNgramAnalyzer"]:
+        """Analyseur équivalent, ou None si la configuration n'est pas reproductible"""
+        if (vectorizer.analyzer != "word" or vectorizer.preprocessor is not None
+                or vectorizer.tokenizer is not None or vectorizer.strip_accents
+                or vectorizer.input != "content"):
+            return None
+        stop_words = vectorizer.get_stop_words()
+        return cls(
+            token_pattern=vectorizer.token_pattern,
+            lowercase=vectorizer.lowercase,
+            ngram_range=vectorizer.ngram_range,
+            stop_words=sorted(stop_words) if stop_words is not None else None
+        )
+
+    def get_params(self) -> Dict:
+        return {
+            "token_pattern": self.token_pattern,
+            "lowercase": self.lowercase,
+            "ngram_range": list(self.ngram_range),
+            "stop_words": sorted(self.stop_words) if self.stop_words is not None else None
+        }
+
+    def __call__(self, text: str) -> List[str]:
+        if self.lowercase:
+            text = text.lower()
+        tokens = self._findall(text)
+        if self.stop_words is not None:
+            tokens = [token for token in tokens if token not in self.stop_words]
+
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+
+        original_tokens = tokens
+        if min_n == 1:
+            tokens = list(original_tokens)
+            min_n += 1
+        else:
+            tokens = []
+        for n in range(min_n, min(max_n + 1, len(original_tokens) + 1)):
+            for i in range(len(original_tokens) - n + 1):
+                tokens.append(" ".join(original_tokens[i:i + n]))
+        return tokens
+
+
+class LinearTfidfScorer:
+    """
+    Score = sigmoïde(coef · tfidf(texte) + intercept), calculé sans sklearn
+
+    Construit via `from_sklearn` à partir d'un TfidfVectorizer et d'une
+    LogisticRegression binaire déjà entraînés.
+    """
+
+    def __init__(
+        self,
+        analyzer,
+        vocabulary: dict,
+        idf: Optional[np.ndarray],
+        coef: np.ndarray,
+        intercept: float,
+        sublinear_tf: bool = False,
+        binary: bool = False,
+        norm: Optional[str] = "l2",
+        logit_scale: float = 1.0,
+        idf_coef: Optional[np.ndarray] = None
+    ):
+        self.analyzer = analyzer
+        self.vocabulary = vocabulary
+        self.sublinear_tf = sublinear_tf
+        self.binary = binary
+        self.norm = norm
+        self.intercept = float(intercept)
+        self.logit_scale = logit_scale
+
+        # Poids précalculés: idf_j et idf_j * coef_j (sans copie si déjà en float64, ex. mmap)
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.idf = np.ones_like(self.coef) if idf is None else np.asarray(idf, dtype=np.float64)
+        self.idf_coef = self.idf * self.coef if idf_coef is None else np.asarray(idf_coef, dtype=np.float64)
+
+    @classmethod
+    def from_sklearn(cls, vectorizer, model) -> "LinearTfidfScorer":
+        """Exporte le vocabulaire, les IDF et les coefficients d'un modèle sklearn entraîné"""
+        if vectorizer.norm not in ("l2", "l1", None):
+            raise ValueError(f"Normalisation TF-IDF non supportée: {vectorizer.norm}")
+
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        if coef.shape[0] != 1 or len(model.classes_) != 2:
+            raise ValueError("Seule la régression logistique binaire est supportée")
+
+        # LogisticRegression multinomiale à 2 classes: softmax([-d, d]) = sigmoïde(2d)
+        multi_class = getattr(model, "multi_class", "auto")
+        logit_scale = 2.0 if multi_class == "multinomial" else 1.0
+
+        return cls(
+            analyzer=vectorizer.build_analyzer(),
+            vocabulary=dict(vectorizer.vocabulary_),
+            idf=vectorizer.idf_ if vectorizer.use_idf else None,
+            coef=coef[0],
+            intercept=float(np.ravel(model.intercept_)[0]),
+            sublinear_tf=vectorizer.sublinear_tf,
+            binary=vectorizer.binary,
+            norm=vectorizer.norm,
+            logit_scale=logit_scale
+        )
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self.coef)
+
+    def save(self, directory: Path, analyzer: WordNgramAnalyzer):
+        """Écrit l'artefact compact: paramètres + vocabulaire en JSON, poids en .npy"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        terms = [""] * self.vocabulary_size
+        for term, index in self.vocabulary.items():
+            terms[index] = term
+
+        params = {
+            "format_version": COMPACT_FORMAT_VERSION,
+            "analyzer": analyzer.get_params(),
+            "sublinear_tf": self.sublinear_tf,
+            "binary": self.binary,
+            "norm": self.norm,
+            "intercept": self.intercept,
+            "logit_scale": self.logit_scale,
+            "vocabulary": terms
+        }
+        with open(directory / COMPACT_PARAMS_FILE, "w") as f:
+            json.dump(params, f)
+        for name in COMPACT_ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> "LinearTfidfScorer":
+        """Charge l'artefact compact (tableaux projetés en mémoire en lecture seule)"""
+        directory = Path(directory)
+        with open(directory / COMPACT_PARAMS_FILE, "r") as f:
+            params = json.load(f)
+        if params.get("format_version") != COMPACT_FORMAT_VERSION:
+            raise ValueError(f"Version d'artefact non supportée: {params.get('format_version')}")
+
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r" if mmap else None)
+            for name in COMPACT_ARRAYS
+        }
+        return cls(
+            analyzer=WordNgramAnalyzer(**params["analyzer"]),
+            vocabulary={term: index for index, term in enumerate(params["vocabulary"])},
+            sublinear_tf=params["sublinear_tf"],
+            binary=params["binary"],
+            norm=params["norm"],
+            intercept=params["intercept"],
+            logit_scale=params["logit_scale"],
+            **arrays
+        )
+
+    def count_terms(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorisation: (document, terme, occurrences) des termes connus de chaque texte"""
+        vocabulary = self.vocabulary
+        analyzer = self.analyzer
+
+        # Indices des termes connus de chaque document, aplatis
+        doc_ids: List[int] = []
+        term_ids: List[int] = []
+        for doc_id, text in enumerate(texts):
+            terms = [vocabulary[term] for term in analyzer(text) if term in vocabulary]
+            term_ids.extend(terms)
+            doc_ids.extend([doc_id] * len(terms))
+
+        # Fréquence de chaque couple (document, terme)
+        pairs = np.asarray(doc_ids, dtype=np.int64) * self.vocabulary_size + np.asarray(term_ids, dtype=np.int64)
+        pairs, counts = np.unique(pairs, return_counts=True)
+        return pairs // self.vocabulary_size, pairs % self.vocabulary_size, counts
+
+    def decision_from_counts(self, n_docs: int, term_counts: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+        """coef · tfidf + intercept à partir des occurrences renvoyées par count_terms"""
+        docs, terms, counts = term_counts
+        if counts.size == 0:
+            return np.full(n_docs, self.intercept)
+
+        if self.binary:
+            tf = np.ones(len(counts))
+        elif self.sublinear_tf:
+            tf = np.log(counts) + 1.0
+        else:
+            tf = counts.astype(np.float64)
+
+        # Produit scalaire creux, puis normalisation du vecteur TF-IDF
+        dot = np.bincount(docs, weights=tf * self.idf_coef[terms], minlength=n_docs)
+        if self.norm is not None:
+            weights = tf * self.idf[terms]
+            if self.norm == "l2":
+                norms = np.sqrt(np.bincount(docs, weights=weights * weights, minlength=n_docs))
+            else:
+                norms = np.bincount(docs, weights=np.abs(weights), minlength=n_docs)
+            norms[norms == 0.0] = 1.0
+            dot /= norms
+
+        return dot + self.intercept
+
+    def decision_function(self, texts: Sequence[str]) -> np.ndarray:
+        """coef · tfidf(texte) + intercept pour chaque texte (textes déjà nettoyés)"""
+        return self.decision_from_counts(len(texts), self.count_terms(texts))
+
+    def predict_toxic_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Probabilité de la classe toxique pour chaque texte"""
+        return sigmoid(self.logit_scale * self.decision_function(texts))
+
+    def score_counts(self, n_docs: int, term_counts: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> List[Tuple[float, float]]:
+        """(probabilité toxique, confiance) à partir des occurrences renvoyées par count_terms"""
+        toxic_probs = sigmoid(self.logit_scale * self.decision_from_counts(n_docs, term_counts))
+        confidences = np.maximum(toxic_probs, 1.0 - toxic_probs)
+        return list(zip(toxic_probs.tolist(), confidences.tolist()))
+
+    def score(self, texts: Sequence[str]) -> List[Tuple[float, float]]:
+        """(probabilité toxique, confiance) pour chaque texte, comme predict_proba"""
+        return self.score_counts(len(texts), self.count_terms(texts))
+
+    def max_deviation(self, vectorizer, model, texts: Sequence[str]) -> float:
+        """Écart maximal avec predict_proba de sklearn sur `texts`"""
+        expected = model.predict_proba(vectorizer.transform(texts))[:, 1]
+        return float(np.max(np.abs(self.predict_toxic_proba(texts) - expected)))
+
+
+def build_fast_scorer(vectorizer, model) -> Optional[LinearTfidfScorer]:
+    """
+    Construit le scoreur fusionné et vérifie sa parité avec sklearn
+
+    Retourne None (repli sur sklearn) si le modèle n'est pas supporté ou si
+    les probabilités diffèrent de plus de PARITY_TOLERANCE.
+    """
+    try:
+        scorer = LinearTfidfScorer.from_sklearn(vectorizer, model)
+
+        # Contrôle: textes fixes + chaque terme du vocabulaire, seul et tous ensemble
+        vocabulary_terms = list(vectorizer.vocabulary_)[:1000]
+        probe_texts = PARITY_PROBE_TEXTS + vocabulary_terms + [" ".join(vocabulary_terms)]
+        deviation = scorer.max_deviation(vectorizer, model, probe_texts)
+        if deviation > PARITY_TOLERANCE:
+            logger.warning(f"⚠️ Scoreur fusionné écarté (écart {deviation:.2e} avec sklearn)")
+            return None
+
+        logger.info(f"✅ Scoreur fusionné prêt ({scorer.vocabulary_size} termes, écart {deviation:.1e})")
+        return scorer
+
+    except Exception as e:
+        logger.warning(f"⚠️ Scoreur fusionné non disponible, utilisation de sklearn: {e}")
+        return None
+
+
+def export_compact_scorer(vectorizer, model, directory: Path) -> LinearTfidfScorer:
+    """
+    Exporte le modèle simple en artefact compact chargeable sans sklearn
+
+    Vérifie au préalable la parité du scoreur avec sklearn et celle de
+    l'analyseur reconstruit avec l'analyseur de sklearn.
+    """
+    scorer = build_fast_scorer(vectorizer, model)
+    if scorer is None:
+        raise ValueError("Scoreur fusionné non disponible pour ce modèle")
+
+    analyzer = WordNgramAnalyzer.from_vectorizer(vectorizer)
+    if analyzer is None:
+        raise ValueError("Analyseur TF-IDF non reproductible sans sklearn")
+
+    probe_texts = PARITY_PROBE_TEXTS + list(vectorizer.vocabulary_)[:1000]
+    reference = vectorizer.build_analyzer()
+    if any(analyzer(text) != reference(text) for text in probe_texts):
+        raise ValueError("Analyseur reconstruit différent de celui de sklearn")
+
+    scorer.save(directory, analyzer)
+    logger.info(f"✅ Artefact compact du modèle simple écrit dans {directory}")
+    return scorer
@@ -1,20 +1,36 @@
 """
 Logique d'inférence pour les modèles de détection de toxicité
+
+torch, transformers et sklearn ne sont importés qu'au chargement du modèle qui
+en a besoin (démarrage rapide, aucun import pour un modèle désactivé).
 """
-import torch
 import json
 import pickle
+import threading
 import time
 import logging
+import psutil
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Tuple, Dict, Optional
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from typing import Tuple, Dict, Optional, List
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-import re
 
-from .config import BERT_MODEL_PATH, SIMPLE_MODEL_PATH, MAX_TEXT_LENGTH, TOXICITY_LEVELS
+from .config import (
+    BERT_MODEL_PATH, SIMPLE_MODEL_PATH, SIMPLE_COMPACT_PATH, ENABLED_MODELS, BERT_MMAP_WEIGHTS,
+    MAX_TEXT_LENGTH, TOXICITY_LEVELS,
+    SCORE_CACHE_ENABLED, SCORE_CACHE_MAX_SIZE, SCORE_CACHE_TTL_SECONDS,
+    SIMPLE_FAST_SCORER_ENABLED, BERT_BACKEND, BERT_ONNX_QUANTIZE, BERT_PRECISION,
+    BERT_MAX_LENGTH, BERT_LENGTH_BUCKETS, BERT_SLIDING_WINDOW_ENABLED, BERT_WINDOW_STRIDE,
+    BERT_WINDOW_POOLING, BERT_MAX_WINDOWS
+)
+from .text_cleaning import clean_text_light, clean_text_full
+from .fast_scorer import LinearTfidfScorer, build_fast_scorer
+from .length_buckets import bucket_by_length, pool_window_scores
+from .runtime import (
+    LatencyTracker, configure_torch_threads, quantize_dynamic_int8, model_size_mb
+)
+from .stages import StageTimer
+from .cache import ResultCache, TieredScoreCache, create_redis_score_cache, make_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -24,35 +40,117 @@ class ModelPredictor:
     def __init__(self):
         self.bert_model = None
         self.bert_tokenizer = None
+        self.bert_session = None  # backend ONNX (BERT_BACKEND=onnx)
+        self.bert_backend = None
+        self.bert_precision = None
+        # Chargement (durée, mémoire) et latences BERT, par précision (fp32 / int8)
+        self.bert_runtime = {}
+        self.bert_latency = {}
+        self.torch_threads = None
         self.simple_model = None
         self.tfidf_vectorizer = None
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self.simple_scorer = None
+        self.device = None  # choisi au chargement du backend torch
         self.models_loaded = {}
+        # Durée de chaque phase de démarrage (imports, lecture des poids, ...)
+        self.startup_timings = {}
+        # Chargement en tâche de fond au démarrage: une requête concurrente attend
+        # la fin du chargement au lieu de charger le modèle une seconde fois
+        self._load_lock = threading.RLock()
+        self.model_versions = {}
+        
+        # Cache des scores (empreinte du texte nettoyé uniquement, conforme RGPD)
+        # Niveau local au processus + niveau Redis partagé entre réplicas (optionnel)
+        self.score_cache = (
+            TieredScoreCache(
+                ResultCache(SCORE_CACHE_MAX_SIZE, SCORE_CACHE_TTL_SECONDS),
+                create_redis_score_cache()
+            )
+            if SCORE_CACHE_ENABLED else None
+        )
         
-        logger.info(f"Initialisation du prédicteur sur device: {self.device}")
+        logger.info(f"Initialisation du prédicteur (modèles activés: {', '.join(ENABLED_MODELS)})")
+    
+    @contextmanager
+    def timed_phase(self, phase: str):
+        """Mesure la durée d'une phase de démarrage (exposée dans /models/info)"""
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self.startup_timings[phase] = round(time.time() - start_time, 3)
+    
+    def _read_model_version(self, model_path: Path) -> str:
+        """Version d'un modèle (date de création des métadonnées si disponible)"""
+        try:
+            metadata_path = model_path / "metadata.json"
+            if metadata_path.exists():
+                with open(metadata_path, 'r') as f:
+                    return str(json.load(f).get("created_at", "unknown"))
+        except Exception:
+            pass
+        return "unknown"
     
     def load_bert_model(self) -> bool:
         """Charge le modèle BERT fine-tuné"""
+        if self.models_loaded.get('bert'):
+            return True
+        if "bert" not in ENABLED_MODELS:
+            return False
+        with self._load_lock:
+            return self._load_bert_model()
+    
+    def _load_bert_model(self) -> bool:
         try:
-            if self.bert_model is not None:
+            if self.bert_model is not None or self.bert_session is not None:
                 return True
                 
-            logger.info("Chargement du modèle BERT...")
+            logger.info(f"Chargement du modèle BERT (backend {BERT_BACKEND})...")
             
             # Vérifier que les fichiers existent
             if not BERT_MODEL_PATH.exists():
                 logger.error(f"Modèle BERT non trouvé: {BERT_MODEL_PATH}")
                 return False
             
+            start_time = time.time()
+            rss_before = psutil.Process().memory_info().rss
+            
             # Charger le tokenizer et le modèle
-            self.bert_tokenizer = AutoTokenizer.from_pretrained(str(BERT_MODEL_PATH))
-            self.bert_model = AutoModelForSequenceClassification.from_pretrained(
-                str(BERT_MODEL_PATH)
-            )
-            self.bert_model.to(self.device)
-            self.bert_model.eval()
+            with self.timed_phase("bert.import_transformers"):
+                from transformers import AutoTokenizer
+            with self.timed_phase("bert.tokenizer"):
+                self.bert_tokenizer = AutoTokenizer.from_pretrained(str(BERT_MODEL_PATH))
+            version = self._read_model_version(BERT_MODEL_PATH)
+            
+            if BERT_BACKEND == "onnx":
+                try:
+                    with self.timed_phase("bert.onnx_session"):
+                        from .onnx_backend import load_onnx_bert_session
+                        self.bert_session = load_onnx_bert_session()
+                    self.bert_backend = "onnx-int8" if BERT_ONNX_QUANTIZE else "onnx"
+                    self.bert_precision = "int8" if BERT_ONNX_QUANTIZE else "fp32"
+                except Exception as e:
+                    logger.warning(f"⚠️ Backend ONNX indisponible, repli sur PyTorch: {e}")
+            
+            if self.bert_session is None:
+                self._load_torch_bert_model()
+            
+            self.bert_runtime[self.bert_precision] = {
+                "backend": self.bert_backend,
+                "load_time_s": round(time.time() - start_time, 3),
+                "rss_delta_mb": round((psutil.Process().memory_info().rss - rss_before) / 1024 / 1024, 1),
+                "model_size_mb": (
+                    round(model_size_mb(self.bert_model), 1) if self.bert_model is not None
+                    else round(self.bert_session.onnx_path.stat().st_size / 1024 / 1024, 1)
+                )
+            }
+            self.bert_latency[self.bert_precision] = LatencyTracker()
             
             self.models_loaded['bert'] = True
+            # Les scores diffèrent légèrement selon le backend: clé de cache distincte
+            self.model_versions['bert'] = f"{version}+{self.bert_backend}"
+            if BERT_SLIDING_WINDOW_ENABLED:
+                self.model_versions['bert'] += f"+window-{BERT_WINDOW_POOLING}"
             logger.info("✅ Modèle BERT chargé avec succès")
             return True
             
@@ -61,14 +159,94 @@ class ModelPredictor:
             self.models_loaded['bert'] = False
             return False
     
+    def _load_torch_bert_model(self):
+        """Backend PyTorch: threads selon le quota CPU, quantification int8 optionnelle"""
+        with self.timed_phase("bert.import_torch"):
+            import torch
+        
+        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        if self.device.type == "cpu":
+            self.torch_threads = configure_torch_threads()
+        
+        with self.timed_phase("bert.weights"):
+            model = self._read_bert_weights()
+        model.eval()
+        
+        if BERT_PRECISION == "int8" and self.device.type == "cpu":
+            with self.timed_phase("bert.quantize"):
+                self.bert_model = quantize_dynamic_int8(model)
+            self.bert_backend = "torch-int8"
+            self.bert_precision = "int8"
+        else:
+            if BERT_PRECISION == "int8":
+                logger.warning("⚠️ Quantification int8 réservée au CPU, modèle chargé en fp32")
+            self.bert_model = model.to(self.device)
+            self.bert_backend = "torch"
+            self.bert_precision = "fp32"
+    
+    def _read_bert_weights(self):
+        """
+        Construit le modèle BERT
+
+        Avec model.safetensors, les tenseurs fp32 restent adossés au fichier
+        projeté en mémoire (assign=True): les workers partagent ces pages en
+        lecture seule au lieu d'en garder chacun une copie anonyme.
+        """
+        from transformers import AutoConfig, AutoModelForSequenceClassification
+        
+        safetensors_path = BERT_MODEL_PATH / "model.safetensors"
+        if BERT_MMAP_WEIGHTS and safetensors_path.exists():
+            try:
+                from safetensors.torch import load_file
+                from transformers.modeling_utils import no_init_weights
+                
+                config = AutoConfig.from_pretrained(str(BERT_MODEL_PATH))
+                with no_init_weights():
+                    model = AutoModelForSequenceClassification.from_config(config)
+                
+                result = model.load_state_dict(load_file(str(safetensors_path)), strict=False, assign=True)
+                parameter_names = {name for name, _ in model.named_parameters()}
+                missing = [key for key in result.missing_keys if key in parameter_names]
+                if missing or result.unexpected_keys:
+                    raise ValueError(f"poids manquants {missing[:3]} ou inattendus {result.unexpected_keys[:3]}")
+                
+                model.tie_weights()
+                logger.info("📎 Poids BERT projetés en mémoire depuis model.safetensors")
+                return model
+            except Exception as e:
+                logger.warning(f"⚠️ Lecture mmap des poids impossible, chargement classique: {e}")
+        
+        return AutoModelForSequenceClassification.from_pretrained(str(BERT_MODEL_PATH))
+    
     def load_simple_model(self) -> bool:
         """Charge le modèle simple (TF-IDF + Logistic Regression)"""
+        if self.models_loaded.get('simple'):
+            return True
+        if "simple" not in ENABLED_MODELS:
+            return False
+        with self._load_lock:
+            return self._load_simple_model()
+    
+    def _load_simple_model(self) -> bool:
         try:
-            if self.simple_model is not None:
+            if self.simple_model is not None or self.simple_scorer is not None:
                 return True
                 
             logger.info("Chargement du modèle simple...")
-              # Chemins des fichiers
+            
+            # Artefact compact: ni sklearn ni pickle, poids projetés en mémoire
+            if SIMPLE_FAST_SCORER_ENABLED and (SIMPLE_COMPACT_PATH / "scorer.json").exists():
+                try:
+                    with self.timed_phase("simple.compact"):
+                        self.simple_scorer = LinearTfidfScorer.load(SIMPLE_COMPACT_PATH)
+                    self.models_loaded['simple'] = True
+                    self.model_versions['simple'] = self._read_model_version(SIMPLE_MODEL_PATH)
+                    logger.info("✅ Modèle simple chargé (artefact compact)")
+                    return True
+                except Exception as e:
+                    logger.warning(f"⚠️ Artefact compact illisible, chargement des pickles: {e}")
+            
+            # Chemins des fichiers
             model_path = SIMPLE_MODEL_PATH / "best_simple_model.pkl"
             vectorizer_path = SIMPLE_MODEL_PATH / "tfidf_vectorizer.pkl"
             
@@ -76,14 +254,18 @@ class ModelPredictor:
                 logger.warning(f"Fichiers du modèle simple non trouvés, création d'un modèle dummy")
                 return self.create_dummy_simple_model()
             
-            # Charger le modèle et le vectorizer
-            with open(model_path, 'rb') as f:
-                self.simple_model = pickle.load(f)
-            
-            with open(vectorizer_path, 'rb') as f:
-                self.tfidf_vectorizer = pickle.load(f)
+            # Charger le modèle et le vectorizer (importe sklearn)
+            with self.timed_phase("simple.unpickle"):
+                with open(model_path, 'rb') as f:
+                    self.simple_model = pickle.load(f)
+                
+                with open(vectorizer_path, 'rb') as f:
+                    self.tfidf_vectorizer = pickle.load(f)
             
+            with self.timed_phase("simple.scorer"):
+                self._build_simple_scorer()
             self.models_loaded['simple'] = True
+            self.model_versions['simple'] = self._read_model_version(SIMPLE_MODEL_PATH)
             logger.info("✅ Modèle simple chargé avec succès")
             return True
             
@@ -98,9 +280,9 @@ class ModelPredictor:
             logger.info("Création d'un modèle simple dummy...")
             
             # Créer un modèle et vectorizer dummy
-            from sklearn.feature_extraction.text import TfidfVectorizer
-            from sklearn.linear_model import LogisticRegression
-            import numpy as np
+            with self.timed_phase("simple.import_sklearn"):
+                from sklearn.feature_extraction.text import TfidfVectorizer
+                from sklearn.linear_model import LogisticRegression
             
             # Données d'entraînement minimales
             dummy_texts = [
@@ -116,7 +298,9 @@ class ModelPredictor:
             self.simple_model = LogisticRegression(random_state=42)
             self.simple_model.fit(X, dummy_labels)
             
+            self._build_simple_scorer()
             self.models_loaded['simple'] = True
+            self.model_versions['simple'] = "dummy"
             logger.info("✅ Modèle simple dummy créé avec succès")
             return True
             
@@ -125,51 +309,111 @@ class ModelPredictor:
             self.models_loaded['simple'] = False
             return False
     
+    def _build_simple_scorer(self):
+        """Exporte TF-IDF + régression logistique vers le scoreur fusionné NumPy"""
+        self.simple_scorer = (
+            build_fast_scorer(self.tfidf_vectorizer, self.simple_model)
+            if SIMPLE_FAST_SCORER_ENABLED else None
+        )
+    
     def clean_text_light(self, text: str) -> str:
         """Nettoyage léger du texte (comme pour BERT)"""
-        if not isinstance(text, str):
-            return ""
-        
-        # Supprimer les URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        
-        # Supprimer les espaces multiples
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Trim
-        text = text.strip()
-        
-        return text
+        return clean_text_light(text)
     
     def clean_text_full(self, text: str) -> str:
         """Nettoyage complet du texte (pour modèle simple)"""
-        if not isinstance(text, str):
-            return ""
-        
-        text = str(text)
-        
-        # Minuscules
-        text = text.lower()
+        return clean_text_full(text)
+    
+    def _bert_categories(self, toxic_prob: float) -> Dict:
+        """Scores détaillés (simulés pour BERT binaire)"""
+        return {
+            'toxic': toxic_prob,
+            'severe_toxic': toxic_prob * 0.7 if toxic_prob > 0.8 else 0.0,
+            'obscene': toxic_prob * 0.8 if toxic_prob > 0.6 else 0.0,
+            'threat': toxic_prob * 0.5 if toxic_prob > 0.9 else 0.0,
+            'insult': toxic_prob * 0.9 if toxic_prob > 0.5 else 0.0,
+            'identity_hate': toxic_prob * 0.6 if toxic_prob > 0.7 else 0.0
+        }
+    
+    def _score_bert_cleaned(
+        self, cleaned_texts: List[str], timer: Optional[StageTimer] = None
+    ) -> List[Tuple[float, float]]:
+        """Scores BERT d'une liste de textes déjà nettoyés (latence enregistrée)"""
+        start_time = time.perf_counter()
+        scores = self._forward_bert(cleaned_texts, timer or StageTimer())
+        self.bert_latency[self.bert_precision].record((time.perf_counter() - start_time) * 1000)
+        return scores
+    
+    def _tokenize_bert(self, cleaned_texts: List[str]) -> Tuple[Dict, np.ndarray]:
+        """
+        Tokenisation sans padding (tronquée, ou en fenêtres glissantes si activé)
+
+        Retourne les entrées du modèle par séquence et, pour chaque séquence,
+        l'indice du texte d'origine.
+        """
+        if not BERT_SLIDING_WINDOW_ENABLED:
+            encoded = self.bert_tokenizer(cleaned_texts, truncation=True, max_length=BERT_MAX_LENGTH)
+            return encoded, np.arange(len(cleaned_texts))
         
-        # Supprimer les URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+        encoded = self.bert_tokenizer(
+            cleaned_texts,
+            truncation=True,
+            max_length=BERT_MAX_LENGTH,
+            stride=BERT_WINDOW_STRIDE,
+            return_overflowing_tokens=True
+        )
+        sample_mapping = np.asarray(encoded.pop("overflow_to_sample_mapping"))
         
-        # Supprimer les mentions (@username)
-        text = re.sub(r'@\w+', '', text)
+        # Limiter le nombre de fenêtres par texte (coût borné par requête)
+        window_rank = np.arange(len(sample_mapping)) - np.searchsorted(sample_mapping, sample_mapping)
+        keep = np.flatnonzero(window_rank < BERT_MAX_WINDOWS)
+        if len(keep) < len(sample_mapping):
+            encoded = {name: [values[i] for i in keep] for name, values in encoded.items()}
+            sample_mapping = sample_mapping[keep]
+        return encoded, sample_mapping
+    
+    def _bert_probabilities(self, inputs: Dict) -> np.ndarray:
+        """Probabilités (séquences, classes) pour un lot déjà paddé"""
+        if self.bert_session is not None:
+            return self.bert_session.predict_proba(inputs)
         
-        # Supprimer les hashtags (#hashtag)
-        text = re.sub(r'#\w+', '', text)
+        import torch
         
-        # Supprimer les caractères non alphabétiques (garder espaces)
-        text = re.sub(r'[^a-zA-Z\s]', ' ', text)
+        with torch.no_grad():
+            inputs = {name: torch.as_tensor(values).to(self.device) for name, values in inputs.items()}
+            logits = self.bert_model(**inputs).logits
+            return torch.softmax(logits, dim=1).cpu().numpy()
+    
+    def _forward_bert(self, cleaned_texts: List[str], timer: StageTimer) -> List[Tuple[float, float]]:
+        """
+        Passage BERT sur une liste de textes déjà nettoyés
+
+        Les séquences sont regroupées par tranche de longueur et chaque groupe
+        n'est paddé qu'à sa plus longue séquence. En mode fenêtres glissantes,
+        les scores des fenêtres sont agrégés par texte (BERT_WINDOW_POOLING).
+        """
+        encoded, sample_mapping = self._tokenize_bert(cleaned_texts)
+        timer.lap("tokenize")
+        input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in encoded]
+        lengths = [len(ids) for ids in encoded["input_ids"]]
         
-        # Supprimer les espaces multiples
-        text = re.sub(r'\s+', ' ', text)
+        probabilities = np.empty((len(lengths), 2))
+        for indices in bucket_by_length(lengths, BERT_LENGTH_BUCKETS).values():
+            batch = self.bert_tokenizer.pad(
+                {name: [encoded[name][i] for i in indices] for name in input_names},
+                padding="longest",
+                return_tensors="np"
+            )
+            timer.lap("tokenize")
+            probabilities[indices] = self._bert_probabilities(dict(batch))
+            timer.lap("infer")
         
-        # Trim
-        text = text.strip()
+        if BERT_SLIDING_WINDOW_ENABLED:
+            probabilities = pool_window_scores(
+                probabilities, sample_mapping, len(cleaned_texts), BERT_WINDOW_POOLING
+            )
         
-        return text
+        return list(zip(probabilities[:, 1].tolist(), probabilities.max(axis=1).tolist()))
     
     def predict_bert(self, text: str) -> Tuple[float, float, Dict]:
         """Prédiction avec le modèle BERT"""
@@ -179,34 +423,33 @@ class ModelPredictor:
         # Nettoyer le texte
         cleaned_text = self.clean_text_light(text)
         
-        # Tokeniser
-        inputs = self.bert_tokenizer(
-            cleaned_text,
-            return_tensors="pt",
-            truncation=True,
-            padding=True,
-            max_length=128
-        ).to(self.device)
+        toxic_prob, confidence = self._score_bert_cleaned([cleaned_text])[0]
+        return toxic_prob, confidence, self._bert_categories(toxic_prob)
+    
+    def predict_bert_batch(self, texts: List[str]) -> List[Tuple[float, float, Dict]]:
+        """Prédiction BERT groupée: un passage du modèle par tranche de longueur"""
+        if not self.load_bert_model():
+            raise RuntimeError("Modèle BERT non disponible")
         
-        # Prédiction
-        with torch.no_grad():
-            outputs = self.bert_model(**inputs)
-            logits = outputs.logits
-            probabilities = torch.softmax(logits, dim=1)
-            toxic_prob = probabilities[0, 1].item()
-            confidence = torch.max(probabilities, dim=1)[0].item()
-        
-        # Créer des scores détaillés (simulés pour BERT binaire)
-        categories = {
-            'toxic': toxic_prob,
-            'severe_toxic': toxic_prob * 0.7 if toxic_prob > 0.8 else 0.0,
-            'obscene': toxic_prob * 0.8 if toxic_prob > 0.6 else 0.0,
-            'threat': toxic_prob * 0.5 if toxic_prob > 0.9 else 0.0,
-            'insult': toxic_prob * 0.9 if toxic_prob > 0.5 else 0.0,
-            'identity_hate': toxic_prob * 0.6 if toxic_prob > 0.7 else 0.0
-        }
+        if not texts:
+            return []
         
-        return toxic_prob, confidence, categories
+        cleaned_texts = [self.clean_text_light(text) for text in texts]
+        return [
+            (toxic_prob, confidence, self._bert_categories(toxic_prob))
+            for toxic_prob, confidence in self._score_bert_cleaned(cleaned_texts)
+        ]
+    
+    def _simple_categories(self, prob: float) -> Dict:
+        """Scores détaillés (simulés pour le modèle simple)"""
+        return {
+            'toxic': prob,
+            'severe_toxic': prob * 0.6 if prob > 0.8 else 0.0,
+            'obscene': prob * 0.7 if prob > 0.6 else 0.0,
+            'threat': prob * 0.4 if prob > 0.9 else 0.0,
+            'insult': prob * 0.8 if prob > 0.5 else 0.0,
+            'identity_hate': prob * 0.5 if prob > 0.7 else 0.0
+        }
     
     def predict_simple(self, text: str) -> Tuple[float, float, Dict]:
         """Prédiction avec le modèle simple"""
@@ -216,63 +459,141 @@ class ModelPredictor:
         # Nettoyer le texte
         cleaned_text = self.clean_text_full(text)
         
-        # Vectoriser
-        X = self.tfidf_vectorizer.transform([cleaned_text])
+        prob, confidence = self._score_simple_cleaned([cleaned_text])[0]
+        return prob, confidence, self._simple_categories(prob)
+    
+    def predict_simple_batch(self, texts: List[str]) -> List[Tuple[float, float, Dict]]:
+        """Prédiction simple vectorisée: un seul transform + predict_proba pour tout le lot"""
+        if not self.load_simple_model():
+            raise RuntimeError("Modèle simple non disponible")
         
-        # Prédiction
-        prob = self.simple_model.predict_proba(X)[0, 1]
-        confidence = max(self.simple_model.predict_proba(X)[0])
+        if not texts:
+            return []
         
-        # Créer des scores détaillés (simulés)
-        categories = {
-            'toxic': prob,
-            'severe_toxic': prob * 0.6 if prob > 0.8 else 0.0,
-            'obscene': prob * 0.7 if prob > 0.6 else 0.0,
-            'threat': prob * 0.4 if prob > 0.9 else 0.0,
-            'insult': prob * 0.8 if prob > 0.5 else 0.0,
-            'identity_hate': prob * 0.5 if prob > 0.7 else 0.0
-        }
+        cleaned_texts = [self.clean_text_full(text) for text in texts]
+        return [
+            (prob, confidence, self._simple_categories(prob))
+            for prob, confidence in self._score_simple_cleaned(cleaned_texts)
+        ]
+    
+    def _score_simple_cleaned(
+        self, cleaned_texts: List[str], timer: Optional[StageTimer] = None
+    ) -> List[Tuple[float, float]]:
+        """Un seul transform + predict_proba sur une liste de textes déjà nettoyés"""
+        timer = timer or StageTimer()
+        if self.simple_scorer is not None:
+            term_counts = self.simple_scorer.count_terms(cleaned_texts)
+            timer.lap("vectorize")
+            scores = self.simple_scorer.score_counts(len(cleaned_texts), term_counts)
+            timer.lap("infer")
+            return scores
         
-        return prob, confidence, categories
+        X = self.tfidf_vectorizer.transform(cleaned_texts)
+        timer.lap("vectorize")
+        probabilities = self.simple_model.predict_proba(X)
+        timer.lap("infer")
+        toxic_probs = probabilities[:, 1].tolist()
+        confidences = probabilities.max(axis=1).tolist()
+        
+        return list(zip(toxic_probs, confidences))
+    
+    def _build_result(
+        self,
+        toxic_prob: float,
+        confidence: float,
+        categories: Dict,
+        model_name: str,
+        start_time: float
+    ) -> Dict:
+        """Construit le dictionnaire de résultat (score 0-100, niveau, temps)"""
+        # Calculer le score (0-100)
+        score = int(toxic_prob * 100)
+        
+        # Déterminer le niveau de toxicité
+        toxicity_level = "low"
+        for level, (min_score, max_score) in TOXICITY_LEVELS.items():
+            if min_score <= score < max_score:
+                toxicity_level = level
+                break
+        
+        # Temps de traitement
+        processing_time = (time.time() - start_time) * 1000
+        
+        return {
+            "score": score,
+            "toxicity_level": toxicity_level,
+            "confidence": confidence,
+            "categories": categories,
+            "model_used": model_name,
+            "processing_time_ms": processing_time
+        }
     
     def predict(self, text: str, model_name: str = "bert") -> Dict:
         """Prédiction unifiée"""
+        return self.predict_batch([text], model_name)[0]
+    
+    def predict_batch(self, texts: List[str], model_name: str = "bert") -> List[Dict]:
+        """
+        Prédiction unifiée sur une liste de textes
+        
+        Les scores déjà connus sont servis par le cache; les textes restants
+        (dédoublonnés) passent en une seule fois dans le modèle. Chaque résultat
+        porte la durée des étapes de son lot (`stage_seconds`, voir app/stages.py).
+        """
         start_time = time.time()
+        timer = StageTimer()
         
-        # Valider la longueur du texte
-        if len(text) > MAX_TEXT_LENGTH:
-            text = text[:MAX_TEXT_LENGTH]
+        # Valider la longueur des textes
+        texts = [text[:MAX_TEXT_LENGTH] for text in texts]
         
         try:
             # Choisir le modèle
             if model_name == "bert":
-                toxic_prob, confidence, categories = self.predict_bert(text)
+                if not self.load_bert_model():
+                    raise RuntimeError("Modèle BERT non disponible")
+                clean_fn, score_fn, categories_fn = (
+                    self.clean_text_light, self._score_bert_cleaned, self._bert_categories
+                )
             elif model_name == "simple":
-                toxic_prob, confidence, categories = self.predict_simple(text)
+                if not self.load_simple_model():
+                    raise RuntimeError("Modèle simple non disponible")
+                clean_fn, score_fn, categories_fn = (
+                    self.clean_text_full, self._score_simple_cleaned, self._simple_categories
+                )
             else:
                 raise ValueError(f"Modèle non supporté: {model_name}")
             
-            # Calculer le score (0-100)
-            score = int(toxic_prob * 100)
+            cleaned_texts = [clean_fn(text) for text in texts]
+            timer.lap("clean")
+            scores: List[Optional[Tuple[float, float]]] = [None] * len(texts)
             
-            # Déterminer le niveau de toxicité
-            toxicity_level = "low"
-            for level, (min_score, max_score) in TOXICITY_LEVELS.items():
-                if min_score <= score < max_score:
-                    toxicity_level = level
-                    break
+            # Consulter le cache (clé = empreinte du texte nettoyé + modèle + version)
+            keys = None
+            if self.score_cache is not None:
+                version = self.model_versions.get(model_name, "unknown")
+                keys = [make_cache_key(cleaned, model_name, version) for cleaned in cleaned_texts]
+                scores = self.score_cache.get_many(keys, model_name)
+                timer.lap("cache")
             
-            # Temps de traitement
-            processing_time = (time.time() - start_time) * 1000
+            # Inférence sur les textes manquants, chaque texte distinct une seule fois
+            missing = [i for i, score in enumerate(scores) if score is None]
+            if missing:
+                unique_texts = list(dict.fromkeys(cleaned_texts[i] for i in missing))
+                computed = dict(zip(unique_texts, score_fn(unique_texts, timer)))
+                for i in missing:
+                    scores[i] = computed[cleaned_texts[i]]
+                if keys is not None:
+                    self.score_cache.set_many({keys[i]: scores[i] for i in missing}, model_name)
+                    timer.lap("cache")
             
-            return {
-                "score": score,
-                "toxicity_level": toxicity_level,
-                "confidence": confidence,
-                "categories": categories,
-                "model_used": model_name,
-                "processing_time_ms": processing_time
-            }
+            results = [
+                self._build_result(toxic_prob, confidence, categories_fn(toxic_prob), model_name, start_time)
+                for toxic_prob, confidence in scores
+            ]
+            timer.lap("postprocess")
+            for result in results:
+                result["stage_seconds"] = timer.stages
+            return results
             
         except Exception as e:
             logger.error(f"Erreur lors de la prédiction: {str(e)}")
@@ -285,10 +606,30 @@ class ModelPredictor:
     def get_model_info(self) -> Dict:
         """Retourne les informations sur les modèles chargés"""
         info = {
-            "device": str(self.device),
-            "models_loaded": self.models_loaded.copy()
+            "device": str(self.device) if self.device is not None else "cpu",
+            "enabled_models": ENABLED_MODELS,
+            "startup_timings": self.startup_timings.copy(),
+            "models_loaded": self.models_loaded.copy(),
+            "model_versions": self.model_versions.copy(),
+            "bert_backend": self.bert_backend,
+            "torch_threads": self.torch_threads,
+            "bert_tokenization": {
+                "length_buckets": BERT_LENGTH_BUCKETS,
+                "sliding_window": BERT_SLIDING_WINDOW_ENABLED,
+                "window_stride": BERT_WINDOW_STRIDE,
+                "window_pooling": BERT_WINDOW_POOLING,
+                "max_windows": BERT_MAX_WINDOWS
+            },
+            "bert_runtime": {
+                precision: {**runtime, "latency_ms": self.bert_latency[precision].summary()}
+                for precision, runtime in self.bert_runtime.items()
+            },
+            "simple_scorer": "fused" if self.simple_scorer is not None else "sklearn"
         }
         
+        if self.score_cache is not None:
+            info["score_cache"] = self.score_cache.get_info()
+        
         # Ajouter les métadonnées si disponibles
         try:
             if BERT_MODEL_PATH.exists():
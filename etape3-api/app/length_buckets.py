@@ -0,0 +1,50 @@
+"""
+Regroupement des textes BERT par longueur et agrégation des fenêtres glissantes
+
+La plupart des commentaires font moins de 20 tokens: les regrouper par tranche
+de longueur évite de les padder jusqu'au plus long texte du lot. Les textes
+longs peuvent être découpés en fenêtres glissantes dont les scores sont
+ensuite agrégés (max ou moyenne) par texte d'origine.
+"""
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
+def bucket_by_length(lengths: Sequence[int], buckets: Sequence[int]) -> Dict[int, List[int]]:
+    """
+    Indices des séquences regroupés par tranche de longueur
+
+    Chaque séquence va dans la plus petite tranche qui la contient (la
+    dernière tranche reçoit tout ce qui dépasse).
+    """
+    bounds = sorted(buckets)
+    groups: Dict[int, List[int]] = {}
+    for index, length in enumerate(lengths):
+        bucket = next((bound for bound in bounds if length <= bound), bounds[-1])
+        groups.setdefault(bucket, []).append(index)
+    return groups
+
+
+def pool_window_scores(
+    probabilities: np.ndarray,
+    sample_mapping: Sequence[int],
+    n_samples: int,
+    pooling: str = "max"
+) -> np.ndarray:
+    """
+    Agrège les probabilités (fenêtres, classes) en (textes, classes)
+
+    - "max": la fenêtre la plus toxique représente le texte
+    - "mean": moyenne des fenêtres
+    """
+    sample_mapping = np.asarray(sample_mapping)
+    pooled = np.empty((n_samples, probabilities.shape[1]), dtype=probabilities.dtype)
+
+    for sample in range(n_samples):
+        windows = probabilities[sample_mapping == sample]
+        if pooling == "mean":
+            pooled[sample] = windows.mean(axis=0)
+        else:
+            pooled[sample] = windows[np.argmax(windows[:, 1])]
+    return pooled
@@ -3,31 +3,48 @@ API FastAPI pour Digital Social Score - Détection de Toxicité
 Conforme RGPD - Aucune donnée stockée
 """
 import time
+import asyncio
 import logging
 import psutil
-from datetime import datetime
-from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
+from typing import Dict, List, Literal, Optional
+from fastapi import FastAPI, HTTPException, Request, BackgroundTasks, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from contextlib import asynccontextmanager
 import uvicorn
 
 from .config import (
     API_TITLE, API_DESCRIPTION, API_VERSION, 
-    ALLOWED_ORIGINS, LOG_LEVEL, LOG_FORMAT
+    ALLOWED_ORIGINS, LOG_LEVEL, LOG_FORMAT, MAX_TEXT_LENGTH,
+    BERT_BATCHING_ENABLED, BERT_BATCH_MAX_SIZE, BERT_BATCH_MAX_WAIT_MS, WARMUP_ENABLED,
+    ENABLED_MODELS, PROFILER_MAX_SECONDS, PROFILER_INTERVAL_MS, PROFILER_CONTINUOUS_ENABLED,
+    PROFILER_CONTINUOUS_INTERVAL_MS, PROFILER_CONTINUOUS_MODE, PROFILER_CONTINUOUS_MINUTES
 )
 from .models import (
     AnalyzeRequest, AnalyzeResponse, ToxicityCategories,
-    HealthResponse, ErrorResponse, StatsResponse
+    BatchAnalyzeRequest, BatchAnalyzeResponse, BatchItemResult,
+    HealthResponse, ReadinessResponse, ErrorResponse, StatsResponse
 )
 from .inference import predictor
+from .batching import MicroBatcher
+from .executor import inference_pools, InferencePoolFull
+from .warmup import warmup_models
+from .stats import RequestStats
+from .stages import observe_stages, request_trace_id, with_queue_wait
+from .auth import require_admin
+from .profiler import ProfileData, SamplingProfiler
 
 # ✅ Import des métriques Prometheus (pour monitoring avancé)
 try:
-    from .metrics import setup_metrics, toxicity_requests, toxicity_score, toxicity_processing_time
+    from .metrics import (
+        setup_metrics, toxicity_requests, toxicity_score, toxicity_processing_time,
+        stats_requests, stats_processing_ms, stats_last_request
+    )
+    from .multiprocess import MULTIPROCESS_ENABLED, aggregate_request_stats
     METRICS_ENABLED = True
 except ImportError:
     METRICS_ENABLED = False
+    MULTIPROCESS_ENABLED = False
     # Le logger sera défini plus bas
 
 # ✅ CORRECTION: Configuration du logging sécurisée
@@ -45,43 +62,107 @@ except (AttributeError, ValueError):
 
 logger = logging.getLogger(__name__)
 
+# File de micro-batching BERT: les requêtes concurrentes partagent un forward pass
+bert_batcher = MicroBatcher(
+    lambda texts: predictor.predict_batch(texts, "bert"),
+    max_batch_size=BERT_BATCH_MAX_SIZE,
+    max_wait_ms=BERT_BATCH_MAX_WAIT_MS,
+    model_type="bert",
+    runner=inference_pools["bert"].run
+)
+
 # Variables globales pour les statistiques
 app_start_time = time.time()
-request_stats = {
-    "total_requests": 0,
-    "requests_per_model": {"bert": 0, "simple": 0},
-    "processing_times": [],
-    "toxicity_distribution": {"low": 0, "medium": 0, "high": 0, "extreme": 0},
-    "last_request": None
+request_stats = RequestStats()
+
+# Profileur continu: fenêtres d'une minute, N dernières minutes en mémoire
+continuous_profiler = (
+    SamplingProfiler(
+        PROFILER_CONTINUOUS_INTERVAL_MS / 1000,
+        PROFILER_CONTINUOUS_MODE,
+        bucket_seconds=60,
+        max_buckets=PROFILER_CONTINUOUS_MINUTES
+    )
+    if PROFILER_CONTINUOUS_ENABLED else None
+)
+# Un seul profil ponctuel à la fois
+profile_lock = asyncio.Lock()
+
+# État de démarrage: le pod n'est prêt qu'une fois les modèles chargés et échauffés
+startup_state = {
+    "startup_complete": False,
+    "warmup_seconds": {}
 }
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Gestion du cycle de vie de l'application"""
-    # Startup
-    logger.info("🚀 Démarrage de l'API Digital Social Score")
+def prepare_models():
+    """
+    Pré-charge puis échauffe les modèles (hors de la boucle asyncio)
+    
+    Sous gunicorn --preload, les modèles déjà chargés par le master
+    (partagés par copie sur écriture) ne sont pas rechargés: seul
+    l'échauffement est fait dans chaque worker.
+    """
     logger.info("📦 Pré-chargement des modèles...")
     
     # Pré-charger le modèle BERT (le plus utilisé)
-    try:
-        predictor.load_bert_model()
-        logger.info("✅ Modèle BERT pré-chargé")
-    except Exception as e:
-        logger.warning(f"⚠️ Échec du pré-chargement BERT: {e}")
+    if "bert" in ENABLED_MODELS and not predictor.is_model_loaded("bert"):
+        try:
+            with predictor.timed_phase("bert.total"):
+                loaded = predictor.load_bert_model()
+            if loaded:
+                logger.info("✅ Modèle BERT pré-chargé")
+        except Exception as e:
+            logger.warning(f"⚠️ Échec du pré-chargement BERT: {e}")
     
     # Pré-charger le modèle simple
-    try:
-        predictor.load_simple_model()
-        logger.info("✅ Modèle simple pré-chargé")
-    except Exception as e:
-        logger.warning(f"⚠️ Échec du pré-chargement modèle simple: {e}")
+    if "simple" in ENABLED_MODELS and not predictor.is_model_loaded("simple"):
+        try:
+            with predictor.timed_phase("simple.total"):
+                loaded = predictor.load_simple_model()
+            if loaded:
+                logger.info("✅ Modèle simple pré-chargé")
+        except Exception as e:
+            logger.warning(f"⚠️ Échec du pré-chargement modèle simple: {e}")
+    
+    # Échauffement: premières inférences avant de recevoir du trafic
+    if WARMUP_ENABLED:
+        startup_state["warmup_seconds"] = warmup_models(predictor)
+        for model_name, duration in startup_state["warmup_seconds"].items():
+            predictor.startup_timings[f"warmup.{model_name}"] = duration
     
+    predictor.startup_timings["startup.total"] = round(time.time() - app_start_time, 3)
+    startup_state["startup_complete"] = True
     logger.info("🎉 API prête à traiter les requêtes")
+
+def is_ready() -> bool:
+    """Prêt: démarrage terminé et au moins un modèle chargé"""
+    return startup_state["startup_complete"] and any([
+        predictor.is_model_loaded("bert"),
+        predictor.is_model_loaded("simple")
+    ])
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Gestion du cycle de vie de l'application"""
+    # Startup
+    logger.info("🚀 Démarrage de l'API Digital Social Score")
+    
+    # Chargement et échauffement en tâche de fond: /health/live répond
+    # immédiatement, /health/ready attend la fin de l'échauffement
+    asyncio.get_running_loop().run_in_executor(None, prepare_models)
+    
+    if continuous_profiler is not None:
+        continuous_profiler.start()
+        logger.info(f"🔬 Profileur continu actif ({PROFILER_CONTINUOUS_MODE}, {PROFILER_CONTINUOUS_MINUTES} min)")
     
     yield
     
     # Shutdown
     logger.info("🛑 Arrêt de l'API Digital Social Score")
+    if continuous_profiler is not None:
+        continuous_profiler.stop()
+    for pool in inference_pools.values():
+        pool.shutdown()
 
 # Création de l'application FastAPI
 app = FastAPI(
@@ -132,15 +213,43 @@ async def log_requests(request: Request, call_next):
 
 def update_stats(model_used: str, processing_time: float, toxicity_level: str):
     """Met à jour les statistiques globales"""
-    request_stats["total_requests"] += 1
-    request_stats["requests_per_model"][model_used] += 1
-    request_stats["processing_times"].append(processing_time)
-    request_stats["toxicity_distribution"][toxicity_level] += 1
-    request_stats["last_request"] = datetime.now()
+    request_stats.record(model_used, processing_time, toxicity_level)
     
-    # Garder seulement les 1000 derniers temps de traitement
-    if len(request_stats["processing_times"]) > 1000:
-        request_stats["processing_times"] = request_stats["processing_times"][-1000:]
+    # Compteurs Prometheus équivalents: /stats les agrège entre workers
+    if METRICS_ENABLED:
+        stats_requests.labels(model_type=model_used, toxicity_level=toxicity_level).inc()
+        stats_processing_ms.labels(model_type=model_used).inc(processing_time)
+        stats_last_request.set(time.time())
+
+def record_prediction_metrics(result: Dict):
+    """Enregistre les métriques Prometheus d'une prédiction réussie"""
+    if not METRICS_ENABLED:
+        return
+    
+    # Compter la requête
+    toxicity_requests.labels(
+        model_type=result["model_used"],
+        status="success"
+    ).inc()
+    
+    # Enregistrer le score
+    toxicity_score.observe(result["score"])
+    
+    # Enregistrer le temps de traitement
+    toxicity_processing_time.labels(
+        model_type=result["model_used"]
+    ).observe(result["processing_time_ms"] / 1000)  # Convertir ms en secondes
+
+def build_analyze_response(result: Dict) -> AnalyzeResponse:
+    """Construit la réponse d'analyse à partir du résultat du prédicteur"""
+    return AnalyzeResponse(
+        score=result["score"],
+        toxicity_level=result["toxicity_level"],
+        confidence=result["confidence"],
+        categories=ToxicityCategories(**result["categories"]),
+        model_used=result["model_used"],
+        processing_time_ms=result["processing_time_ms"]
+    )
 
 @app.get("/", tags=["General"])
 async def root():
@@ -151,7 +260,10 @@ async def root():
         "status": "operational",
         "docs": "/docs",
         "health": "/health",
-        "analyze_endpoint": "/analyze"
+        "liveness": "/health/live",
+        "readiness": "/health/ready",
+        "analyze_endpoint": "/analyze",
+        "batch_endpoint": "/analyze/batch"
     }
 
 @app.get("/health", response_model=HealthResponse, tags=["Monitoring"])
@@ -178,6 +290,35 @@ async def health_check():
         logger.error(f"Erreur health check: {e}")
         raise HTTPException(status_code=500, detail="Health check failed")
 
+@app.get("/health/live", tags=["Monitoring"])
+async def liveness_check():
+    """Liveness (k8s): le processus répond, même pendant le chargement des modèles"""
+    return {"status": "alive", "uptime_seconds": time.time() - app_start_time}
+
+@app.get("/health/ready", response_model=ReadinessResponse, tags=["Monitoring"])
+async def readiness_check():
+    """Readiness (k8s): modèles chargés et échauffés (503 sinon)"""
+    ready = is_ready()
+    if ready:
+        status = "ready"
+    elif startup_state["startup_complete"]:
+        status = "not_ready"
+    else:
+        status = "warming_up"
+    
+    response = ReadinessResponse(
+        status=status,
+        ready=ready,
+        models_loaded={
+            "bert": predictor.is_model_loaded("bert"),
+            "simple": predictor.is_model_loaded("simple")
+        },
+        warmup_seconds=startup_state["warmup_seconds"]
+    )
+    if not ready:
+        return JSONResponse(status_code=503, content=response.model_dump())
+    return response
+
 @app.get("/models/info", tags=["Models"])
 async def models_info():
     """Informations sur les modèles chargés"""
@@ -191,26 +332,76 @@ async def models_info():
 async def get_stats():
     """Statistiques d'utilisation de l'API"""
     try:
-        avg_processing_time = (
-            sum(request_stats["processing_times"]) / len(request_stats["processing_times"])
-            if request_stats["processing_times"] else 0.0
-        )
+        stats = request_stats.snapshot()
         
-        return StatsResponse(
-            total_requests=request_stats["total_requests"],
-            requests_per_model=request_stats["requests_per_model"],
-            average_processing_time_ms=avg_processing_time,
-            toxicity_distribution=request_stats["toxicity_distribution"],
-            last_request=request_stats["last_request"]
-        )
+        # Plusieurs workers: compteurs agrégés, percentiles du worker courant
+        if MULTIPROCESS_ENABLED:
+            stats.update(aggregate_request_stats())
+        
+        return StatsResponse(**stats)
     except Exception as e:
         logger.error(f"Erreur lors de la récupération des stats: {e}")
         raise HTTPException(status_code=500, detail="Erreur interne")
 
+def profile_response(profile: ProfileData, output_format: str) -> Response:
+    """Fichier de profil téléchargeable (piles repliées ou speedscope)"""
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime(profile.started_at))
+    headers = {
+        "X-Profile-Samples": str(profile.ticks),
+        "X-Profile-Overhead": f"{profile.overhead:.4f}"
+    }
+    if output_format == "speedscope":
+        headers["Content-Disposition"] = f'attachment; filename="profile-{profile.mode}-{stamp}.speedscope.json"'
+        return JSONResponse(content=profile.to_speedscope(), headers=headers)
+    headers["Content-Disposition"] = f'attachment; filename="profile-{profile.mode}-{stamp}.collapsed.txt"'
+    return PlainTextResponse(content=profile.to_collapsed(), headers=headers)
+
+@app.post("/admin/profile", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def profile_process(
+    seconds: float = Query(10.0, gt=0, le=PROFILER_MAX_SECONDS, description="Durée du profil"),
+    mode: Literal["wall", "cpu"] = Query("wall", description="wall: tous les threads, cpu: threads actifs"),
+    output_format: Literal["collapsed", "speedscope"] = Query("collapsed", alias="format"),
+    interval_ms: float = Query(PROFILER_INTERVAL_MS, ge=1, le=1000, description="Période d'échantillonnage")
+):
+    """
+    🔬 **Profil par échantillonnage du processus** (admin, en-tête X-API-Key)
+    
+    Relève pendant `seconds` secondes la pile de tous les threads (boucle
+    asyncio, pools d'inférence) et retourne un fichier de piles repliées
+    (flamegraph.pl) ou speedscope (https://www.speedscope.app).
+    """
+    if profile_lock.locked():
+        raise HTTPException(status_code=409, detail="Un profil est déjà en cours")
+    
+    async with profile_lock:
+        profiler = SamplingProfiler(interval_ms / 1000, mode)
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profile = profiler.stop()
+    
+    logger.info(
+        f"🔬 Profil {mode} terminé: {profile.ticks} relevés en {profile.duration:.1f}s "
+        f"(surcoût {profile.overhead:.2%})"
+    )
+    return profile_response(profile, output_format)
+
+@app.get("/admin/profile/continuous", tags=["Admin"], dependencies=[Depends(require_admin)])
+async def continuous_profile(
+    minutes: float = Query(5.0, gt=0, description="Fenêtre (dernières minutes)"),
+    output_format: Literal["collapsed", "speedscope"] = Query("collapsed", alias="format")
+):
+    """🔬 **Profil continu**: piles des dernières minutes (PROFILER_CONTINUOUS_ENABLED)"""
+    if continuous_profiler is None:
+        raise HTTPException(status_code=404, detail="Profileur continu désactivé (PROFILER_CONTINUOUS_ENABLED)")
+    return profile_response(continuous_profiler.snapshot(minutes * 60), output_format)
+
 @app.post("/analyze", response_model=AnalyzeResponse, tags=["AI Analysis"])
 async def analyze_toxicity(
     request: AnalyzeRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    http_request: Request
 ):
     """
     🎯 **Analyse de Toxicité**
@@ -226,35 +417,34 @@ async def analyze_toxicity(
         
         # Timer pour Prometheus
         start_time = time.time()
+        wait_start = time.perf_counter()
+        
+        # Effectuer la prédiction hors de la boucle asyncio
+        # (BERT via la file de micro-batching, dans le pool dédié au modèle)
+        if request.model == "bert" and BERT_BATCHING_ENABLED:
+            result = await bert_batcher.submit(request.text)
+            # Inclure l'attente dans la file dans le temps de traitement
+            result["processing_time_ms"] = (time.time() - start_time) * 1000
+        else:
+            result = await inference_pools[request.model].run(
+                predictor.predict, request.text, request.model
+            )
         
-        # Effectuer la prédiction
-        result = predictor.predict(request.text, request.model)
+        # Étapes du lot + attente (micro-batching, pool) avant son traitement
+        stages = with_queue_wait(result.pop("stage_seconds"), time.perf_counter() - wait_start)
         
         # ✅ Enregistrer les métriques Prometheus
-        if METRICS_ENABLED:
-            # Compter la requête
-            toxicity_requests.labels(
-                model_type=result["model_used"],
-                status="success"
-            ).inc()
-            
-            # Enregistrer le score
-            toxicity_score.observe(result["score"])
-            
-            # Enregistrer le temps de traitement
-            toxicity_processing_time.labels(
-                model_type=result["model_used"]
-            ).observe(result["processing_time_ms"] / 1000)  # Convertir ms en secondes
+        record_prediction_metrics(result)
         
-        # Créer la réponse
-        response = AnalyzeResponse(
-            score=result["score"],
-            toxicity_level=result["toxicity_level"],
-            confidence=result["confidence"],
-            categories=ToxicityCategories(**result["categories"]),
-            model_used=result["model_used"],
-            processing_time_ms=result["processing_time_ms"]
+        # Créer et sérialiser la réponse (mesuré: étape serialize)
+        serialize_start = time.perf_counter()
+        response = Response(
+            content=build_analyze_response(result).model_dump_json(),
+            media_type="application/json"
         )
+        stages["serialize"] = time.perf_counter() - serialize_start
+        
+        observe_stages(result["model_used"], stages, request_trace_id(http_request.headers))
         
         # Mettre à jour les statistiques en arrière-plan
         background_tasks.add_task(
@@ -268,6 +458,16 @@ async def analyze_toxicity(
         
         return response
         
+    except InferencePoolFull as e:
+        # Contrôle d'admission: le pool du modèle est saturé
+        if METRICS_ENABLED:
+            toxicity_requests.labels(model_type=request.model, status="rejected").inc()
+        logger.warning(f"Requête rejetée: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="Service saturé, veuillez réessayer",
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except ValueError as e:
         # ✅ Enregistrer l'erreur dans Prometheus
         if METRICS_ENABLED:
@@ -287,6 +487,121 @@ async def analyze_toxicity(
         logger.error(f"Erreur inattendue lors de l'analyse: {e}")
         raise HTTPException(status_code=500, detail="Erreur interne du serveur")
 
+@app.post("/analyze/batch", response_model=BatchAnalyzeResponse, tags=["AI Analysis"])
+async def analyze_toxicity_batch(
+    request: BatchAnalyzeRequest,
+    background_tasks: BackgroundTasks
+):
+    """
+    📚 **Analyse de Toxicité Groupée**
+    
+    Analyse un fil de commentaires en une seule requête.
+    
+    - **texts**: Liste de textes à analyser (max 500, 5000 caractères chacun)
+    - **model**: Modèle à utiliser ("bert" ou "simple")
+    
+    Le modèle simple vectorise tout le lot en une fois; BERT traite des lots paddés.
+    Les erreurs sont renvoyées par élément sans faire échouer le lot.
+    
+    **Note RGPD**: Aucune donnée n'est stockée ou logged.
+    """
+    start_time = time.time()
+    logger.info(f"Analyse groupée demandée: {len(request.texts)} textes avec modèle: {request.model}")
+    
+    results: List[Optional[BatchItemResult]] = [None] * len(request.texts)
+    
+    # Valider chaque texte individuellement (une erreur n'invalide pas le lot)
+    valid_indices = []
+    valid_texts = []
+    for index, text in enumerate(request.texts):
+        text = text.strip()
+        if not text:
+            results[index] = BatchItemResult(index=index, error="Le texte ne peut pas être vide")
+        elif len(text) > MAX_TEXT_LENGTH:
+            results[index] = BatchItemResult(
+                index=index,
+                error=f"Texte trop long (max {MAX_TEXT_LENGTH} caractères)"
+            )
+        else:
+            valid_indices.append(index)
+            valid_texts.append(text)
+    
+    # Un seul passage pour le modèle simple, lots paddés de taille bornée pour BERT
+    chunk_size = BERT_BATCH_MAX_SIZE if request.model == "bert" else max(1, len(valid_texts))
+    
+    for start in range(0, len(valid_texts), chunk_size):
+        chunk_indices = valid_indices[start:start + chunk_size]
+        chunk_texts = valid_texts[start:start + chunk_size]
+        wait_start = time.perf_counter()
+        
+        try:
+            predictions = await inference_pools[request.model].run(
+                predictor.predict_batch, chunk_texts, request.model
+            )
+        except InferencePoolFull as e:
+            # Rien n'a encore été traité: rejeter la requête entière
+            if start == 0:
+                if METRICS_ENABLED:
+                    toxicity_requests.labels(model_type=request.model, status="rejected").inc()
+                logger.warning(f"Requête groupée rejetée: {e}")
+                raise HTTPException(
+                    status_code=503,
+                    detail="Service saturé, veuillez réessayer",
+                    headers={"Retry-After": str(e.retry_after)}
+                )
+            error = "Service saturé, veuillez réessayer"
+            status = "rejected"
+            predictions = None
+        except RuntimeError as e:
+            logger.error(f"Erreur modèle: {e}")
+            error = "Modèle temporairement indisponible"
+            status = "model_error"
+            predictions = None
+        except Exception as e:
+            logger.error(f"Erreur inattendue lors de l'analyse groupée: {e}")
+            error = "Erreur interne du serveur"
+            status = "server_error"
+            predictions = None
+        
+        if predictions is None:
+            if METRICS_ENABLED:
+                toxicity_requests.labels(model_type=request.model, status=status).inc(len(chunk_indices))
+            for index in chunk_indices:
+                results[index] = BatchItemResult(index=index, error=error)
+            continue
+        
+        # Une observation par lot: ses textes partagent les mêmes étapes
+        stages = with_queue_wait(predictions[0]["stage_seconds"], time.perf_counter() - wait_start)
+        observe_stages(request.model, stages)
+        
+        for index, result in zip(chunk_indices, predictions):
+            result.pop("stage_seconds")
+            record_prediction_metrics(result)
+            results[index] = BatchItemResult(index=index, result=build_analyze_response(result))
+            background_tasks.add_task(
+                update_stats,
+                result["model_used"],
+                result["processing_time_ms"],
+                result["toxicity_level"]
+            )
+    
+    succeeded = sum(1 for item in results if item.result is not None)
+    processing_time = (time.time() - start_time) * 1000
+    
+    logger.info(
+        f"Analyse groupée terminée - {succeeded}/{len(results)} succès - "
+        f"Temps: {processing_time:.1f}ms"
+    )
+    
+    return BatchAnalyzeResponse(
+        results=results,
+        model_used=request.model,
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        processing_time_ms=processing_time
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Gestionnaire global d'exceptions"""
@@ -308,7 +623,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         content=ErrorResponse(
             error=f"HTTP {exc.status_code}",
             message=exc.detail
-        ).model_dump(mode='json')
+        ).model_dump(mode='json'),
+        headers=getattr(exc, "headers", None)
     )
 
 if __name__ == "__main__":
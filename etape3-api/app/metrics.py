@@ -2,9 +2,18 @@
 Module pour exporter les métriques Prometheus
 Permet de monitorer l'API avec Google Cloud Monitoring ou Grafana
 """
-from prometheus_client import Counter, Histogram, Gauge
+import bisect
+import threading
+import time
+from typing import Dict, Optional
+
+from prometheus_client import Counter, Histogram, Gauge, REGISTRY
+from prometheus_client.core import HistogramMetricFamily
+from prometheus_client.samples import Exemplar
 from prometheus_fastapi_instrumentator import Instrumentator
 
+from .multiprocess import MULTIPROCESS_ENABLED
+
 # Métriques custom pour l'API de toxicité
 toxicity_requests = Counter(
     'toxicity_api_requests_total',
@@ -25,9 +34,86 @@ toxicity_processing_time = Histogram(
     buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
 )
 
+# Décomposition de la latence d'une analyse par étape (voir app/stages.py)
+STAGE_METRIC_NAME = 'toxicity_stage_seconds'
+STAGE_METRIC_DOC = 'Durée de chaque étape de l\'analyse (queue_wait, clean, vectorize, tokenize, infer, ...)'
+STAGE_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class StageHistograms:
+    """
+    Histogrammes par (modèle, étape) tenus en mémoire, exposés comme un histogramme Prometheus
+
+    Une requête observe 7 à 8 étapes: labels() + observe() de prometheus_client
+    (un verrou par compteur) coûtent ~2,5 µs chacun, ici un seul verrou et
+    un bisect par étape.
+    """
+
+    def __init__(self, name: str, documentation: str, buckets=STAGE_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # (modèle, étape) -> [comptes par bucket (+Inf inclus), somme, dernier exemplar par bucket]
+        self._series: Dict = {}
+
+    def observe_many(self, model_type: str, stages: Dict[str, float], exemplar: Optional[Dict[str, str]] = None):
+        timestamp = time.time() if exemplar else None
+        with self._lock:
+            for stage, seconds in stages.items():
+                series = self._series.get((model_type, stage))
+                if series is None:
+                    series = [[0] * (len(self.buckets) + 1), 0.0, [None] * (len(self.buckets) + 1)]
+                    self._series[(model_type, stage)] = series
+                index = bisect.bisect_left(self.buckets, seconds)
+                series[0][index] += 1
+                series[1] += seconds
+                if exemplar:
+                    series[2][index] = (exemplar, seconds, timestamp)
+
+    def collect(self):
+        family = HistogramMetricFamily(self.name, self.documentation, labels=['model_type', 'stage'])
+        with self._lock:
+            snapshot = [(key, list(counts), total, list(exemplars))
+                        for key, (counts, total, exemplars) in self._series.items()]
+
+        bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+        for (model_type, stage), counts, total, exemplars in snapshot:
+            cumulative, buckets = 0, []
+            for bound, count, exemplar in zip(bounds, counts, exemplars):
+                cumulative += count
+                buckets.append((bound, cumulative, Exemplar(*exemplar)) if exemplar else (bound, cumulative))
+            family.add_metric([model_type, stage], buckets, total)
+        yield family
+
+
+class MultiprocessStageHistograms:
+    """Même interface sur un Histogram prometheus_client, agrégé entre workers (plus coûteux)"""
+
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+        self._children: Dict = {}
+
+    def observe_many(self, model_type: str, stages: Dict[str, float], exemplar: Optional[Dict[str, str]] = None):
+        for stage, seconds in stages.items():
+            child = self._children.get((model_type, stage))
+            if child is None:
+                child = self._children[(model_type, stage)] = self._histogram.labels(model_type=model_type, stage=stage)
+            child.observe(seconds, exemplar)
+
+
+if MULTIPROCESS_ENABLED:
+    toxicity_stage_time = MultiprocessStageHistograms(
+        Histogram(STAGE_METRIC_NAME, STAGE_METRIC_DOC, ['model_type', 'stage'], buckets=STAGE_BUCKETS)
+    )
+else:
+    toxicity_stage_time = StageHistograms(STAGE_METRIC_NAME, STAGE_METRIC_DOC)
+    REGISTRY.register(toxicity_stage_time)
+
 active_users = Gauge(
     'toxicity_api_active_users',
-    'Nombre d\'utilisateurs actifs en ce moment'
+    'Nombre d\'utilisateurs actifs en ce moment',
+    multiprocess_mode='livesum'
 )
 
 model_load_time = Histogram(
@@ -36,6 +122,87 @@ model_load_time = Histogram(
     ['model_type']
 )
 
+model_warmup_time = Gauge(
+    'model_warmup_seconds',
+    'Durée de l\'échauffement des modèles au démarrage',
+    ['model_type'],
+    multiprocess_mode='max'
+)
+
+# Micro-batching: taille des lots et temps d'attente dans la file
+inference_batch_size = Histogram(
+    'toxicity_inference_batch_size',
+    'Nombre de textes par passage du modèle (micro-batching)',
+    ['model_type'],
+    buckets=[1, 2, 4, 8, 16, 32, 64, 128]
+)
+
+inference_queue_wait = Histogram(
+    'toxicity_inference_queue_wait_seconds',
+    'Temps d\'attente dans la file de micro-batching avant inférence',
+    ['model_type'],
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25]
+)
+
+# Pools d'inférence: tâches en attente et en cours d'exécution
+inference_queue_depth = Gauge(
+    'toxicity_inference_queue_depth',
+    'Nombre de tâches d\'inférence en attente dans le pool',
+    ['model_type'],
+    multiprocess_mode='livesum'
+)
+
+inference_in_flight = Gauge(
+    'toxicity_inference_in_flight',
+    'Nombre de tâches d\'inférence en cours d\'exécution',
+    ['model_type'],
+    multiprocess_mode='livesum'
+)
+
+# Cache des résultats d'analyse
+score_cache_hits = Counter(
+    'toxicity_score_cache_hits_total',
+    'Nombre de résultats servis depuis le cache',
+    ['model_type', 'tier']
+)
+
+score_cache_misses = Counter(
+    'toxicity_score_cache_misses_total',
+    'Nombre de résultats absents du cache',
+    ['model_type', 'tier']
+)
+
+score_cache_evictions = Counter(
+    'toxicity_score_cache_evictions_total',
+    'Nombre d\'entrées retirées du cache (lru ou ttl)',
+    ['model_type', 'reason']
+)
+
+score_cache_errors = Counter(
+    'toxicity_score_cache_errors_total',
+    'Nombre d\'erreurs du cache Redis partagé (repli sur le cache local)',
+    ['model_type']
+)
+
+# Statistiques de /stats, agrégées entre workers en mode multiprocess
+stats_requests = Counter(
+    'toxicity_api_stats_requests_total',
+    'Nombre d\'analyses réussies par modèle et niveau de toxicité',
+    ['model_type', 'toxicity_level']
+)
+
+stats_processing_ms = Counter(
+    'toxicity_api_stats_processing_milliseconds_total',
+    'Temps de traitement cumulé des analyses réussies (ms)',
+    ['model_type']
+)
+
+stats_last_request = Gauge(
+    'toxicity_api_stats_last_request_timestamp_seconds',
+    'Horodatage de la dernière analyse réussie',
+    multiprocess_mode='max'
+)
+
 # Instrumentator FastAPI pour métriques automatiques
 instrumentator = Instrumentator(
     should_group_status_codes=True,
@@ -57,17 +224,31 @@ def setup_metrics(app):
         setup_metrics(app)
     """
     from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
-    from fastapi import Response
+    from prometheus_client.openmetrics.exposition import (
+        generate_latest as generate_openmetrics, CONTENT_TYPE_LATEST as OPENMETRICS_CONTENT_TYPE
+    )
+    from fastapi import Request, Response
+    from .multiprocess import MULTIPROCESS_ENABLED, multiprocess_registry
     
     # Ajouter l'instrumentation automatique
     instrumentator.instrument(app)
     
     # Exposer l'endpoint /metrics manuellement
     @app.get("/metrics", include_in_schema=False)
-    async def metrics():
+    async def metrics(request: Request):
         """Endpoint Prometheus pour exporter les métriques"""
+        # Plusieurs workers: métriques agrégées depuis PROMETHEUS_MULTIPROC_DIR
+        registry = multiprocess_registry() if MULTIPROCESS_ENABLED else None
+        
+        # Les exemplars (identifiants de trace) ne sont exposés qu'au format OpenMetrics
+        if "application/openmetrics-text" in request.headers.get("accept", ""):
+            return Response(
+                content=generate_openmetrics(registry or REGISTRY),
+                media_type=OPENMETRICS_CONTENT_TYPE
+            )
+        
         return Response(
-            content=generate_latest(),
+            content=generate_latest(registry) if registry else generate_latest(),
             media_type=CONTENT_TYPE_LATEST
         )
     
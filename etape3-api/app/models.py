@@ -5,6 +5,8 @@ from pydantic import BaseModel, Field, field_validator, ConfigDict
 from typing import Dict, Optional, List
 from datetime import datetime
 
+from .config import BATCH_MAX_ITEMS
+
 class AnalyzeRequest(BaseModel):
     """Requête d'analyse de toxicité"""
     model_config = ConfigDict(str_strip_whitespace=True)
@@ -29,6 +31,20 @@ class AnalyzeRequest(BaseModel):
             raise ValueError("Le texte ne peut pas être vide")
         return v.strip()
 
+class BatchAnalyzeRequest(BaseModel):
+    """Requête d'analyse de toxicité groupée (fil de commentaires)"""
+    texts: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=BATCH_MAX_ITEMS,
+        description=f"Textes à analyser (max {BATCH_MAX_ITEMS}); chaque texte est validé individuellement"
+    )
+    model: Optional[str] = Field(
+        "simple",
+        description="Modèle à utiliser: 'bert' ou 'simple'",
+        pattern="^(bert|simple)$"
+    )
+
 class ToxicityCategories(BaseModel):
     """Scores détaillés par catégorie de toxicité"""
     toxic: float = Field(ge=0.0, le=1.0, description="Score toxicité générale")
@@ -71,6 +87,23 @@ class AnalyzeResponse(BaseModel):
         description="Horodatage de l'analyse"
     )
 
+class BatchItemResult(BaseModel):
+    """Résultat d'un élément d'une analyse groupée (résultat ou erreur)"""
+    index: int = Field(ge=0, description="Position du texte dans la requête")
+    result: Optional[AnalyzeResponse] = Field(default=None, description="Analyse si succès")
+    error: Optional[str] = Field(default=None, description="Message d'erreur si échec")
+
+class BatchAnalyzeResponse(BaseModel):
+    """Réponse d'analyse de toxicité groupée"""
+    results: List[BatchItemResult] = Field(description="Résultats dans l'ordre de la requête")
+    model_used: str = Field(description="Modèle utilisé pour l'analyse")
+    total: int = Field(description="Nombre de textes reçus")
+    succeeded: int = Field(description="Nombre de textes analysés avec succès")
+    failed: int = Field(description="Nombre de textes en erreur")
+    processing_time_ms: float = Field(
+        description="Temps de traitement total en millisecondes"
+    )
+
 class HealthResponse(BaseModel):
     """Réponse du endpoint de santé"""
     status: str = Field(description="Statut de l'API")
@@ -79,6 +112,13 @@ class HealthResponse(BaseModel):
     uptime_seconds: float = Field(description="Temps de fonctionnement en secondes")
     memory_usage_mb: float = Field(description="Utilisation mémoire en MB")
 
+class ReadinessResponse(BaseModel):
+    """Réponse du endpoint de readiness (k8s)"""
+    status: str = Field(description="ready, warming_up ou not_ready")
+    ready: bool = Field(description="Le pod peut recevoir du trafic")
+    models_loaded: Dict[str, bool] = Field(description="Modèles chargés")
+    warmup_seconds: Dict[str, float] = Field(description="Durée d'échauffement par modèle")
+
 class ErrorResponse(BaseModel):
     """Réponse d'erreur standardisée"""
     model_config = ConfigDict(
@@ -94,6 +134,14 @@ class ErrorResponse(BaseModel):
         description="Horodatage de l'erreur"
     )
 
+class LatencyPercentiles(BaseModel):
+    """Percentiles de temps de traitement (ms)"""
+    count: int = Field(description="Nombre de requêtes")
+    p50: Optional[float] = Field(default=None, description="Médiane")
+    p90: Optional[float] = Field(default=None, description="90e percentile")
+    p99: Optional[float] = Field(default=None, description="99e percentile")
+    max: Optional[float] = Field(default=None, description="Maximum")
+
 class StatsResponse(BaseModel):
     """Statistiques de l'API"""
     model_config = ConfigDict(
@@ -107,3 +155,9 @@ class StatsResponse(BaseModel):
     average_processing_time_ms: float = Field(description="Temps moyen de traitement")
     toxicity_distribution: Dict[str, int] = Field(description="Distribution des niveaux de toxicité")
     last_request: Optional[datetime] = Field(default=None, description="Dernière requête")
+    latency_per_model: Dict[str, LatencyPercentiles] = Field(
+        default_factory=dict, description="Percentiles de latence par modèle (worker courant)"
+    )
+    latency_per_level: Dict[str, LatencyPercentiles] = Field(
+        default_factory=dict, description="Percentiles de latence par niveau de toxicité (worker courant)"
+    )
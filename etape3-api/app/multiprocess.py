@@ -0,0 +1,65 @@
+"""
+Métriques et statistiques partagées entre workers (mode multiprocess)
+
+Avec plusieurs workers gunicorn, chaque processus a ses propres compteurs:
+prometheus_client écrit alors leurs valeurs dans PROMETHEUS_MULTIPROC_DIR
+(un fichier par processus) et MultiProcessCollector les additionne à la lecture.
+"""
+from datetime import datetime
+from typing import Dict
+
+from prometheus_client import CollectorRegistry, multiprocess
+
+from .config import PROMETHEUS_MULTIPROC_DIR, TOXICITY_LEVELS
+
+# prometheus_client choisit son stockage à l'import: la variable doit être
+# définie avant le démarrage (gunicorn.conf.py s'en charge)
+MULTIPROCESS_ENABLED = bool(PROMETHEUS_MULTIPROC_DIR)
+
+
+def multiprocess_registry() -> CollectorRegistry:
+    """Registre agrégeant les métriques de tous les workers"""
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def mark_worker_dead(pid: int):
+    """Retire les jauges 'livesum' d'un worker terminé"""
+    if MULTIPROCESS_ENABLED:
+        multiprocess.mark_process_dead(pid)
+
+
+def aggregate_request_stats() -> Dict:
+    """
+    Statistiques de /stats sommées sur tous les workers
+
+    Le temps moyen porte sur toutes les analyses, et non sur les 1000
+    dernières d'un seul worker comme en mode mono-processus.
+    """
+    stats = {
+        "total_requests": 0,
+        "requests_per_model": {"bert": 0, "simple": 0},
+        "average_processing_time_ms": 0.0,
+        "toxicity_distribution": {level: 0 for level in TOXICITY_LEVELS},
+        "last_request": None
+    }
+    total_processing_ms = 0.0
+
+    for family in multiprocess_registry().collect():
+        for sample in family.samples:
+            if sample.name == "toxicity_api_stats_requests_total":
+                count = int(sample.value)
+                model_type = sample.labels["model_type"]
+                level = sample.labels["toxicity_level"]
+                stats["total_requests"] += count
+                stats["requests_per_model"][model_type] = stats["requests_per_model"].get(model_type, 0) + count
+                stats["toxicity_distribution"][level] = stats["toxicity_distribution"].get(level, 0) + count
+            elif sample.name == "toxicity_api_stats_processing_milliseconds_total":
+                total_processing_ms += sample.value
+            elif sample.name == "toxicity_api_stats_last_request_timestamp_seconds" and sample.value > 0:
+                stats["last_request"] = datetime.fromtimestamp(sample.value)
+
+    if stats["total_requests"]:
+        stats["average_processing_time_ms"] = total_processing_ms / stats["total_requests"]
+    return stats
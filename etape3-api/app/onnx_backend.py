@@ -0,0 +1,168 @@
+"""
+Backend ONNX Runtime pour le modèle BERT (CPU)
+
+Exporte le modèle AutoModelForSequenceClassification fine-tuné vers ONNX
+(quantification dynamique int8 optionnelle) et l'exécute avec onnxruntime,
+beaucoup plus rapide que PyTorch en mode eager sur les pods CPU.
+
+Export manuel (sinon fait automatiquement au premier chargement):
+    python -m app.onnx_backend [--no-quantize]
+"""
+import argparse
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from .config import (
+    BERT_MODEL_PATH, BERT_ONNX_DIR, BERT_ONNX_QUANTIZE, BERT_ONNX_AUTO_EXPORT,
+    ONNX_INTRA_OP_THREADS
+)
+from .runtime import worker_count, worker_thread_budget
+
+# onnxruntime optionnel (BERT_BACKEND=onnx)
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_INSTALLED = True
+except ImportError:
+    ort = None
+    ONNXRUNTIME_INSTALLED = False
+
+logger = logging.getLogger(__name__)
+
+ONNX_FP32_FILENAME = "model.onnx"
+ONNX_INT8_FILENAME = "model.int8.onnx"
+ONNX_OPSET = 14
+
+# Entrées possibles du modèle, dans l'ordre de forward()
+MODEL_INPUT_NAMES = ("input_ids", "attention_mask", "token_type_ids")
+
+
+def onnx_model_file(output_dir: Path = BERT_ONNX_DIR, quantize: bool = BERT_ONNX_QUANTIZE) -> Path:
+    """Chemin du fichier ONNX (fp32 ou int8)"""
+    return output_dir / (ONNX_INT8_FILENAME if quantize else ONNX_FP32_FILENAME)
+
+
+def export_bert_to_onnx(
+    model_path: Path = BERT_MODEL_PATH,
+    output_dir: Path = BERT_ONNX_DIR,
+    quantize: bool = BERT_ONNX_QUANTIZE
+) -> Path:
+    """
+    Exporte le modèle BERT fine-tuné vers ONNX (axes batch et séquence dynamiques)
+
+    Avec `quantize`, les poids des couches linéaires sont ensuite quantifiés
+    en int8 (quantification dynamique, activations quantifiées à l'exécution).
+    Retourne le chemin du modèle à servir.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    start_time = time.time()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fp32_path = output_dir / ONNX_FP32_FILENAME
+
+    tokenizer = AutoTokenizer.from_pretrained(str(model_path))
+    model = AutoModelForSequenceClassification.from_pretrained(str(model_path))
+    model.eval()
+
+    sample = tokenizer(["export onnx"], return_tensors="pt")
+    input_names = [name for name in MODEL_INPUT_NAMES if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    logger.info(f"Export ONNX du modèle BERT vers {fp32_path}...")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET,
+            do_constant_folding=True
+        )
+
+    if not quantize:
+        logger.info(f"✅ Export ONNX terminé en {time.time() - start_time:.1f}s")
+        return fp32_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = output_dir / ONNX_INT8_FILENAME
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    logger.info(f"✅ Export ONNX int8 terminé en {time.time() - start_time:.1f}s")
+    return int8_path
+
+
+class OnnxBertSession:
+    """Session onnxruntime CPU retournant les logits du classifieur"""
+
+    def __init__(self, onnx_path: Path, intra_op_threads: int = ONNX_INTRA_OP_THREADS):
+        if not ONNXRUNTIME_INSTALLED:
+            raise RuntimeError("onnxruntime n'est pas installé")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.inter_op_num_threads = 1
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.onnx_path = Path(onnx_path)
+        self.session = ort.InferenceSession(
+            str(onnx_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+
+    def logits(self, encoded: Dict) -> np.ndarray:
+        """Logits (batch, classes) pour des entrées tokenisées (tableaux NumPy)"""
+        feed = {name: np.asarray(encoded[name], dtype=np.int64) for name in self.input_names}
+        return self.session.run(None, feed)[0]
+
+    def predict_proba(self, encoded: Dict) -> np.ndarray:
+        """Probabilités (softmax des logits)"""
+        logits = self.logits(encoded).astype(np.float64)
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+
+def load_onnx_bert_session(
+    model_path: Path = BERT_MODEL_PATH,
+    output_dir: Path = BERT_ONNX_DIR,
+    quantize: bool = BERT_ONNX_QUANTIZE
+) -> OnnxBertSession:
+    """Charge la session ONNX, en exportant le modèle au besoin (BERT_ONNX_AUTO_EXPORT)"""
+    if not ONNXRUNTIME_INSTALLED:
+        raise RuntimeError("onnxruntime n'est pas installé")
+
+    onnx_path = onnx_model_file(output_dir, quantize)
+    if not onnx_path.exists():
+        if not BERT_ONNX_AUTO_EXPORT:
+            raise FileNotFoundError(f"Modèle ONNX non trouvé: {onnx_path}")
+        onnx_path = export_bert_to_onnx(model_path, output_dir, quantize)
+
+    intra_op_threads = ONNX_INTRA_OP_THREADS
+    if intra_op_threads <= 0 and worker_count() > 1:
+        # Plusieurs workers: chaque session n'a droit qu'à sa part du quota CPU
+        intra_op_threads = worker_thread_budget()
+    return OnnxBertSession(onnx_path, intra_op_threads)
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Export du modèle BERT vers ONNX")
+    parser.add_argument("--model-path", type=Path, default=BERT_MODEL_PATH)
+    parser.add_argument("--output-dir", type=Path, default=BERT_ONNX_DIR)
+    parser.add_argument("--no-quantize", action="store_true", help="exporter en fp32 uniquement")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    path = export_bert_to_onnx(args.model_path, args.output_dir, quantize=not args.no_quantize)
+    print(f"✅ Modèle ONNX: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Service multi-workers avec modèles pré-chargés (gunicorn --preload)
+
+Le master charge les modèles une seule fois avant de forker les workers:
+les poids sont partagés par copie sur écriture au lieu d'être dupliqués
+dans chaque worker.
+
+- gc.freeze() après le chargement: le ramasse-miettes des workers ne
+  réécrit plus les en-têtes des objets hérités (ce qui copierait leurs pages)
+- PyTorch limité à 1 thread dans le master (aucun pool OpenMP avant le
+  fork), puis quota CPU du conteneur divisé entre les workers
+- Backend ONNX chargé dans chaque worker: les threads d'une session
+  onnxruntime ne survivent pas au fork
+
+Les hooks sont appelés depuis gunicorn.conf.py.
+"""
+import gc
+import logging
+import sys
+
+from .config import BERT_BACKEND, ENABLED_MODELS
+from .inference import predictor
+from .multiprocess import mark_worker_dead
+from .runtime import configure_torch_threads, set_worker_count, torch_intra_op_threads
+
+logger = logging.getLogger(__name__)
+
+
+def preload_models():
+    """Charge les modèles dans le master, avant le fork des workers"""
+    if "bert" in ENABLED_MODELS:
+        if BERT_BACKEND == "onnx":
+            logger.info("ℹ️ Backend ONNX: BERT chargé par chaque worker après le fork")
+        else:
+            try:
+                configure_torch_threads(intra_op=1)
+                with predictor.timed_phase("bert.total"):
+                    predictor.load_bert_model()
+            except Exception as e:
+                logger.warning(f"⚠️ Échec du pré-chargement BERT dans le master: {e}")
+
+    if "simple" in ENABLED_MODELS:
+        try:
+            with predictor.timed_phase("simple.total"):
+                predictor.load_simple_model()
+        except Exception as e:
+            logger.warning(f"⚠️ Échec du pré-chargement modèle simple dans le master: {e}")
+
+    # Objets hérités exclus des collectes des workers (pages partagées intactes)
+    gc.collect()
+    gc.freeze()
+    logger.info(f"🧊 Modèles pré-chargés dans le master ({gc.get_freeze_count()} objets gelés)")
+
+
+def on_worker_fork(workers: int):
+    """Dans chaque worker: part du quota CPU pour les threads de calcul"""
+    set_worker_count(workers)
+    if "torch" in sys.modules:
+        predictor.torch_threads = configure_torch_threads(intra_op=torch_intra_op_threads())
+
+
+def on_worker_exit(pid: int):
+    """Dans le master: nettoie les métriques d'un worker terminé"""
+    mark_worker_dead(pid)
@@ -0,0 +1,233 @@
+"""
+Profileur par échantillonnage intégré au processus (pods de production)
+
+Un thread dédié relève périodiquement la pile Python de tous les threads du
+processus (boucle asyncio, pools d'inférence, tâches de fond) via
+sys._current_frames(), sans outil externe ni privilège ptrace.
+
+- mode "wall": tous les threads, actifs ou en attente
+- mode "cpu": seuls les threads dont le temps CPU a avancé depuis le
+  dernier relevé (horloge CPU par thread de Linux)
+- export en piles repliées (flamegraph.pl, speedscope) ou au format speedscope
+- mode continu: fenêtres d'une minute dans un tampon circulaire (N dernières minutes)
+
+Sous gunicorn, le profil couvre le worker qui traite la requête.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, List, Optional, Tuple
+
+PROFILE_MODES = ("wall", "cpu")
+PROFILE_FORMATS = ("collapsed", "speedscope")
+
+# Profondeur de pile maximale relevée (récursions pathologiques)
+MAX_STACK_DEPTH = 128
+
+Stack = Tuple[str, ...]
+
+
+def thread_cpu_clock(native_id: int) -> int:
+    """
+    Horloge CPU d'un thread Linux à partir de son TID
+
+    Même calcul que pthread_getcpuclockid de la glibc, mais sur le TID: un
+    thread terminé donne EINVAL au lieu d'un comportement indéfini.
+    """
+    return ((~native_id) << 3) | 6
+
+
+def thread_cpu_time(native_id: int) -> Optional[float]:
+    """Temps CPU consommé par un thread (None si terminé ou non supporté)"""
+    try:
+        return time.clock_gettime(thread_cpu_clock(native_id))
+    except (OSError, AttributeError):
+        return None
+
+
+class ProfileData:
+    """Piles échantillonnées (racine -> feuille, nom du thread en tête) et leur nombre d'occurrences"""
+
+    def __init__(self, mode: str, interval: float, started_at: Optional[float] = None):
+        self.mode = mode
+        self.interval = interval
+        self.started_at = started_at if started_at is not None else time.time()
+        self.ended_at = self.started_at
+        self.stacks: Counter = Counter()
+        self.ticks = 0
+        self.sampling_seconds = 0.0  # temps passé par le profileur lui-même
+
+    def merge(self, other: "ProfileData"):
+        self.stacks.update(other.stacks)
+        self.ticks += other.ticks
+        self.sampling_seconds += other.sampling_seconds
+        self.started_at = min(self.started_at, other.started_at)
+        self.ended_at = max(self.ended_at, other.ended_at)
+
+    @property
+    def duration(self) -> float:
+        return max(self.ended_at - self.started_at, 0.0)
+
+    @property
+    def overhead(self) -> float:
+        """Part du temps écoulé consacrée à l'échantillonnage"""
+        return self.sampling_seconds / self.duration if self.duration else 0.0
+
+    def to_collapsed(self) -> str:
+        """Format 'pile;repliée nombre' (une ligne par pile distincte)"""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+    def to_speedscope(self, name: str = "digital-social-score") -> Dict:
+        """Fichier speedscope: un profil échantillonné par thread, poids en millisecondes"""
+        frames: List[Dict] = []
+        frame_index: Dict[str, int] = {}
+        per_thread: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+        weight_ms = self.interval * 1000
+
+        for stack, count in self.stacks.items():
+            thread_name, frame_names = stack[0], stack[1:]
+            indices = []
+            for frame_name in frame_names:
+                if frame_name not in frame_index:
+                    frame_index[frame_name] = len(frames)
+                    frames.append({"name": frame_name})
+                indices.append(frame_index[frame_name])
+            samples, weights = per_thread.setdefault(thread_name, ([], []))
+            samples.append(indices)
+            weights.append(count * weight_ms)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{name} ({self.mode}, {self.duration:.1f}s)",
+            "exporter": "digital-social-score",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread_name,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights
+                }
+                for thread_name, (samples, weights) in sorted(per_thread.items())
+            ]
+        }
+
+
+class SamplingProfiler:
+    """
+    Échantillonneur de piles dans un thread démon
+
+    Sans `bucket_seconds`, toutes les piles vont dans un seul profil (profil
+    ponctuel). Avec, un nouveau profil est ouvert toutes les `bucket_seconds`
+    et seuls les `max_buckets` derniers sont conservés (mode continu).
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        mode: str = "wall",
+        bucket_seconds: Optional[float] = None,
+        max_buckets: Optional[int] = None
+    ):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Mode de profilage inconnu: {mode}")
+        self.interval = interval
+        self.mode = mode
+        self.bucket_seconds = bucket_seconds
+        self._buckets = deque(maxlen=max_buckets)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._labels: Dict = {}
+        self._cpu_times: Dict[int, float] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._stop.clear()
+        self._buckets.append(ProfileData(self.mode, self.interval))
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> ProfileData:
+        """Arrête l'échantillonnage et retourne l'ensemble des piles conservées"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.snapshot()
+
+    def snapshot(self, window_seconds: Optional[float] = None) -> ProfileData:
+        """Piles des `window_seconds` dernières secondes (toutes si None)"""
+        since = time.time() - window_seconds if window_seconds else 0.0
+        with self._lock:
+            buckets = [bucket for bucket in self._buckets if bucket.ended_at >= since]
+            profile = ProfileData(self.mode, self.interval, buckets[0].started_at if buckets else time.time())
+            for bucket in buckets:
+                profile.merge(bucket)
+        return profile
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            start_time = time.perf_counter()
+            stacks = self._sample(own_ident)
+            now = time.time()
+            with self._lock:
+                bucket = self._buckets[-1]
+                if self.bucket_seconds and now - bucket.started_at >= self.bucket_seconds:
+                    bucket = ProfileData(self.mode, self.interval, now)
+                    self._buckets.append(bucket)
+                bucket.stacks.update(stacks)
+                bucket.ticks += 1
+                bucket.ended_at = now
+                bucket.sampling_seconds += time.perf_counter() - start_time
+
+    def _sample(self, own_ident: int) -> List[Stack]:
+        """Une pile par thread (actif en mode cpu), racine en premier"""
+        threads = {thread.ident: thread for thread in threading.enumerate()}
+        cpu_times: Dict[int, float] = {}
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            thread = threads.get(ident)
+            if self.mode == "cpu" and not self._consumed_cpu(thread, cpu_times):
+                continue
+
+            labels = []
+            while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                labels.append(self._frame_label(frame.f_code))
+                frame = frame.f_back
+            labels.append(thread.name if thread is not None else f"thread-{ident}")
+            stacks.append(tuple(reversed(labels)))
+
+        # Seuls les threads encore vivants sont conservés
+        self._cpu_times = cpu_times
+        return stacks
+
+    def _consumed_cpu(self, thread: Optional[threading.Thread], cpu_times: Dict[int, float]) -> bool:
+        """Le thread a-t-il consommé du CPU depuis le relevé précédent ?"""
+        native_id = getattr(thread, "native_id", None)
+        cpu_time = thread_cpu_time(native_id) if native_id is not None else None
+        if cpu_time is None:
+            return False
+        cpu_times[native_id] = cpu_time
+        previous = self._cpu_times.get(native_id)
+        return previous is not None and cpu_time > previous
+
+    def _frame_label(self, code) -> str:
+        """'fonction (fichier.py:ligne)', mis en cache par objet code"""
+        label = self._labels.get(code)
+        if label is None:
+            # ';' sépare les frames dans le format replié
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+            self._labels[code] = label
+        return label
+
@@ -0,0 +1,165 @@
+"""
+Réglages d'exécution PyTorch pour les pods CPU
+
+- Nombre de threads calé sur le quota CPU du conteneur (cgroup) et non sur
+  le nombre de cœurs de l'hôte, partagé entre les workers gunicorn
+- Quantification dynamique int8 des couches Linear
+- Suivi des latences d'inférence (p50/p99) et de l'empreinte mémoire
+"""
+import logging
+import math
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from .config import TORCH_NUM_THREADS, TORCH_INTEROP_THREADS
+
+logger = logging.getLogger(__name__)
+
+CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V1_QUOTA = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+CGROUP_V1_PERIOD = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
+# Réglage des threads déjà appliqué (set_num_interop_threads n'est appelable qu'une fois)
+_torch_threads: Optional[Dict] = None
+
+# Nombre de workers se partageant le quota CPU (fixé dans chaque worker après le fork)
+_worker_count = 1
+
+
+def cgroup_cpu_quota() -> Optional[float]:
+    """Quota CPU du conteneur en nombre de cœurs (None si illimité ou inconnu)"""
+    try:
+        if CGROUP_V2_CPU_MAX.exists():
+            quota, period = CGROUP_V2_CPU_MAX.read_text().split()[:2]
+            if quota == "max":
+                return None
+            return int(quota) / int(period)
+
+        if CGROUP_V1_QUOTA.exists() and CGROUP_V1_PERIOD.exists():
+            quota = int(CGROUP_V1_QUOTA.read_text())
+            if quota <= 0:
+                return None
+            return quota / int(CGROUP_V1_PERIOD.read_text())
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def container_cpu_count() -> int:
+    """Cœurs réellement utilisables: min(affinité CPU, quota cgroup arrondi au supérieur)"""
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:
+        available = os.cpu_count() or 1
+
+    quota = cgroup_cpu_quota()
+    if quota is not None:
+        available = min(available, math.ceil(quota))
+    return max(1, available)
+
+
+def set_worker_count(workers: int):
+    """Déclare le nombre de workers du pod (appelé dans chaque worker après le fork)"""
+    global _worker_count
+    _worker_count = max(1, workers)
+
+
+def worker_count() -> int:
+    return _worker_count
+
+
+def worker_thread_budget() -> int:
+    """Threads de calcul d'un worker: quota CPU du conteneur divisé entre les workers"""
+    return max(1, container_cpu_count() // _worker_count)
+
+
+def torch_intra_op_threads() -> int:
+    """Threads intra-op d'un worker: TORCH_NUM_THREADS, sinon sa part du quota CPU"""
+    return TORCH_NUM_THREADS if TORCH_NUM_THREADS > 0 else worker_thread_budget()
+
+
+def configure_torch_threads(intra_op: Optional[int] = None) -> Dict:
+    """
+    Règle les threads intra/inter-op de PyTorch selon le quota CPU du conteneur
+
+    Par défaut torch utilise tous les cœurs de l'hôte: avec une limite de
+    500m sur un nœud 16 cœurs, 16 threads se disputent une demi-CPU.
+    Sans `intra_op`, le réglage n'est appliqué qu'une fois par processus;
+    avec `intra_op`, les threads intra-op sont toujours réajustés (après un fork).
+    """
+    global _torch_threads
+    if _torch_threads is not None and intra_op is None:
+        return _torch_threads
+
+    import torch
+
+    torch.set_num_threads(intra_op or torch_intra_op_threads())
+    if _torch_threads is None:
+        try:
+            torch.set_num_interop_threads(TORCH_INTEROP_THREADS)
+        except RuntimeError as e:
+            # Déjà fixé (travail parallèle déjà lancé dans ce processus)
+            logger.warning(f"⚠️ Threads inter-op non modifiés: {e}")
+
+    _torch_threads = {
+        "intra_op": torch.get_num_threads(),
+        "inter_op": torch.get_num_interop_threads(),
+        "workers": _worker_count,
+        "cpu_quota": cgroup_cpu_quota(),
+        "host_cpus": os.cpu_count()
+    }
+    logger.info(f"🧵 Threads PyTorch: {_torch_threads}")
+    return _torch_threads
+
+
+def quantize_dynamic_int8(model):
+    """Quantification dynamique int8 des couches Linear (poids int8, activations à la volée)"""
+    import torch
+
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def model_size_mb(model) -> float:
+    """
+    Taille des tenseurs du state_dict, poids int8 compactés compris
+
+    Calculée sans sérialiser le modèle (pas de copie temporaire des poids).
+    """
+    import torch
+
+    total_bytes = 0
+    for value in model.state_dict().values():
+        for tensor in (value if isinstance(value, tuple) else (value,)):
+            if isinstance(tensor, torch.Tensor):
+                total_bytes += tensor.element_size() * tensor.nelement()
+    return total_bytes / 1024 / 1024
+
+
+class LatencyTracker:
+    """Dernières latences d'inférence (fenêtre glissante) et leurs percentiles"""
+
+    def __init__(self, window: int = 1000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float):
+        with self._lock:
+            self._samples.append(latency_ms)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self) -> Dict:
+        """p50 / p99 en millisecondes sur la fenêtre"""
+        with self._lock:
+            samples = np.array(self._samples)
+        if samples.size == 0:
+            return {"samples": 0, "p50": None, "p99": None}
+        p50, p99 = np.percentile(samples, [50, 99])
+        return {"samples": int(samples.size), "p50": round(float(p50), 3), "p99": round(float(p99), 3)}
@@ -0,0 +1,82 @@
+"""
+Décomposition de la latence d'une analyse par étape
+
+ModelPredictor.predict_batch chronomètre, pour chaque lot:
+    clean -> cache -> vectorize (simple) / tokenize (BERT) -> infer -> postprocess
+puis l'endpoint ajoute:
+    queue_wait (micro-batching + attente d'un thread du pool) et serialize
+
+Chaque requête observe les étapes de son lot dans l'histogramme
+toxicity_stage_seconds, avec l'identifiant de trace en exemplar si
+STAGE_EXEMPLARS_ENABLED.
+"""
+import time
+from typing import Dict, Mapping, Optional
+
+from .config import STAGE_EXEMPLARS_ENABLED
+
+# Métriques Prometheus optionnelles (même logique que main.py)
+try:
+    from .metrics import toxicity_stage_time
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+STAGES = ("queue_wait", "clean", "cache", "vectorize", "tokenize", "infer", "postprocess", "serialize")
+
+# Longueur maximale des labels d'un exemplar (128 caractères au total en OpenMetrics)
+MAX_TRACE_ID_LENGTH = 64
+
+
+class StageTimer:
+    """
+    Chronomètre à tours: `lap(stage)` ajoute à l'étape le temps écoulé depuis
+    le tour précédent (une étape peut être comptée en plusieurs fois)
+    """
+
+    __slots__ = ("stages", "_last")
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+
+def with_queue_wait(batch_stages: Dict[str, float], awaited: float) -> Dict[str, float]:
+    """Étapes d'une requête: celles de son lot, plus l'attente avant le traitement du lot"""
+    stages = dict(batch_stages)
+    stages["queue_wait"] = max(0.0, awaited - sum(batch_stages.values()))
+    return stages
+
+
+def trace_id_from_headers(headers: Mapping[str, str]) -> Optional[str]:
+    """Identifiant de trace W3C (traceparent) ou Google Cloud (X-Cloud-Trace-Context)"""
+    traceparent = headers.get("traceparent")
+    if traceparent:
+        parts = traceparent.split("-")
+        trace_id = parts[1] if len(parts) >= 4 else None
+    else:
+        cloud_trace = headers.get("x-cloud-trace-context")
+        trace_id = cloud_trace.split("/", 1)[0] if cloud_trace else None
+
+    if not trace_id or len(trace_id) > MAX_TRACE_ID_LENGTH:
+        return None
+    return trace_id
+
+
+def request_trace_id(headers: Mapping[str, str]) -> Optional[str]:
+    """Identifiant de trace à attacher en exemplar (None si STAGE_EXEMPLARS_ENABLED est faux)"""
+    return trace_id_from_headers(headers) if STAGE_EXEMPLARS_ENABLED else None
+
+
+def observe_stages(model_type: str, stages: Dict[str, float], trace_id: Optional[str] = None):
+    """Enregistre la durée (secondes) de chaque étape d'une requête"""
+    if not METRICS_ENABLED:
+        return
+
+    exemplar = {"trace_id": trace_id} if trace_id and STAGE_EXEMPLARS_ENABLED else None
+    toxicity_stage_time.observe_many(model_type, stages, exemplar)
@@ -0,0 +1,130 @@
+"""
+Statistiques de l'API à mémoire fixe
+
+- LatencySketch: histogramme à buckets logarithmiques (type DDSketch),
+  percentiles avec une erreur relative bornée, mise à jour en O(1)
+- RingBuffer: dernières valeurs dans un tableau préalloué (aucune copie)
+- RequestStats: compteurs de /stats, protégés par un verrou (les tâches de
+  fond de FastAPI tournent dans le pool de threads)
+"""
+import math
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from .config import TOXICITY_LEVELS
+
+STATS_WINDOW = 1000  # dernières requêtes pour le temps moyen de traitement
+PERCENTILES = (50, 90, 99)
+
+
+class LatencySketch:
+    """
+    Histogramme logarithmique à nombre de buckets fixe
+
+    Le bucket i couvre ]gamma^(i-1), gamma^i]; sa valeur représentative
+    2·gamma^i / (gamma + 1) est à moins de `relative_accuracy` de toute valeur
+    du bucket. Les valeurs hors de [min_value, max_value] sont ramenées aux
+    bornes; le maximum est conservé exactement.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-3, max_value: float = 1e6):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.max_value = max_value
+        self._offset = math.ceil(math.log(min_value) / self._log_gamma)
+        self._counts = [0] * (math.ceil(math.log(max_value) / self._log_gamma) - self._offset + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        clamped = min(max(value, self.min_value), self.max_value)
+        self._counts[math.ceil(math.log(clamped) / self._log_gamma) - self._offset] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Valeur au rang q (0-1), à relative_accuracy près"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        cumulative = 0
+        for index, bucket_count in enumerate(self._counts):
+            cumulative += bucket_count
+            if cumulative > rank:
+                estimate = 2 * self.gamma ** (index + self._offset) / (self.gamma + 1)
+                return min(estimate, self.max)
+        return self.max
+
+    def summary(self, percentiles: Iterable[int] = PERCENTILES) -> Dict:
+        """Nombre de valeurs, percentiles et maximum (ms, arrondis au µs)"""
+        summary = {"count": self.count}
+        for percentile in percentiles:
+            value = self.quantile(percentile / 100)
+            summary[f"p{percentile}"] = round(value, 3) if value is not None else None
+        summary["max"] = round(self.max, 3) if self.count else None
+        return summary
+
+
+class RingBuffer:
+    """Dernières `capacity` valeurs dans un tableau préalloué"""
+
+    def __init__(self, capacity: int):
+        self._values = [0.0] * capacity
+        self._next = 0
+        self._size = 0
+
+    def append(self, value: float):
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._values)
+        self._size = min(self._size + 1, len(self._values))
+
+    def values(self) -> List[float]:
+        return self._values[:self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class RequestStats:
+    """Statistiques d'utilisation de l'API (total, répartition, latences)"""
+
+    def __init__(self, window: int = STATS_WINDOW, models: Iterable[str] = ("bert", "simple")):
+        self._lock = threading.Lock()
+        self.total_requests = 0
+        self.requests_per_model = {model: 0 for model in models}
+        self.toxicity_distribution = {level: 0 for level in TOXICITY_LEVELS}
+        self.last_request: Optional[datetime] = None
+        self.processing_times = RingBuffer(window)
+        self.latency_per_model = {model: LatencySketch() for model in models}
+        self.latency_per_level = {level: LatencySketch() for level in TOXICITY_LEVELS}
+
+    def record(self, model_used: str, processing_time: float, toxicity_level: str):
+        """Enregistre une analyse réussie (temps de traitement en ms)"""
+        with self._lock:
+            self.total_requests += 1
+            self.requests_per_model[model_used] = self.requests_per_model.get(model_used, 0) + 1
+            self.toxicity_distribution[toxicity_level] = self.toxicity_distribution.get(toxicity_level, 0) + 1
+            self.last_request = datetime.now()
+            self.processing_times.append(processing_time)
+            self.latency_per_model.setdefault(model_used, LatencySketch()).add(processing_time)
+            self.latency_per_level.setdefault(toxicity_level, LatencySketch()).add(processing_time)
+
+    def snapshot(self) -> Dict:
+        """Vue cohérente des statistiques (champs de StatsResponse)"""
+        with self._lock:
+            recent = self.processing_times.values()
+            return {
+                "total_requests": self.total_requests,
+                "requests_per_model": dict(self.requests_per_model),
+                "average_processing_time_ms": sum(recent) / len(recent) if recent else 0.0,
+                "toxicity_distribution": dict(self.toxicity_distribution),
+                "last_request": self.last_request,
+                "latency_per_model": {name: s.summary() for name, s in self.latency_per_model.items()},
+                "latency_per_level": {name: s.summary() for name, s in self.latency_per_level.items()}
+            }
@@ -0,0 +1,59 @@
+"""
+Normalisation du texte avant inférence
+Patterns précompilés et passes fusionnées - sortie identique aux anciennes
+méthodes ModelPredictor.clean_text_light / clean_text_full (voir tests/test_text_cleaning.py)
+"""
+import re
+
+# URLs: "http\S+" couvre déjà "https\S+"
+URL_PATTERN = re.compile(r'http\S+|www\S+')
+
+# Mentions (@username) et hashtags (#hashtag) en une seule passe:
+# '@' et '#' ne sont pas des caractères \w, supprimer l'un ne crée ni ne
+# détruit jamais une correspondance de l'autre
+MENTION_HASHTAG_PATTERN = re.compile(r'[@#]\w+')
+
+# Mots = suites de lettres ASCII. Les joindre par un espace équivaut à
+# [^a-zA-Z\s] -> ' ', puis \s+ -> ' ', puis strip()
+ALPHA_PATTERN = re.compile(r'[a-zA-Z]+')
+
+# Chemin rapide pour les textes ASCII: lettres conservées, tout le reste -> espace
+ASCII_LETTERS_TABLE = str.maketrans({
+    chr(code): chr(code) if chr(code).isalpha() else ' ' for code in range(128)
+})
+
+
+def clean_text_light(text: str) -> str:
+    """Nettoyage léger du texte (comme pour BERT)"""
+    if not isinstance(text, str):
+        return ""
+
+    # Supprimer les URLs (recherche de sous-chaîne bien moins coûteuse qu'un scan regex)
+    if 'http' in text or 'www' in text:
+        text = URL_PATTERN.sub('', text)
+
+    # Espaces multiples + trim: str.split() utilise la même définition
+    # des espaces que \s en mode Unicode
+    return ' '.join(text.split())
+
+
+def clean_text_full(text: str) -> str:
+    """Nettoyage complet du texte (pour modèle simple)"""
+    if not isinstance(text, str):
+        return ""
+
+    # Minuscules
+    text = text.lower()
+
+    # Supprimer les URLs
+    if 'http' in text or 'www' in text:
+        text = URL_PATTERN.sub('', text)
+
+    # Supprimer les mentions et hashtags
+    if '@' in text or '#' in text:
+        text = MENTION_HASHTAG_PATTERN.sub('', text)
+
+    # Ne garder que les lettres, séparées par un seul espace
+    if text.isascii():
+        return ' '.join(text.translate(ASCII_LETTERS_TABLE).split())
+    return ' '.join(ALPHA_PATTERN.findall(text))
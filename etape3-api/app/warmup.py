@@ -0,0 +1,79 @@
+"""
+Échauffement des modèles avant de déclarer le pod prêt
+
+Fait passer des lots synthétiques de longueurs représentatives dans chaque
+modèle chargé (allocations paresseuses, premiers appels torch/sklearn), sans
+passer par le cache des scores ni les statistiques de l'API.
+"""
+import logging
+import random
+import time
+from typing import Dict, List
+
+from .config import WARMUP_TEXT_WORDS, BERT_BATCH_MAX_SIZE, MAX_TEXT_LENGTH, BERT_SLIDING_WINDOW_ENABLED
+
+# Métriques Prometheus optionnelles
+try:
+    from .metrics import model_warmup_time
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+logger = logging.getLogger(__name__)
+
+WARMUP_WORDS = ["this", "is", "a", "really", "nice", "comment", "thanks", "for", "sharing",
+                "you", "are", "wrong", "about", "that", "honestly", "great", "article"]
+
+
+def build_warmup_texts(word_counts: List[int] = WARMUP_TEXT_WORDS, seed: int = 0) -> List[str]:
+    """Un texte synthétique par longueur (en mots)"""
+    rng = random.Random(seed)
+    texts = [" ".join(rng.choice(WARMUP_WORDS) for _ in range(count)) for count in word_counts]
+    if BERT_SLIDING_WINDOW_ENABLED:
+        # Texte maximal: chemin des fenêtres glissantes
+        texts.append(" ".join(rng.choice(WARMUP_WORDS) for _ in range(MAX_TEXT_LENGTH // 5))[:MAX_TEXT_LENGTH])
+    return texts
+
+
+def warmup_model(predictor, model_name: str) -> float:
+    """
+    Passe des lots synthétiques (texte seul puis lot complet) dans un modèle chargé
+
+    Retourne la durée de l'échauffement en secondes.
+    """
+    start_time = time.time()
+    texts = build_warmup_texts()
+
+    if model_name == "bert":
+        clean_fn, score_fn, batch_size = predictor.clean_text_light, predictor._score_bert_cleaned, BERT_BATCH_MAX_SIZE
+    else:
+        clean_fn, score_fn, batch_size = predictor.clean_text_full, predictor._score_simple_cleaned, len(texts)
+
+    cleaned = [clean_fn(text) for text in texts]
+    for text in cleaned:
+        score_fn([text])
+    score_fn([cleaned[i % len(cleaned)] for i in range(batch_size)])
+
+    # Les latences d'échauffement ne doivent pas fausser les p50/p99 rapportés
+    if model_name == "bert":
+        for tracker in predictor.bert_latency.values():
+            tracker.reset()
+
+    duration = time.time() - start_time
+    if METRICS_ENABLED:
+        model_warmup_time.labels(model_type=model_name).set(duration)
+    logger.info(f"🔥 Modèle {model_name} échauffé en {duration:.2f}s")
+    return duration
+
+
+def warmup_models(predictor) -> Dict[str, float]:
+    """Échauffe chaque modèle chargé; un échec n'empêche pas les autres"""
+    durations = {}
+    for model_name in ("bert", "simple"):
+        if not predictor.is_model_loaded(model_name):
+            continue
+        try:
+            durations[model_name] = round(warmup_model(predictor, model_name), 3)
+        except Exception as e:
+            logger.warning(f"⚠️ Échec de l'échauffement {model_name}: {e}")
+    return durations
@@ -0,0 +1,4 @@
+"""
+Benchmarks de performance de l'API Digital Social Score
+A lancer depuis etape3-api/: python -m benchmarks.<module>
+"""
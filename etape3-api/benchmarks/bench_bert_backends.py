@@ -0,0 +1,101 @@
+"""
+Benchmark latence / débit des backends BERT: PyTorch eager, ONNX fp32, ONNX int8
+
+Utilise le modèle fine-tuné de BERT_MODEL_PATH s'il existe, sinon un BERT de
+taille base aux poids aléatoires (même coût de calcul, scores sans intérêt).
+Nécessite torch, transformers et onnxruntime.
+
+Usage (depuis etape3-api/):
+    python -m benchmarks.bench_bert_backends [--threads 1]
+"""
+import argparse
+import random
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import torch
+from transformers import (
+    AutoModelForSequenceClassification, AutoTokenizer,
+    BertConfig, BertForSequenceClassification, BertTokenizerFast
+)
+
+from app.config import BERT_MODEL_PATH
+from app.onnx_backend import OnnxBertSession, export_bert_to_onnx
+from benchmarks.common import measure, print_comparison
+
+BATCH_SIZE = 32
+
+WORDS = ["you", "are", "a", "really", "stupid", "idiot", "thanks", "for", "the", "great",
+         "article", "hate", "this", "so", "much", "love", "it", "what", "moron", "nice"]
+
+
+def build_texts(n: int, seed: int):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 60))) for _ in range(n)]
+
+
+def random_bert_base(directory: Path) -> Path:
+    """BERT base (12 couches, 768) aux poids aléatoires, sauvegardé avec son tokenizer"""
+    vocab_file = directory / "vocab.txt"
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + WORDS))
+    model_path = directory / "bert_model"
+    BertTokenizerFast(vocab_file=str(vocab_file)).save_pretrained(str(model_path))
+    config = BertConfig(vocab_size=5 + len(WORDS), num_labels=2)
+    BertForSequenceClassification(config).save_pretrained(str(model_path))
+    return model_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=1, help="threads d'inférence (limite CPU des pods)")
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        model_path = BERT_MODEL_PATH if BERT_MODEL_PATH.exists() else random_bert_base(tmp)
+
+        tokenizer = AutoTokenizer.from_pretrained(str(model_path))
+        model = AutoModelForSequenceClassification.from_pretrained(str(model_path)).eval()
+        sessions = {
+            "onnx fp32": OnnxBertSession(export_bert_to_onnx(model_path, tmp / "onnx", quantize=False), args.threads),
+            "onnx int8": OnnxBertSession(export_bert_to_onnx(model_path, tmp / "onnx", quantize=True), args.threads),
+        }
+
+        def encode(texts, tensors):
+            return tokenizer(texts, return_tensors=tensors, truncation=True, padding=True, max_length=128)
+
+        def torch_scores(texts):
+            with torch.no_grad():
+                return torch.softmax(model(**encode(texts, "pt")).logits, dim=1).numpy()
+
+        single = build_texts(1, seed=1)
+        batch = build_texts(BATCH_SIZE, seed=2)
+        reference = torch_scores(batch)
+
+        print(f"🧪 Backends BERT ({model_path.name}, {args.threads} thread(s))")
+        print("=" * 90)
+        torch_single = measure(torch_scores, single, repeat=3, number=20)
+        torch_batch = measure(torch_scores, batch, repeat=3, number=3)
+
+        for name, session in sessions.items():
+            onnx_scores = lambda texts, s=session: s.predict_proba(encode(texts, "np"))
+            deviation = float(np.max(np.abs(onnx_scores(batch) - reference)))
+
+            print_comparison(
+                f"{name} - texte seul",
+                torch_single,
+                measure(onnx_scores, single, repeat=3, number=20)
+            )
+            onnx_batch = measure(onnx_scores, batch, repeat=3, number=3)
+            print_comparison(f"{name} - lot de {BATCH_SIZE}", torch_batch, onnx_batch)
+            print(
+                f"{'':<40} débit: {BATCH_SIZE / torch_batch['best_us'] * 1e6:>8.1f} -> "
+                f"{BATCH_SIZE / onnx_batch['best_us'] * 1e6:>8.1f} textes/s   écart max: {deviation:.1e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
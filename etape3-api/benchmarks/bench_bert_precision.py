@@ -0,0 +1,73 @@
+"""
+Benchmark du backend PyTorch: fp32 vs int8 (quantification dynamique)
+
+Rapporte durée de chargement, taille du modèle et latences p50/p99 d'un texte
+seul, avec les threads réglés sur le quota CPU du conteneur.
+
+Usage (depuis etape3-api/):
+    python -m benchmarks.bench_bert_precision [--runs 200]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from app.config import BERT_MODEL_PATH
+from app.runtime import (
+    LatencyTracker, configure_torch_threads, quantize_dynamic_int8, model_size_mb
+)
+from benchmarks.bench_bert_backends import build_texts, random_bert_base
+
+
+def load(model_path: Path, precision: str):
+    start_time = time.time()
+    model = AutoModelForSequenceClassification.from_pretrained(str(model_path)).eval()
+    if precision == "int8":
+        model = quantize_dynamic_int8(model)
+    return model, time.time() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    threads = configure_torch_threads()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = BERT_MODEL_PATH if BERT_MODEL_PATH.exists() else random_bert_base(Path(tmp))
+        tokenizer = AutoTokenizer.from_pretrained(str(model_path))
+        texts = build_texts(args.runs, seed=3)
+
+        print(f"🧪 BERT PyTorch fp32 vs int8 ({model_path.name}, threads {threads})")
+        print("=" * 90)
+        reference = None
+        for precision in ("fp32", "int8"):
+            model, load_time = load(model_path, precision)
+            tracker = LatencyTracker(window=args.runs)
+            probabilities = []
+
+            with torch.no_grad():
+                for text in texts:
+                    inputs = tokenizer([text], return_tensors="pt", truncation=True, padding=True, max_length=128)
+                    start_time = time.perf_counter()
+                    logits = model(**inputs).logits
+                    tracker.record((time.perf_counter() - start_time) * 1000)
+                    probabilities.append(torch.softmax(logits, dim=1)[0, 1].item())
+
+            deviation = (
+                max(abs(a - b) for a, b in zip(probabilities, reference)) if reference else 0.0
+            )
+            reference = reference or probabilities
+            latency = tracker.summary()
+            print(
+                f"{precision:<6} chargement: {load_time:>6.2f} s   taille: {model_size_mb(model):>7.1f} MB   "
+                f"p50: {latency['p50']:>7.2f} ms   p99: {latency['p99']:>7.2f} ms   écart max: {deviation:.1e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
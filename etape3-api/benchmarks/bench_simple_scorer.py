@@ -0,0 +1,93 @@
+"""
+Microbenchmark du scoring du modèle simple (TF-IDF + Logistic Regression)
+
+Compare l'ancien chemin predict_simple (transform sklearn + deux appels
+predict_proba) et le chemin sklearn groupé au scoreur fusionné
+app.fast_scorer, sur un texte seul et sur un lot.
+
+Utilise les fichiers .pkl de etape2-modele-ia s'ils existent, sinon un modèle
+entraîné avec la configuration du notebook sur un corpus synthétique.
+
+Usage (depuis etape3-api/):
+    python -m benchmarks.bench_simple_scorer
+"""
+import pickle
+import random
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from app.config import SIMPLE_MODEL_PATH
+from app.fast_scorer import build_fast_scorer
+from app.text_cleaning import clean_text_full
+from benchmarks.common import measure, print_comparison
+
+BATCH_SIZE = 64
+
+WORDS = ["you", "are", "a", "really", "stupid", "idiot", "thanks", "for", "the", "great",
+         "article", "hate", "this", "so", "much", "love", "it", "what", "moron", "nice",
+         "comment", "wrong", "about", "that", "honestly", "fool", "good", "point"]
+
+
+def build_corpus(n: int, seed: int):
+    rng = random.Random(seed)
+    return [
+        clean_text_full(" ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 60))))
+        for _ in range(n)
+    ]
+
+
+def load_models():
+    """Modèle entraîné de l'étape 2, ou modèle de même configuration sur corpus synthétique"""
+    model_path = SIMPLE_MODEL_PATH / "best_simple_model.pkl"
+    vectorizer_path = SIMPLE_MODEL_PATH / "tfidf_vectorizer.pkl"
+    if model_path.exists() and vectorizer_path.exists():
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+        with open(vectorizer_path, 'rb') as f:
+            vectorizer = pickle.load(f)
+        return vectorizer, model, "etape2"
+
+    texts = build_corpus(2000, seed=0)
+    labels = [int(any(w in t.split() for w in ("stupid", "idiot", "hate", "moron"))) for t in texts]
+    vectorizer = TfidfVectorizer(max_features=10000, min_df=2, max_df=0.95, stop_words='english',
+                                 ngram_range=(1, 2), sublinear_tf=True)
+    model = LogisticRegression(random_state=42, max_iter=1000, class_weight='balanced')
+    model.fit(vectorizer.fit_transform(texts), labels)
+    return vectorizer, model, "synthétique"
+
+
+def main():
+    vectorizer, model, origin = load_models()
+    scorer = build_fast_scorer(vectorizer, model)
+    assert scorer is not None, "scoreur fusionné non disponible pour ce modèle"
+
+    def legacy_single(text):
+        X = vectorizer.transform([text])
+        prob = model.predict_proba(X)[0, 1]
+        confidence = max(model.predict_proba(X)[0])
+        return prob, confidence
+
+    def sklearn_batch(texts):
+        probabilities = model.predict_proba(vectorizer.transform(texts))
+        return list(zip(probabilities[:, 1].tolist(), probabilities.max(axis=1).tolist()))
+
+    text = build_corpus(1, seed=1)[0]
+    batch = build_corpus(BATCH_SIZE, seed=2)
+
+    print(f"🧪 Modèle simple ({origin}, {scorer.vocabulary_size} termes)")
+    print("=" * 90)
+    print_comparison(
+        "texte seul (predict_simple)",
+        measure(legacy_single, text, number=200),
+        measure(lambda t: scorer.score([t]), text, number=200)
+    )
+    print_comparison(
+        f"lot de {BATCH_SIZE} textes (sklearn groupé)",
+        measure(sklearn_batch, batch, number=20),
+        measure(scorer.score, batch, number=20)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Coût de l'instrumentation par étape d'une requête /analyze
+
+Mesure, par requête: les tours de StageTimer du prédicteur, le calcul de
+queue_wait et l'observation des histogrammes (avec et sans exemplar).
+Objectif: quelques microsecondes, négligeable devant l'inférence.
+
+Usage (depuis etape3-api/):
+    python -m benchmarks.bench_stage_overhead
+"""
+from prometheus_client import CollectorRegistry, Histogram
+
+from app import stages
+from app.metrics import STAGE_BUCKETS, MultiprocessStageHistograms
+from app.stages import StageTimer, observe_stages, with_queue_wait
+from benchmarks.common import measure, print_comparison
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+def instrumented_request(trace_id=None):
+    """Instrumentation d'une requête du modèle simple (5 tours + 2 étapes de l'endpoint)"""
+    timer = StageTimer()
+    for stage in ("clean", "cache", "vectorize", "infer", "postprocess"):
+        timer.lap(stage)
+    request_stages = with_queue_wait(timer.stages, 0.001)
+    request_stages["serialize"] = 0.0001
+    observe_stages("simple", request_stages, trace_id)
+
+
+def main():
+    print("🧪 Coût de l'instrumentation par étape (par requête)")
+    print("=" * 70)
+
+    timer_only = measure(lambda: StageTimer().lap("clean"), number=10000)
+    print(f"{'StageTimer + 1 tour':<40} {timer_only['best_us']:>8.2f} µs")
+
+    # Référence: un Histogram prometheus_client par étape (chemin du mode multiprocess)
+    request_stages = with_queue_wait({"clean": 1e-5, "cache": 1e-6, "vectorize": 1e-4,
+                                      "infer": 1e-4, "postprocess": 1e-5}, 0.001)
+    request_stages["serialize"] = 0.0001
+    reference = MultiprocessStageHistograms(Histogram(
+        "bench_stage_seconds", "bench", ["model_type", "stage"],
+        buckets=STAGE_BUCKETS, registry=CollectorRegistry()
+    ))
+    baseline = measure(reference.observe_many, "simple", request_stages, number=10000)
+    candidate = measure(observe_stages, "simple", request_stages, number=10000)
+    print_comparison("observation de 7 étapes", baseline, candidate)
+
+    result = measure(instrumented_request, number=10000)
+    print(f"{'requête (7 étapes, sans exemplar)':<40} {result['best_us']:>8.2f} µs")
+
+    stages.STAGE_EXEMPLARS_ENABLED = True
+    result = measure(instrumented_request, TRACE_ID, number=10000)
+    print(f"{'requête (7 étapes, avec exemplar)':<40} {result['best_us']:>8.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
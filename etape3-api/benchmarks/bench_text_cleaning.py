@@ -0,0 +1,72 @@
+"""
+Microbenchmark du nettoyage de texte (entrées de 5000 caractères)
+
+Compare les anciennes méthodes ModelPredictor.clean_text_* (re.sub non
+précompilés, 5 passes) à app.text_cleaning.
+
+Usage (depuis etape3-api/):
+    python -m benchmarks.bench_text_cleaning
+"""
+import random
+import re
+
+from app.text_cleaning import clean_text_light, clean_text_full
+from benchmarks.common import measure, print_comparison
+
+TEXT_LENGTH = 5000
+
+
+def legacy_clean_text_light(text):
+    if not isinstance(text, str):
+        return ""
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def legacy_clean_text_full(text):
+    if not isinstance(text, str):
+        return ""
+    text = str(text).lower()
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'#\w+', '', text)
+    text = re.sub(r'[^a-zA-Z\s]', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def build_corpus(seed: int = 0):
+    """Textes de 5000 caractères: commentaire ordinaire et commentaire 'réseau social'"""
+    rng = random.Random(seed)
+    plain_words = ["This", "is", "a", "really", "long", "comment,", "honestly", "you",
+                   "are", "wrong", "about", "that!", "Thanks", "for", "reading."]
+    social_words = plain_words + ["@someone", "#topic", "https://t.co/abc123", "www.site.org",
+                                  "2024", ":)", "l'été", "WOW!!!"]
+    return {
+        "plain": " ".join(rng.choice(plain_words) for _ in range(1500))[:TEXT_LENGTH],
+        "social": " ".join(rng.choice(social_words) for _ in range(1500))[:TEXT_LENGTH],
+    }
+
+
+def main():
+    print(f"🧪 Nettoyage de texte - entrées de {TEXT_LENGTH} caractères")
+    print("=" * 90)
+    for name, text in build_corpus().items():
+        assert clean_text_full(text) == legacy_clean_text_full(text)
+        assert clean_text_light(text) == legacy_clean_text_light(text)
+
+        print_comparison(
+            f"clean_text_full ({name})",
+            measure(legacy_clean_text_full, text),
+            measure(clean_text_full, text)
+        )
+        print_comparison(
+            f"clean_text_light ({name})",
+            measure(legacy_clean_text_light, text),
+            measure(clean_text_light, text)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Outils communs aux benchmarks (chronométrage, affichage)
+"""
+import statistics
+import time
+from typing import Callable, Dict
+
+
+def measure(fn: Callable, *args, repeat: int = 5, number: int = 100) -> Dict[str, float]:
+    """
+    Chronomètre `fn(*args)`: `repeat` séries de `number` appels
+
+    Retourne le temps par appel en microsecondes (meilleure série et médiane).
+    """
+    fn(*args)  # échauffement
+
+    per_call_us = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(*args)
+        per_call_us.append((time.perf_counter() - start) / number * 1e6)
+
+    return {
+        "best_us": min(per_call_us),
+        "median_us": statistics.median(per_call_us),
+        "calls": repeat * number
+    }
+
+
+def print_comparison(name: str, baseline: Dict[str, float], candidate: Dict[str, float]):
+    """Affiche la comparaison de deux mesures"""
+    speedup = baseline["best_us"] / candidate["best_us"] if candidate["best_us"] else float("inf")
+    print(
+        f"{name:<40} avant: {baseline['best_us']:>10.1f} µs   "
+        f"après: {candidate['best_us']:>10.1f} µs   x{speedup:.2f}"
+    )
@@ -0,0 +1,288 @@
+"""
+Suite de benchmarks du moteur d'inférence (reproductible, hors ligne)
+
+Mesure, pour chaque distribution de longueurs de texte (corpus synthétique
+à graine fixe):
+- nettoyage léger (BERT) et complet (modèle simple)
+- ModelPredictor.predict_simple (texte seul) et predict_simple_batch (lot)
+- ModelPredictor.predict_bert / predict_bert_batch si le modèle BERT est présent
+- construction et sérialisation de la réponse Pydantic (AnalyzeResponse)
+
+Sans les artefacts de l'étape 2, le modèle simple est le modèle dummy de
+create_dummy_simple_model: la suite tourne sans réseau ni GPU. Les résultats
+sont écrits en JSON et comparés à une référence (médiane par cas); le code de
+sortie vaut 1 en cas de régression.
+
+Usage (depuis etape3-api/):
+    python -m benchmarks.suite                       # compare à benchmarks/baseline.json
+    python -m benchmarks.suite --quick --cases "simple.*"
+    python -m benchmarks.suite --update-baseline     # sur la machine de référence
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.config import MAX_TEXT_LENGTH
+from app.inference import ModelPredictor
+from app.text_cleaning import clean_text_light, clean_text_full
+
+BENCHMARKS_DIR = Path(__file__).parent
+DEFAULT_OUTPUT = BENCHMARKS_DIR / "results" / "latest.json"
+DEFAULT_BASELINE = BENCHMARKS_DIR / "baseline.json"
+DEFAULT_THRESHOLD = 0.25  # médiane 25 % plus lente que la référence = régression
+
+SCHEMA_VERSION = 1
+
+# Nombre de mots par texte (min, max) pour chaque distribution
+LENGTH_DISTRIBUTIONS = {
+    "short": (3, 15),
+    "medium": (20, 80),
+    "long": (150, 800),
+}
+
+SIMPLE_BATCH_SIZE = 64
+BERT_BATCH_SIZE = 8
+
+WORDS = ["you", "are", "a", "really", "stupid", "idiot", "thanks", "for", "the", "great",
+         "article", "hate", "this", "so", "much", "love", "it", "what", "moron", "nice",
+         "comment", "wrong", "about", "that", "honestly", "fool", "good", "point", "Really!!",
+         "don't", "C'est", "vraiment", "n'importe", "quoi", "2024", "lol", "😂"]
+NOISE = ["https://example.com/post/42", "@someone", "#debate", "www.site.org", "!!!", "..."]
+
+
+def build_texts(distribution: str, n: int, seed: int) -> List[str]:
+    """Textes synthétiques (mots, URLs, mentions, hashtags) de la distribution demandée"""
+    rng = random.Random(f"{distribution}-{seed}")
+    low, high = LENGTH_DISTRIBUTIONS[distribution]
+    texts = []
+    for _ in range(n):
+        words = [rng.choice(NOISE) if rng.random() < 0.05 else rng.choice(WORDS)
+                 for _ in range(rng.randint(low, high))]
+        texts.append(" ".join(words)[:MAX_TEXT_LENGTH])
+    return texts
+
+
+def time_calls(fn: Callable, inputs: List, items_per_call: int, repeat: int) -> Dict:
+    """
+    Chronomètre `fn(x)` pour chaque entrée, `repeat` fois
+
+    Retourne la latence par élément (µs: médiane, p95) et le débit (éléments/s).
+    """
+    fn(inputs[0])  # échauffement
+    per_item_us = []
+    for _ in range(repeat):
+        for item in inputs:
+            start = time.perf_counter()
+            fn(item)
+            per_item_us.append((time.perf_counter() - start) * 1e6 / items_per_call)
+
+    mean_us = statistics.fmean(per_item_us)
+    return {
+        "median_us": round(statistics.median(per_item_us), 3),
+        "p95_us": round(float(np.percentile(per_item_us, 95)), 3),
+        "throughput_per_s": round(1e6 / mean_us, 1) if mean_us else None,
+        "calls": len(per_item_us),
+        "items_per_call": items_per_call
+    }
+
+
+def build_cases(predictor: ModelPredictor, n_texts: int, seed: int) -> Dict[str, Callable[[int], Dict]]:
+    """Cas de la suite: nom -> fonction(repeat) qui retourne la mesure"""
+    from app.main import build_analyze_response
+
+    cases = {}
+    bert_available = predictor.load_bert_model()
+
+    for distribution in LENGTH_DISTRIBUTIONS:
+        texts = build_texts(distribution, n_texts, seed)
+        simple_batches = [texts[i:i + SIMPLE_BATCH_SIZE] for i in range(0, len(texts), SIMPLE_BATCH_SIZE)]
+        simple_batches = [batch for batch in simple_batches if len(batch) == SIMPLE_BATCH_SIZE] or [texts]
+
+        cases[f"clean_light.{distribution}"] = (
+            lambda repeat, texts=texts: time_calls(clean_text_light, texts, 1, repeat)
+        )
+        cases[f"clean_full.{distribution}"] = (
+            lambda repeat, texts=texts: time_calls(clean_text_full, texts, 1, repeat)
+        )
+        cases[f"simple.single.{distribution}"] = (
+            lambda repeat, texts=texts: time_calls(predictor.predict_simple, texts, 1, repeat)
+        )
+        cases[f"simple.batch.{distribution}"] = (
+            lambda repeat, batches=simple_batches: time_calls(
+                predictor.predict_simple_batch, batches, len(batches[0]), repeat
+            )
+        )
+
+        if bert_available:
+            bert_texts = texts[:max(1, n_texts // 4)]
+            bert_batches = [bert_texts[i:i + BERT_BATCH_SIZE] for i in range(0, len(bert_texts), BERT_BATCH_SIZE)]
+            cases[f"bert.single.{distribution}"] = (
+                lambda repeat, texts=bert_texts: time_calls(predictor.predict_bert, texts, 1, repeat)
+            )
+            cases[f"bert.batch.{distribution}"] = (
+                lambda repeat, batches=bert_batches: time_calls(
+                    predictor.predict_bert_batch, batches, len(batches[0]), repeat
+                )
+            )
+
+    # Réponse Pydantic: construction + sérialisation JSON d'un résultat type
+    results = predictor.predict_batch(build_texts("medium", 32, seed), "simple")
+    for result in results:
+        result.pop("stage_seconds", None)
+    cases["response.build_serialize"] = lambda repeat: time_calls(
+        lambda result: build_analyze_response(result).model_dump_json(), results, 1, repeat
+    )
+    return cases
+
+
+def environment_info(predictor: ModelPredictor) -> Dict:
+    """Contexte de la mesure (à comparer avant d'interpréter un écart)"""
+    import sklearn
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": len(os.sched_getaffinity(0)),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "simple_model": predictor.model_versions.get("simple", "unknown"),
+        "simple_scorer": "fused" if predictor.simple_scorer is not None else "sklearn",
+        "bert_model": predictor.model_versions.get("bert")
+    }
+
+
+def run_suite(
+    pattern: str = "*",
+    n_texts: int = 256,
+    repeat: int = 3,
+    seed: int = 0,
+    predictor: Optional[ModelPredictor] = None
+) -> Dict:
+    """Exécute les cas dont le nom correspond à `pattern` (fnmatch)"""
+    predictor = predictor or ModelPredictor()
+    predictor.load_simple_model()
+
+    results = {}
+    for name, case in build_cases(predictor, n_texts, seed).items():
+        if fnmatch.fnmatch(name, pattern):
+            results[name] = case(repeat)
+
+    return {"environment": environment_info(predictor), "results": results}
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> Dict[str, Dict]:
+    """
+    Compare les médianes aux valeurs de référence
+
+    Statut par cas: "regression" (plus lent de plus de `threshold`),
+    "improvement" (plus rapide de plus de `threshold`), "ok", ou "new".
+    """
+    comparison = {}
+    for name, measure in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            comparison[name] = {"status": "new", "median_us": measure["median_us"]}
+            continue
+
+        ratio = measure["median_us"] / reference["median_us"] if reference["median_us"] else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improvement"
+        else:
+            status = "ok"
+        comparison[name] = {
+            "status": status,
+            "median_us": measure["median_us"],
+            "baseline_median_us": reference["median_us"],
+            "ratio": round(ratio, 3)
+        }
+    return comparison
+
+
+def print_report(current: Dict, comparison: Optional[Dict[str, Dict]]):
+    """Tableau des résultats (et de l'écart à la référence)"""
+    icons = {"regression": "❌", "improvement": "🚀", "ok": "✅", "new": "🆕"}
+    print(f"{'cas':<28} {'médiane µs':>12} {'p95 µs':>12} {'débit /s':>12} {'réf. µs':>12} {'ratio':>7}")
+    print("=" * 90)
+    for name, measure in current["results"].items():
+        line = (
+            f"{name:<28} {measure['median_us']:>12.1f} {measure['p95_us']:>12.1f} "
+            f"{measure['throughput_per_s'] or 0:>12.1f}"
+        )
+        if comparison is not None:
+            entry = comparison[name]
+            if "ratio" in entry:
+                line += f" {entry['baseline_median_us']:>12.1f} {entry['ratio']:>7.2f}"
+            else:
+                line += f" {'-':>12} {'-':>7}"
+            line += f"  {icons[entry['status']]}"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default="*", help="filtre fnmatch sur le nom des cas (ex: 'simple.*')")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--texts", type=int, default=256, help="textes par distribution")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="64 textes, 1 répétition")
+    parser.add_argument("--update-baseline", action="store_true", help="enregistrer ces résultats comme référence")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.texts, args.repeat = 64, 1
+
+    current = run_suite(args.cases, args.texts, args.repeat, args.seed)
+    current["environment"].update({"texts": args.texts, "repeat": args.repeat, "seed": args.seed})
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(current, indent=2, ensure_ascii=False))
+
+    comparison = None
+    if args.baseline.exists() and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text())
+        comparison = compare_results(current, baseline, args.threshold)
+        for key in ("simple_model", "cpu_count", "python"):
+            if baseline["environment"].get(key) != current["environment"].get(key):
+                print(f"⚠️ {key} différent de la référence: "
+                      f"{baseline['environment'].get(key)} -> {current['environment'].get(key)}")
+        current["comparison"] = comparison
+        args.output.write_text(json.dumps(current, indent=2, ensure_ascii=False))
+
+    print(f"🧪 Suite de benchmarks (modèle simple: {current['environment']['simple_model']}, "
+          f"BERT: {current['environment']['bert_model'] or 'absent'})")
+    print_report(current, comparison)
+    print(f"\n📄 Résultats: {args.output}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2, ensure_ascii=False))
+        print(f"📌 Référence mise à jour: {args.baseline}")
+        return 0
+
+    regressions = [name for name, entry in (comparison or {}).items() if entry["status"] == "regression"]
+    if regressions:
+        print(f"❌ {len(regressions)} régression(s) au-delà de {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
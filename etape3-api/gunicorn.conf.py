@@ -0,0 +1,42 @@
+"""
+Configuration gunicorn: workers uvicorn partageant des modèles pré-chargés
+
+Usage (depuis etape3-api/):
+    gunicorn -c gunicorn.conf.py app.main:app
+    WEB_CONCURRENCY=4 gunicorn -c gunicorn.conf.py app.main:app
+
+Les modèles sont chargés une fois dans le master puis partagés par copie sur
+écriture (voir app/prefork.py); les métriques et /stats sont agrégées entre
+workers via le mode multiprocess de prometheus_client.
+"""
+import os
+from pathlib import Path
+
+# Doit précéder l'import de prometheus_client (fait par le preload de l'application)
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+_metrics_dir = Path(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+_metrics_dir.mkdir(parents=True, exist_ok=True)
+for _db_file in _metrics_dir.glob("*.db"):
+    _db_file.unlink()
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = 120
+
+
+def when_ready(server):
+    """Master prêt, avant le fork: chargement unique des modèles"""
+    from app.prefork import preload_models
+    preload_models()
+
+
+def post_fork(server, worker):
+    from app.prefork import on_worker_fork
+    on_worker_fork(server.cfg.workers)
+
+
+def child_exit(server, worker):
+    from app.prefork import on_worker_exit
+    on_worker_exit(worker.pid)
@@ -0,0 +1,22 @@
+import pytest
+
+TINY_BERT_WORDS = ["hello", "good", "day", "you", "are", "a", "stupid", "idiot", "love",
+                   "this", "great", "hate", "fool"]
+
+@pytest.fixture
+def tiny_bert_path(tmp_path):
+    """Petit BERT aléatoire sauvegardé comme le modèle fine-tuné de l'étape 2"""
+    pytest.importorskip("torch.nn")
+    transformers = pytest.importorskip("transformers")
+
+    vocab_file = tmp_path / "vocab.txt"
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + TINY_BERT_WORDS))
+
+    model_path = tmp_path / "bert_model"
+    transformers.BertTokenizerFast(vocab_file=str(vocab_file)).save_pretrained(str(model_path))
+    config = transformers.BertConfig(
+        vocab_size=5 + len(TINY_BERT_WORDS), hidden_size=32, num_hidden_layers=2,
+        num_attention_heads=2, intermediate_size=64, num_labels=2
+    )
+    transformers.BertForSequenceClassification(config).save_pretrained(str(model_path))
+    return model_path
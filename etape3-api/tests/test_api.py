@@ -65,3 +65,74 @@ def test_test_endpoint():
     assert response.status_code == 200
     data = response.json()
     assert "message" in data
+
+def test_analyze_batch_valid_texts():
+    """Test d'analyse groupée avec des textes valides"""
+    test_data = {"texts": ["Hello, this is a nice comment", "You are stupid and ugly"]}
+    response = client.post("/analyze/batch", json=test_data)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["total"] == 2
+    assert data["succeeded"] == 2
+    assert [item["index"] for item in data["results"]] == [0, 1]
+    for item in data["results"]:
+        assert item["error"] is None
+        assert 0 <= item["result"]["score"] <= 100
+
+def test_analyze_batch_matches_single_analysis():
+    """Le chemin vectorisé donne les mêmes scores que /analyze"""
+    texts = ["Thanks for your help", "You are an idiot", "Have a great day"]
+    batch = client.post("/analyze/batch", json={"texts": texts, "model": "simple"}).json()
+    for text, item in zip(texts, batch["results"]):
+        single = client.post("/analyze", json={"text": text, "model": "simple"}).json()
+        assert item["result"]["score"] == single["score"]
+
+def test_analyze_batch_item_errors():
+    """Les erreurs par élément ne font pas échouer le lot"""
+    test_data = {"texts": ["A perfectly fine comment", "   ", "a" * 6000]}
+    response = client.post("/analyze/batch", json=test_data)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["succeeded"] == 1
+    assert data["failed"] == 2
+    assert data["results"][0]["result"] is not None
+    assert data["results"][1]["error"]
+    assert data["results"][2]["error"]
+
+def test_analyze_batch_empty_list():
+    """Test avec une liste vide"""
+    response = client.post("/analyze/batch", json={"texts": []})
+    assert response.status_code == 422  # Validation error
+
+def test_liveness_endpoint():
+    """Liveness: répond toujours, même avant le chargement des modèles"""
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json()["status"] == "alive"
+
+def test_readiness_after_warmup():
+    """Readiness: 503 pendant le démarrage, 200 une fois les modèles échauffés"""
+    import time
+    with TestClient(app) as started_client:
+        deadline = time.time() + 30
+        response = started_client.get("/health/ready")
+        while response.status_code == 503 and time.time() < deadline:
+            assert response.json()["status"] == "warming_up"
+            time.sleep(0.05)
+            response = started_client.get("/health/ready")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ready"] is True
+        assert data["models_loaded"]["simple"] is True
+        assert "simple" in data["warmup_seconds"]
+
+def test_stats_latency_percentiles():
+    """/stats: percentiles de latence par modèle et par niveau"""
+    client.post("/analyze", json={"text": "Have a nice day", "model": "simple"})
+    data = client.get("/stats").json()
+    assert data["latency_per_model"]["simple"]["count"] >= 1
+    assert data["latency_per_model"]["simple"]["p99"] is not None
+    assert set(data["latency_per_level"]) == {"low", "medium", "high", "extreme"}
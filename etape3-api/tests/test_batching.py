@@ -0,0 +1,62 @@
+import asyncio
+from app.batching import MicroBatcher
+
+def make_batcher(calls, **kwargs):
+    """Batcher dont la fonction de lot enregistre chaque appel"""
+    def batch_fn(texts):
+        calls.append(list(texts))
+        return [text.upper() for text in texts]
+    return MicroBatcher(batch_fn, **kwargs)
+
+def test_concurrent_requests_share_one_batch():
+    """Les requêtes concurrentes sont regroupées en un seul lot"""
+    calls = []
+    batcher = make_batcher(calls, max_batch_size=32, max_wait_ms=20)
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.submit(f"text {i}") for i in range(10)))
+
+    results = asyncio.run(scenario())
+    assert results == [f"TEXT {i}" for i in range(10)]
+    assert len(calls) == 1
+    assert len(calls[0]) == 10
+
+def test_batch_size_is_bounded():
+    """Un lot plein est envoyé immédiatement sans dépasser la taille max"""
+    calls = []
+    batcher = make_batcher(calls, max_batch_size=4, max_wait_ms=1000)
+
+    async def scenario():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(str(i)) for i in range(8))),
+            timeout=5
+        )
+
+    results = asyncio.run(scenario())
+    assert results == [str(i) for i in range(8)]
+    assert [len(batch) for batch in calls] == [4, 4]
+
+def test_single_request_flushed_after_max_wait():
+    """Une requête isolée est traitée après le délai d'attente max"""
+    calls = []
+    batcher = make_batcher(calls, max_batch_size=32, max_wait_ms=1)
+
+    result = asyncio.run(batcher.submit("hello"))
+    assert result == "HELLO"
+    assert calls == [["hello"]]
+    assert batcher.pending_count == 0
+
+def test_batch_error_propagates_to_every_caller():
+    """Une erreur du modèle est renvoyée à chaque appelant du lot"""
+    def failing_batch_fn(texts):
+        raise RuntimeError("Modèle BERT non disponible")
+
+    batcher = MicroBatcher(failing_batch_fn, max_batch_size=8, max_wait_ms=1)
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
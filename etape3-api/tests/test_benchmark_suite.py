@@ -0,0 +1,44 @@
+import json
+from benchmarks import suite
+from app.inference import ModelPredictor
+
+def test_build_texts_is_seeded():
+    """Même graine = même corpus; longueurs conformes à la distribution"""
+    texts = suite.build_texts("short", 20, seed=1)
+    assert texts == suite.build_texts("short", 20, seed=1)
+    assert texts != suite.build_texts("short", 20, seed=2)
+    assert all(3 <= len(text.split()) <= 15 for text in texts)
+
+def test_compare_results_flags_regressions():
+    """Au-delà du seuil: régression (plus lent) ou amélioration (plus rapide)"""
+    baseline = {"results": {"a": {"median_us": 100.0}, "b": {"median_us": 100.0}, "c": {"median_us": 100.0}}}
+    current = {"results": {
+        "a": {"median_us": 130.0}, "b": {"median_us": 110.0},
+        "c": {"median_us": 70.0}, "d": {"median_us": 5.0}
+    }}
+    comparison = suite.compare_results(current, baseline, threshold=0.25)
+    assert comparison["a"]["status"] == "regression"
+    assert comparison["b"]["status"] == "ok"
+    assert comparison["c"]["status"] == "improvement"
+    assert comparison["d"]["status"] == "new"
+
+def test_suite_runs_offline_with_dummy_model(tmp_path):
+    """Sans artefacts: modèle dummy, JSON écrit, code 1 si la référence est bien plus rapide"""
+    predictor = ModelPredictor()
+    assert predictor.create_dummy_simple_model()
+    result = suite.run_suite("simple.*.short", n_texts=8, repeat=1, predictor=predictor)
+    assert set(result["results"]) == {"simple.single.short", "simple.batch.short"}
+    assert result["environment"]["simple_model"] == "dummy"
+    assert all(measure["median_us"] > 0 for measure in result["results"].values())
+
+    baseline = {"environment": result["environment"],
+                "results": {name: {"median_us": 1e-3} for name in result["results"]}}
+    (tmp_path / "baseline.json").write_text(json.dumps(baseline))
+    output = tmp_path / "latest.json"
+    exit_code = suite.main([
+        "--cases", "simple.batch.short", "--texts", "8", "--repeat", "1",
+        "--output", str(output), "--baseline", str(tmp_path / "baseline.json")
+    ])
+    assert exit_code == 1
+    written = json.loads(output.read_text())
+    assert written["comparison"]["simple.batch.short"]["status"] == "regression"
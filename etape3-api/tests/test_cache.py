@@ -0,0 +1,110 @@
+import time
+import fakeredis
+from app.cache import (
+    ResultCache, RedisScoreCache, TieredScoreCache, make_cache_key,
+    create_redis_score_cache, REDIS_INSTALLED
+)
+
+def test_cache_key_depends_on_text_model_and_version():
+    """La clé change avec le texte, le modèle et la version du modèle"""
+    key = make_cache_key("hello world", "simple", "v1")
+    assert key == make_cache_key("hello world", "simple", "v1")
+    assert key != make_cache_key("hello world!", "simple", "v1")
+    assert key != make_cache_key("hello world", "bert", "v1")
+    assert key != make_cache_key("hello world", "simple", "v2")
+
+def test_cache_never_stores_raw_text():
+    """RGPD: seule l'empreinte du texte est conservée"""
+    cache = ResultCache(max_size=10, ttl_seconds=60)
+    text = "my secret comment"
+    cache.set(make_cache_key(text, "simple", "v1"), (0.9, 0.9))
+    assert all(text not in key for key in cache._entries)
+    assert all(text not in repr(value) for value in cache._entries.values())
+
+def test_cache_hit_and_miss():
+    """Une entrée présente est servie, une absente retourne None"""
+    cache = ResultCache(max_size=10, ttl_seconds=60)
+    cache.set("a", (0.1, 0.9))
+    assert cache.get("a") == (0.1, 0.9)
+    assert cache.get("b") is None
+
+def test_cache_lru_eviction():
+    """L'entrée la moins récemment utilisée est évincée"""
+    cache = ResultCache(max_size=2, ttl_seconds=60)
+    cache.set("a", (0.1, 0.9))
+    cache.set("b", (0.2, 0.8))
+    cache.get("a")  # "b" devient la moins récemment utilisée
+    cache.set("c", (0.3, 0.7))
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+def test_cache_ttl_expiration():
+    """Une entrée expirée n'est plus servie"""
+    cache = ResultCache(max_size=10, ttl_seconds=0.01)
+    cache.set("a", (0.1, 0.9))
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+def test_salted_cache_key():
+    """Le sel change l'empreinte (clés non devinables sans le sel)"""
+    unsalted = make_cache_key("hello", "simple", "v1", salt="")
+    salted = make_cache_key("hello", "simple", "v1", salt="secret")
+    assert salted != unsalted
+    assert salted == make_cache_key("hello", "simple", "v1", salt="secret")
+
+def test_redis_cache_shared_between_replicas():
+    """Un score calculé par une réplica est servi à une autre via Redis"""
+    server = fakeredis.FakeServer()
+    replica_a = TieredScoreCache(
+        ResultCache(max_size=10, ttl_seconds=60),
+        RedisScoreCache(fakeredis.FakeRedis(server=server, decode_responses=True))
+    )
+    replica_b = TieredScoreCache(
+        ResultCache(max_size=10, ttl_seconds=60),
+        RedisScoreCache(fakeredis.FakeRedis(server=server, decode_responses=True))
+    )
+
+    replica_a.set_many({"k1": (0.123456789, 0.876543211), "k2": (0.5, 0.5)})
+    assert replica_b.get_many(["k1", "k2", "k3"]) == [
+        (0.123456789, 0.876543211), (0.5, 0.5), None
+    ]
+    # Les valeurs lues dans Redis sont recopiées dans le cache local
+    assert replica_b.local.get("k1") == (0.123456789, 0.876543211)
+
+def test_redis_cache_falls_back_when_unreachable():
+    """Redis injoignable: repli transparent sur le cache local"""
+    server = fakeredis.FakeServer()
+    remote = RedisScoreCache(fakeredis.FakeRedis(server=server), retry_interval=60)
+    cache = TieredScoreCache(ResultCache(max_size=10, ttl_seconds=60), remote)
+
+    server.connected = False
+    cache.set_many({"k1": (0.9, 0.9)})
+    assert cache.get_many(["k1", "k2"]) == [(0.9, 0.9), None]
+    assert not remote.available
+
+    # Pendant l'intervalle de reprise, Redis n'est plus sollicité
+    server.connected = True
+    assert remote.get_many(["k1"]) == [None]
+
+def test_redis_cache_requires_salt(caplog):
+    """Sans sel, pas de cache Redis partagé (empreintes non salées réversibles)"""
+    assert create_redis_score_cache(enabled=True, salt="") is None
+    assert "SCORE_CACHE_SALT" in caplog.text
+    if REDIS_INSTALLED:
+        assert isinstance(create_redis_score_cache(enabled=True, salt="secret"), RedisScoreCache)
+
+def test_redis_cache_ignores_malformed_values():
+    """Valeur illisible ou étrangère dans Redis: défaut de cache, pas d'erreur"""
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeRedis(server=server)
+    remote = RedisScoreCache(client)
+    remote.set_many({"ok": (0.25, 0.75)})
+    client.set(RedisScoreCache.KEY_PREFIX + "garbage", "not-a-score")
+    client.set(RedisScoreCache.KEY_PREFIX + "binary", b"\xff\xfe:\x00")
+    client.set(RedisScoreCache.KEY_PREFIX + "triple", "0.1:0.2:0.3")
+
+    assert remote.get_many(["ok", "garbage", "binary", "triple"]) == [(0.25, 0.75), None, None, None]
+    assert remote.available
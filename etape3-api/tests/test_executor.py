@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import pytest
+from app.executor import InferencePool, InferencePoolFull
+
+def test_run_returns_result_off_event_loop():
+    """La fonction est exécutée dans un thread du pool, pas dans la boucle"""
+    pool = InferencePool("test", max_workers=1, max_queue=1)
+    loop_thread = threading.get_ident()
+
+    async def scenario():
+        return await pool.run(lambda x: (x * 2, threading.get_ident()), 21)
+
+    value, worker_thread = asyncio.run(scenario())
+    assert value == 42
+    assert worker_thread != loop_thread
+    assert pool.queue_depth == 0
+    assert pool.in_flight == 0
+    pool.shutdown()
+
+def test_pool_rejects_when_queue_is_full():
+    """Au-delà de workers + file, les requêtes sont rejetées avec Retry-After"""
+    pool = InferencePool("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        assert pool.in_flight == 1
+        assert pool.queue_depth == 1
+
+        with pytest.raises(InferencePoolFull) as exc_info:
+            await pool.run(release.wait)
+        assert exc_info.value.retry_after >= 1
+
+        release.set()
+        await asyncio.gather(running, queued)
+
+    asyncio.run(scenario())
+    assert pool.queue_depth == 0
+    assert pool.in_flight == 0
+    pool.shutdown()
+
+def test_event_loop_stays_responsive_during_inference():
+    """Une inférence lente ne bloque pas les autres coroutines"""
+    pool = InferencePool("test", max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        slow = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.01)
+        # La boucle répond toujours pendant que le thread est bloqué
+        ticks = 0
+        for _ in range(5):
+            await asyncio.sleep(0)
+            ticks += 1
+        release.set()
+        await slow
+        return ticks
+
+    assert asyncio.run(scenario()) == 5
+    pool.shutdown()
@@ -0,0 +1,88 @@
+import random
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from app.fast_scorer import LinearTfidfScorer, build_fast_scorer
+
+WORDS = ["hello", "good", "day", "love", "you", "great", "hate", "idiot", "stupid",
+         "fool", "the", "a", "is", "damn", "wonderful", "moron", "weather", "nice"]
+
+def make_corpus(n, seed):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 30))) for _ in range(n)]
+
+def fit(vectorizer, model):
+    texts = make_corpus(300, seed=1)
+    labels = [int(any(w in t.split() for w in ("hate", "idiot", "stupid"))) for t in texts]
+    model.fit(vectorizer.fit_transform(texts), labels)
+    return vectorizer, model
+
+CONFIGURATIONS = {
+    # Modèle dummy de l'API
+    "dummy": lambda: fit(TfidfVectorizer(max_features=100, stop_words='english'),
+                         LogisticRegression(random_state=42)),
+    # Configuration du notebook etape2-modele-ia/notebooks/model_simple.ipynb
+    "notebook": lambda: fit(TfidfVectorizer(max_features=10000, min_df=2, max_df=0.95,
+                                            stop_words='english', ngram_range=(1, 2),
+                                            sublinear_tf=True),
+                            LogisticRegression(random_state=42, max_iter=1000, class_weight='balanced')),
+    "multinomial": lambda: fit(TfidfVectorizer(ngram_range=(1, 2)),
+                               LogisticRegression(multi_class='multinomial')),
+    "binary_l1": lambda: fit(TfidfVectorizer(binary=True, norm='l1', use_idf=False),
+                             LogisticRegression(C=10)),
+}
+
+@pytest.mark.parametrize("name", list(CONFIGURATIONS))
+def test_fused_scorer_matches_sklearn(name):
+    """Probabilité et confiance identiques à predict_proba (écart < 1e-9)"""
+    vectorizer, model = CONFIGURATIONS[name]()
+    scorer = build_fast_scorer(vectorizer, model)
+    assert scorer is not None
+
+    texts = make_corpus(500, seed=2) + ["", "unknown words only", "HATE YOU idiot!!"]
+    expected = model.predict_proba(vectorizer.transform(texts))
+    scores = np.array(scorer.score(texts))
+
+    np.testing.assert_allclose(scores[:, 0], expected[:, 1], rtol=0, atol=1e-9)
+    np.testing.assert_allclose(scores[:, 1], expected.max(axis=1), rtol=0, atol=1e-9)
+
+def test_fused_scorer_batch_equals_single():
+    """Le score d'un texte ne dépend pas du lot dans lequel il est calculé"""
+    scorer = LinearTfidfScorer.from_sklearn(*CONFIGURATIONS["notebook"]())
+    texts = make_corpus(50, seed=3)
+    batch = scorer.score(texts)
+    for text, scored in zip(texts, batch):
+        assert scorer.score([text])[0] == pytest.approx(scored, abs=1e-12)
+
+def test_unsupported_model_falls_back_to_sklearn():
+    """Modèle multi-classes: pas de scoreur fusionné (repli sur sklearn)"""
+    vectorizer = TfidfVectorizer()
+    texts = make_corpus(60, seed=4)
+    model = LogisticRegression().fit(vectorizer.fit_transform(texts), [i % 3 for i in range(60)])
+    assert build_fast_scorer(vectorizer, model) is None
+
+def test_compact_artifact_round_trip(tmp_path):
+    """Artefact compact: rechargé sans sklearn (poids en mmap), mêmes scores à 1e-9"""
+    from app.fast_scorer import WordNgramAnalyzer, export_compact_scorer
+    vectorizer, model = CONFIGURATIONS["notebook"]()
+    export_compact_scorer(vectorizer, model, tmp_path / "compact")
+
+    scorer = LinearTfidfScorer.load(tmp_path / "compact")
+    assert isinstance(scorer.analyzer, WordNgramAnalyzer)
+    assert isinstance(scorer.idf_coef.base, np.memmap)
+    assert not scorer.idf_coef.flags.writeable
+
+    texts = make_corpus(300, seed=5) + ["", "The IDIOT, the fool... and 42 others!"]
+    reference = vectorizer.build_analyzer()
+    assert all(scorer.analyzer(text) == reference(text) for text in texts)
+
+    expected = model.predict_proba(vectorizer.transform(texts))[:, 1]
+    np.testing.assert_allclose(np.array(scorer.score(texts))[:, 0], expected, rtol=0, atol=1e-9)
+
+def test_compact_export_rejects_custom_analyzer(tmp_path):
+    """Analyseur personnalisé: export compact refusé (non reproductible sans sklearn)"""
+    from app.fast_scorer import export_compact_scorer
+    vectorizer, model = fit(TfidfVectorizer(preprocessor=str.upper), LogisticRegression())
+    with pytest.raises(ValueError):
+        export_compact_scorer(vectorizer, model, tmp_path / "compact")
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from app.length_buckets import bucket_by_length, pool_window_scores
+
+def test_bucket_by_length():
+    """Chaque séquence va dans la plus petite tranche qui la contient"""
+    groups = bucket_by_length([5, 16, 17, 128, 40, 3, 300], [16, 32, 64, 128])
+    assert groups == {16: [0, 1, 5], 32: [2], 128: [3, 6], 64: [4]}
+
+def test_pool_window_scores_max_and_mean():
+    """Max: fenêtre la plus toxique; moyenne: moyenne des fenêtres"""
+    probabilities = np.array([[0.9, 0.1], [0.2, 0.8], [0.6, 0.4], [0.3, 0.7]])
+    sample_mapping = [0, 0, 0, 1]
+
+    pooled_max = pool_window_scores(probabilities, sample_mapping, 2, "max")
+    np.testing.assert_allclose(pooled_max, [[0.2, 0.8], [0.3, 0.7]])
+
+    pooled_mean = pool_window_scores(probabilities, sample_mapping, 2, "mean")
+    np.testing.assert_allclose(pooled_mean, [[0.566666667, 0.433333333], [0.3, 0.7]])
+
+@pytest.fixture
+def predictor(tiny_bert_path):
+    """Prédicteur branché sur le petit BERT de test (backend torch)"""
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    from app.inference import ModelPredictor
+    from app.runtime import LatencyTracker
+
+    predictor = ModelPredictor()
+    predictor.bert_tokenizer = AutoTokenizer.from_pretrained(str(tiny_bert_path))
+    predictor.bert_model = AutoModelForSequenceClassification.from_pretrained(str(tiny_bert_path)).eval()
+    predictor.bert_precision = "fp32"
+    predictor.bert_latency = {"fp32": LatencyTracker()}
+    return predictor
+
+def test_length_buckets_match_full_padding(predictor):
+    """Padding par tranche: mêmes scores que le padding au plus long texte du lot"""
+    import torch
+
+    texts = ["hello", "you are a stupid idiot", "love this " * 30, "", "hate you fool " * 12]
+    with torch.no_grad():
+        inputs = predictor.bert_tokenizer(texts, return_tensors="pt", truncation=True,
+                                          padding=True, max_length=128)
+        expected = torch.softmax(predictor.bert_model(**inputs).logits, dim=1).numpy()
+
+    scores = np.array(predictor._score_bert_cleaned(texts))
+    np.testing.assert_allclose(scores[:, 0], expected[:, 1], atol=1e-5)
+    np.testing.assert_allclose(scores[:, 1], expected.max(axis=1), atol=1e-5)
+
+def test_sliding_window_covers_long_texts(predictor, monkeypatch):
+    """Fenêtres glissantes: le score max porte sur tout le texte, pas seulement les 128 premiers tokens"""
+    import app.inference as inference
+    monkeypatch.setattr(inference, "BERT_SLIDING_WINDOW_ENABLED", True)
+    monkeypatch.setattr(inference, "BERT_WINDOW_POOLING", "max")
+
+    long_text = " ".join(["love this great day"] * 60 + ["hate you stupid idiot fool"] * 10)
+    encoded, sample_mapping = predictor._tokenize_bert([long_text, "hello"])
+    assert list(sample_mapping).count(0) > 1
+    assert list(sample_mapping).count(1) == 1
+
+    window_scores = [
+        predictor._bert_probabilities(
+            {name: np.array([encoded[name][i]]) for name in ("input_ids", "attention_mask", "token_type_ids")}
+        )[0, 1]
+        for i, sample in enumerate(sample_mapping) if sample == 0
+    ]
+
+    pooled = predictor._score_bert_cleaned([long_text, "hello"])
+    assert pooled[0][0] == pytest.approx(max(window_scores), abs=1e-5)
@@ -0,0 +1,33 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).parent.parent
+
+def test_stats_aggregated_across_forked_workers(tmp_path):
+    """Mode multiprocess: /stats additionne les requêtes de workers forkés après le preload"""
+    code = (
+        "import json, os\n"
+        "from app.main import update_stats\n"
+        "from app.multiprocess import aggregate_request_stats\n"
+        "for model, level in [('simple', 'low'), ('bert', 'high')]:\n"
+        "    pid = os.fork()\n"
+        "    if pid == 0:\n"
+        "        update_stats(model, 10.0, level); update_stats(model, 20.0, level)\n"
+        "        os._exit(0)\n"
+        "    os.waitpid(pid, 0)\n"
+        "stats = aggregate_request_stats()\n"
+        "stats['last_request'] = stats['last_request'] is not None\n"
+        "print(json.dumps(stats))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=API_DIR, capture_output=True, text=True, check=True,
+        env={"PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "ENABLED_MODELS": "simple", "PATH": ""}
+    ).stdout
+    stats = json.loads(output.strip().splitlines()[-1])
+    assert stats["total_requests"] == 4
+    assert stats["requests_per_model"] == {"bert": 2, "simple": 2}
+    assert stats["toxicity_distribution"] == {"low": 2, "medium": 0, "high": 2, "extreme": 0}
+    assert stats["average_processing_time_ms"] == 15.0
+    assert stats["last_request"]
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+onnx = pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from onnx import TensorProto, helper, numpy_helper
+from app.onnx_backend import OnnxBertSession, export_bert_to_onnx
+
+TEXTS = ["hello good day", "you are a stupid idiot", "", "love love love this great day",
+         "hate you fool " * 20]
+
+def build_bag_of_embeddings_model(path, embeddings):
+    """Modèle ONNX minimal: logits = somme des embeddings des tokens"""
+    graph = helper.make_graph(
+        [
+            helper.make_node("Gather", ["embeddings", "input_ids"], ["gathered"]),
+            helper.make_node("ReduceSum", ["gathered", "axes"], ["logits"], keepdims=0),
+        ],
+        "bag_of_embeddings",
+        [helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch", "sequence"])],
+        [helper.make_tensor_value_info("logits", TensorProto.FLOAT, ["batch", 2])],
+        initializer=[
+            numpy_helper.from_array(embeddings, "embeddings"),
+            numpy_helper.from_array(np.array([1], dtype=np.int64), "axes"),
+        ],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 14)])
+    onnx.save(model, str(path))
+
+def test_onnx_session_probabilities(tmp_path):
+    """Softmax des logits ONNX; seules les entrées déclarées par le modèle sont passées"""
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(10, 2)).astype(np.float32)
+    build_bag_of_embeddings_model(tmp_path / "model.onnx", embeddings)
+
+    session = OnnxBertSession(tmp_path / "model.onnx", intra_op_threads=1)
+    input_ids = np.array([[1, 2, 3], [4, 4, 0]])
+    encoded = {"input_ids": input_ids, "attention_mask": np.ones_like(input_ids),
+               "token_type_ids": np.zeros_like(input_ids)}
+    probabilities = session.predict_proba(encoded)
+
+    logits = embeddings[input_ids].sum(axis=1).astype(np.float64)
+    expected = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+    np.testing.assert_allclose(probabilities, expected, atol=1e-6)
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+
+@pytest.mark.parametrize("quantize,tolerance", [(False, 1e-4), (True, 2e-2)])
+def test_onnx_backend_matches_torch(tiny_bert_path, tmp_path, quantize, tolerance):
+    """Parité des scores entre les backends PyTorch et ONNX (fp32 et int8)"""
+    pytest.importorskip("torch.onnx")
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    onnx_path = export_bert_to_onnx(tiny_bert_path, tmp_path / "onnx", quantize=quantize)
+    session = OnnxBertSession(onnx_path)
+
+    tokenizer = AutoTokenizer.from_pretrained(str(tiny_bert_path))
+    model = AutoModelForSequenceClassification.from_pretrained(str(tiny_bert_path)).eval()
+    with torch.no_grad():
+        inputs = tokenizer(TEXTS, return_tensors="pt", truncation=True, padding=True, max_length=128)
+        expected = torch.softmax(model(**inputs).logits, dim=1).numpy()
+
+    encoded = tokenizer(TEXTS, return_tensors="np", truncation=True, padding=True, max_length=128)
+    np.testing.assert_allclose(session.predict_proba(encoded), expected, atol=tolerance)
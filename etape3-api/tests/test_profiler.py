@@ -0,0 +1,90 @@
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app import auth
+from app.main import app
+from app.profiler import SamplingProfiler
+
+client = TestClient(app)
+
+def busy_loop_for_profile(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+def idle_wait_for_profile(stop):
+    stop.wait()
+
+@pytest.fixture
+def background_threads():
+    """Un thread qui calcule et un thread qui attend"""
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=busy_loop_for_profile, args=(stop,), name="busy-thread"),
+        threading.Thread(target=idle_wait_for_profile, args=(stop,), name="idle-thread"),
+    ]
+    for thread in threads:
+        thread.start()
+    yield
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+def profile(mode, seconds=0.4):
+    profiler = SamplingProfiler(0.005, mode)
+    profiler.start()
+    time.sleep(seconds)
+    return profiler.stop()
+
+def test_wall_profile_samples_all_threads(background_threads):
+    """Mode wall: threads actifs et en attente, nom du thread en racine"""
+    collapsed = profile("wall").to_collapsed()
+    assert any(line.startswith("busy-thread;") and "busy_loop_for_profile" in line for line in collapsed.splitlines())
+    assert any(line.startswith("idle-thread;") and "idle_wait_for_profile" in line for line in collapsed.splitlines())
+    assert "sampling-profiler" not in collapsed
+
+def test_cpu_profile_skips_idle_threads(background_threads):
+    """Mode cpu: seul le thread qui consomme du CPU apparaît"""
+    collapsed = profile("cpu").to_collapsed()
+    assert "busy_loop_for_profile" in collapsed
+    assert "idle_wait_for_profile" not in collapsed
+
+def test_speedscope_export(background_threads):
+    """Format speedscope: un profil par thread, indices de frames valides"""
+    document = profile("wall", seconds=0.2).to_speedscope()
+    frame_count = len(document["shared"]["frames"])
+    assert {"busy-thread", "idle-thread"} <= {p["name"] for p in document["profiles"]}
+    for sampled in document["profiles"]:
+        assert sampled["type"] == "sampled"
+        assert len(sampled["samples"]) == len(sampled["weights"])
+        assert all(0 <= index < frame_count for stack in sampled["samples"] for index in stack)
+
+def test_continuous_profile_keeps_last_buckets():
+    """Mode continu: seules les dernières fenêtres sont conservées"""
+    profiler = SamplingProfiler(0.005, "wall", bucket_seconds=0.05, max_buckets=2)
+    profiler.start()
+    time.sleep(0.4)
+    recent = profiler.snapshot(0.05)
+    everything = profiler.stop()
+    assert len(profiler._buckets) == 2
+    assert everything.duration < 0.2
+    assert 0 < recent.ticks <= everything.ticks
+
+def test_profile_endpoint_requires_admin(monkeypatch):
+    """Sans clé configurée: 403; clé absente ou fausse: 401"""
+    assert client.post("/admin/profile?seconds=0.1").status_code == 403
+    monkeypatch.setattr(auth, "ADMIN_API_KEYS", ["secret-admin-key"])
+    assert client.post("/admin/profile?seconds=0.1").status_code == 401
+    assert client.post("/admin/profile?seconds=0.1", headers={"X-API-Key": "wrong"}).status_code == 401
+
+def test_profile_endpoint_returns_collapsed_stacks(monkeypatch):
+    """Profil ponctuel: fichier de piles repliées téléchargeable"""
+    monkeypatch.setattr(auth, "ADMIN_API_KEYS", ["secret-admin-key"])
+    response = client.post(
+        "/admin/profile?seconds=0.2&interval_ms=5&format=collapsed",
+        headers={"X-API-Key": "secret-admin-key"}
+    )
+    assert response.status_code == 200
+    assert "attachment" in response.headers["content-disposition"]
+    assert int(response.headers["x-profile-samples"]) > 0
+    assert "MainThread;" in response.text
@@ -0,0 +1,53 @@
+import os
+import pytest
+from app import runtime
+from app.runtime import LatencyTracker, cgroup_cpu_quota, container_cpu_count
+
+@pytest.fixture
+def cgroup(tmp_path, monkeypatch):
+    """Fichiers cgroup factices"""
+    monkeypatch.setattr(runtime, "CGROUP_V2_CPU_MAX", tmp_path / "cpu.max")
+    monkeypatch.setattr(runtime, "CGROUP_V1_QUOTA", tmp_path / "cpu.cfs_quota_us")
+    monkeypatch.setattr(runtime, "CGROUP_V1_PERIOD", tmp_path / "cpu.cfs_period_us")
+    return tmp_path
+
+def test_cgroup_v2_quota(cgroup):
+    """cgroup v2: limite 500m -> 0.5 cœur, arrondi à 1 thread"""
+    (cgroup / "cpu.max").write_text("50000 100000\n")
+    assert cgroup_cpu_quota() == 0.5
+    assert container_cpu_count() == 1
+
+def test_cgroup_v2_unlimited(cgroup):
+    """Sans limite, on garde les cœurs disponibles pour le processus"""
+    (cgroup / "cpu.max").write_text("max 100000\n")
+    assert cgroup_cpu_quota() is None
+    assert container_cpu_count() == len(os.sched_getaffinity(0))
+
+def test_cgroup_v1_quota(cgroup):
+    """cgroup v1: quota / période, plafonné aux cœurs disponibles"""
+    (cgroup / "cpu.cfs_quota_us").write_text("150000\n")
+    (cgroup / "cpu.cfs_period_us").write_text("100000\n")
+    assert cgroup_cpu_quota() == 1.5
+    assert container_cpu_count() == min(2, len(os.sched_getaffinity(0)))
+
+def test_latency_tracker_percentiles():
+    """p50 / p99 sur la fenêtre glissante"""
+    tracker = LatencyTracker(window=100)
+    assert tracker.summary()["p50"] is None
+
+    for latency in range(1, 201):
+        tracker.record(float(latency))
+    summary = tracker.summary()
+    assert summary["samples"] == 100
+    assert summary["p50"] == pytest.approx(150.5)
+    assert summary["p99"] == pytest.approx(199.01)
+
+def test_worker_thread_budget_splits_quota(cgroup, monkeypatch):
+    """Quota de 4 cœurs partagé entre 3 workers: 1 thread chacun, jamais 0"""
+    (cgroup / "cpu.max").write_text("400000 100000\n")
+    monkeypatch.setattr(runtime, "_worker_count", 1)
+    assert runtime.worker_thread_budget() == min(4, len(os.sched_getaffinity(0)))
+    runtime.set_worker_count(3)
+    assert runtime.worker_thread_budget() == 1
+    runtime.set_worker_count(8)
+    assert runtime.worker_thread_budget() == 1
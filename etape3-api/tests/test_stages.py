@@ -0,0 +1,73 @@
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from app import stages
+from app.main import app
+from app.inference import predictor
+from app.executor import InferencePool, inference_pools
+from app.stages import StageTimer, trace_id_from_headers, with_queue_wait
+
+client = TestClient(app)
+
+@pytest.fixture
+def simple_pool(monkeypatch):
+    """Pool neuf (celui de l'application est arrêté à la fin d'un `with TestClient(app)`)"""
+    pool = InferencePool("simple", max_workers=1, max_queue=8)
+    monkeypatch.setitem(inference_pools, "simple", pool)
+    yield pool
+    pool.shutdown()
+
+def stage_count(model_type, stage):
+    return REGISTRY.get_sample_value(
+        "toxicity_stage_seconds_count", {"model_type": model_type, "stage": stage}
+    ) or 0.0
+
+def test_stage_timer_accumulates_laps():
+    """Une étape chronométrée en plusieurs tours est additionnée; queue_wait = reste de l'attente"""
+    timer = StageTimer()
+    timer.lap("tokenize")
+    timer.lap("infer")
+    timer.lap("tokenize")
+    assert set(timer.stages) == {"tokenize", "infer"}
+    request_stages = with_queue_wait(timer.stages, 1.0)
+    assert request_stages["queue_wait"] == pytest.approx(1.0 - sum(timer.stages.values()))
+    assert "queue_wait" not in timer.stages
+
+def test_trace_id_from_headers():
+    """traceparent W3C, sinon X-Cloud-Trace-Context; valeurs invalides ignorées"""
+    assert trace_id_from_headers(
+        {"traceparent": "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"}
+    ) == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert trace_id_from_headers({"x-cloud-trace-context": "105445aa7843bc8bf206b120001000/1;o=1"}) == (
+        "105445aa7843bc8bf206b120001000"
+    )
+    assert trace_id_from_headers({"traceparent": "garbage"}) is None
+    assert trace_id_from_headers({}) is None
+
+def test_predict_batch_reports_stages():
+    """Modèle simple: nettoyage, vectorisation, inférence et post-traitement chronométrés"""
+    results = predictor.predict_batch(["you are an idiot", "what a lovely day"], "simple")
+    assert {"clean", "vectorize", "infer", "postprocess"} <= set(results[0]["stage_seconds"])
+    assert all(seconds >= 0 for seconds in results[0]["stage_seconds"].values())
+
+def test_analyze_observes_stage_histograms(simple_pool):
+    """/analyze: histogrammes par étape, attente et sérialisation comprises"""
+    before = {stage: stage_count("simple", stage) for stage in ("queue_wait", "clean", "infer", "serialize")}
+    response = client.post("/analyze", json={"text": "Stage timing check", "model": "simple"})
+    assert response.status_code == 200
+    assert "stage_seconds" not in response.json()
+    for stage, count in before.items():
+        assert stage_count("simple", stage) == count + 1
+
+def test_stage_exemplars_in_openmetrics(simple_pool, monkeypatch):
+    """Exemplars: identifiant de trace exposé au format OpenMetrics"""
+    monkeypatch.setattr(stages, "STAGE_EXEMPLARS_ENABLED", True)
+    trace_id = "0af7651916cd43dd8448eb211c80319c"
+    client.post(
+        "/analyze",
+        json={"text": "Exemplar check", "model": "simple"},
+        headers={"traceparent": f"00-{trace_id}-b7ad6b7169203331-01"}
+    )
+    metrics = client.get("/metrics", headers={"Accept": "application/openmetrics-text; version=1.0.0"})
+    assert metrics.headers["content-type"].startswith("application/openmetrics-text")
+    assert f'trace_id="{trace_id}"' in metrics.text
@@ -0,0 +1,37 @@
+import subprocess
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).parent.parent
+
+def test_inference_import_defers_heavy_backends():
+    """Importer app.inference n'importe ni torch, ni transformers, ni sklearn"""
+    code = (
+        "import sys, app.inference; "
+        "print(sorted(m for m in ('torch', 'transformers', 'sklearn', 'onnxruntime') if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=API_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
+
+def test_disabled_model_is_never_loaded():
+    """ENABLED_MODELS=simple: BERT n'est pas chargé et ses backends ne sont pas importés"""
+    code = (
+        "import sys, app.inference as i; "
+        "print(i.predictor.load_bert_model(), i.predictor.load_simple_model(), 'transformers' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=API_DIR, capture_output=True, text=True, check=True,
+        env={"ENABLED_MODELS": "simple", "PATH": ""}
+    ).stdout
+    assert output.strip().splitlines()[-1] == "False True False"
+
+def test_startup_timings_in_model_info():
+    """Durées des phases de démarrage exposées par get_model_info()"""
+    from app.inference import ModelPredictor
+    predictor = ModelPredictor()
+    predictor.load_simple_model()
+    info = predictor.get_model_info()
+    assert "enabled_models" in info
+    assert any(phase.startswith("simple.") for phase in info["startup_timings"])
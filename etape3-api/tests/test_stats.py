@@ -0,0 +1,54 @@
+import threading
+import numpy as np
+import pytest
+from app.stats import LatencySketch, RingBuffer, RequestStats
+
+def test_sketch_percentiles_within_relative_accuracy():
+    """p50/p90/p99 à 1 % près des percentiles exacts, maximum exact"""
+    values = np.random.default_rng(0).lognormal(mean=2.0, sigma=1.0, size=20000)
+    sketch = LatencySketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(float(value))
+
+    for q in (0.5, 0.9, 0.99):
+        exact = np.quantile(values, q, method="lower")
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+    assert sketch.max == values.max()
+    assert sketch.count == values.size
+
+def test_sketch_clamps_out_of_range_values():
+    """Valeurs nulles ou énormes: pas d'erreur, maximum conservé"""
+    sketch = LatencySketch()
+    sketch.add(0.0)
+    sketch.add(5e7)
+    assert sketch.summary()["count"] == 2
+    assert sketch.summary()["max"] == 5e7
+    assert LatencySketch().summary() == {"count": 0, "p50": None, "p90": None, "p99": None, "max": None}
+
+def test_ring_buffer_keeps_last_values():
+    """Au-delà de la capacité, seules les dernières valeurs restent"""
+    buffer = RingBuffer(3)
+    for value in range(5):
+        buffer.append(float(value))
+    assert len(buffer) == 3
+    assert sorted(buffer.values()) == [2.0, 3.0, 4.0]
+
+def test_request_stats_concurrent_updates():
+    """Mises à jour concurrentes (tâches de fond): aucun compte perdu"""
+    stats = RequestStats(window=100)
+
+    def worker():
+        for i in range(1000):
+            stats.record("simple", float(i % 50 + 1), "low")
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snapshot = stats.snapshot()
+    assert snapshot["total_requests"] == 8000
+    assert snapshot["latency_per_model"]["simple"]["count"] == 8000
+    assert snapshot["latency_per_level"]["low"]["max"] == 50.0
+    assert snapshot["latency_per_model"]["bert"]["p99"] is None
@@ -0,0 +1,91 @@
+import random
+import re
+import pytest
+from app.text_cleaning import clean_text_light, clean_text_full
+
+# Implémentations d'origine de ModelPredictor (référence pour l'équivalence)
+def reference_clean_text_light(text):
+    if not isinstance(text, str):
+        return ""
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    return text
+
+def reference_clean_text_full(text):
+    if not isinstance(text, str):
+        return ""
+    text = str(text)
+    text = text.lower()
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'#\w+', '', text)
+    text = re.sub(r'[^a-zA-Z\s]', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    return text
+
+# Sorties de référence figées
+GOLDEN_FULL = [
+    ("Hello, this is a nice comment", "hello this is a nice comment"),
+    ("You are STUPID!!! and ugly :(", "you are stupid and ugly"),
+    ("Check https://example.com/page?id=3 now", "check now"),
+    ("visit www.site.org or HTTP://X.COM", "visit or"),
+    ("@john_doe you're #1 #winning", "you re"),
+    ("email me: bob@mail.com", "email me bob com"),
+    ("a@bhttp://x c", "a c"),
+    ("#@ab @#cd", ""),
+    ("Café déjà vu", "caf d j vu"),
+    ("  \t\n  ", ""),
+    ("123 456", ""),
+    ("", ""),
+]
+
+GOLDEN_LIGHT = [
+    ("Hello,   this is\ta nice\n comment ", "Hello, this is a nice comment"),
+    ("Check https://example.com/page now", "Check now"),
+    ("HTTP://UPPER.COM stays", "HTTP://UPPER.COM stays"),
+    ("www.site.org@me #tag", "#tag"),
+    (" non-breaking spaces　", "non-breaking spaces"),
+    ("", ""),
+]
+
+@pytest.mark.parametrize("text,expected", GOLDEN_FULL)
+def test_clean_text_full_golden(text, expected):
+    """Sorties figées du nettoyage complet"""
+    assert clean_text_full(text) == expected
+    assert reference_clean_text_full(text) == expected
+
+@pytest.mark.parametrize("text,expected", GOLDEN_LIGHT)
+def test_clean_text_light_golden(text, expected):
+    """Sorties figées du nettoyage léger"""
+    assert clean_text_light(text) == expected
+    assert reference_clean_text_light(text) == expected
+
+@pytest.mark.parametrize("value", [None, 42, 3.5, ["text"]])
+def test_non_string_inputs(value):
+    """Les entrées non textuelles donnent une chaîne vide"""
+    assert clean_text_full(value) == ""
+    assert clean_text_light(value) == ""
+
+def test_equivalence_on_random_texts():
+    """Équivalence exacte sur des textes aléatoires riches en cas limites"""
+    fragments = list("aAzZ@#_ 1.:/?-'\t\n") + [
+        "http", "https://", "www.", "HTTP", "@user", "#tag", "é", "İ", "ß",
+        " ", " ", "٣", "ǅ", "😀", "  "
+    ]
+    rng = random.Random(42)
+    for _ in range(20000):
+        text = "".join(rng.choice(fragments) for _ in range(rng.randint(0, 40)))
+        assert clean_text_full(text) == reference_clean_text_full(text), repr(text)
+        assert clean_text_light(text) == reference_clean_text_light(text), repr(text)
+
+def test_equivalence_on_long_texts():
+    """Équivalence sur des textes de 5000 caractères (limite de l'API)"""
+    words = ["hello", "You", "idiot!!", "@someone", "#hashtag", "https://t.co/xyz",
+             "www.example.com", "42", "l'été", "\n\n", "ok...", "WOW"]
+    rng = random.Random(7)
+    for _ in range(50):
+        text = " ".join(rng.choice(words) for _ in range(1200))[:5000]
+        assert clean_text_full(text) == reference_clean_text_full(text)
+        assert clean_text_light(text) == reference_clean_text_light(text)
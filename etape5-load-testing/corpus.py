@@ -0,0 +1,208 @@
+"""
+Générateur de flux de requêtes réalistes pour les tests de charge
+
+Les scénarios Locust tournent sur une vingtaine de phrases: le cache de l'API
+y paraît parfait et les textes longs ne sont jamais testés. Ce script produit
+un flux synthétique (même approche Faker que etape1-anonymisation/data/
+enrichissement.py: pseudos, e-mails, URLs mêlés aux commentaires) à partir de:
+- une distribution de longueur (nombre de mots log-normal, tronqué à 5000 caractères)
+- un taux de répétition (texte déjà envoyé, popularité concentrée sur les
+  premiers textes) et un taux de quasi-doublons (casse, ponctuation, espaces)
+- une proportion de textes toxiques et de requêtes BERT
+- un débit moyen (arrivées de Poisson)
+
+Format .jsonl.gz compact et rejouable (voir stream_format.py, relu sans Faker):
+    ligne 1        en-tête (paramètres, versions, nombre de textes et de requêtes)
+    n lignes       textes uniques (chaînes JSON)
+    m lignes       requêtes [décalage_ms, index_texte, modèle]
+
+Même graine et même version de Faker = même flux; le fichier généré est
+l'artefact à rejouer: `python loadtest.py --stream streams/mix.jsonl.gz`.
+
+Usage:
+    python corpus.py --requests 20000 --rate 50 --seed 42 --output streams/mix.jsonl.gz
+    python corpus.py --requests 5000 --repeat-rate 0.6 --toxic-ratio 0.3 --length-median 60
+"""
+import argparse
+import math
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from faker import Faker
+from faker import VERSION as FAKER_VERSION
+
+from messages import FRIENDLY_MESSAGES, NEUTRAL_MESSAGES, TOXIC_MESSAGES
+from stream_format import describe_stream, write_stream
+
+MAX_TEXT_LENGTH = 5000  # limite de l'API (etape3-api/app/config.py)
+
+INSULTS = ["idiot", "stupid", "moron", "loser", "pathetic", "worthless", "dumb", "clown", "trash",
+           "fool"]
+EMOJIS = ["😂", "🙄", "👍", "🔥", "😡", "❤️"]
+
+
+class StreamParams:
+    """Paramètres du flux (enregistrés dans l'en-tête du fichier)"""
+
+    def __init__(self, requests: int = 10000, rate: float = 50.0, seed: int = 42,
+                 length_median: float = 20.0, length_sigma: float = 1.0,
+                 repeat_rate: float = 0.3, near_dup_rate: float = 0.05,
+                 popularity_skew: float = 3.0,
+                 toxic_ratio: float = 0.1, bert_ratio: float = 0.0, locale: str = "en_US"):
+        self.requests = requests
+        self.rate = rate
+        self.seed = seed
+        self.length_median = length_median
+        self.length_sigma = length_sigma
+        self.repeat_rate = repeat_rate
+        self.near_dup_rate = near_dup_rate
+        self.popularity_skew = popularity_skew
+        self.toxic_ratio = toxic_ratio
+        self.bert_ratio = bert_ratio
+        self.locale = locale
+
+    def to_dict(self) -> Dict:
+        return dict(vars(self))
+
+
+class CorpusGenerator:
+    """Textes synthétiques (Faker) avec longueur, toxicité et répétitions contrôlées"""
+
+    def __init__(self, params: StreamParams):
+        self.params = params
+        self.rng = random.Random(params.seed)
+        self.fake = Faker(params.locale)
+        self.fake.seed_instance(params.seed)
+
+    def word_count(self) -> int:
+        """Nombre de mots log-normal (médiane length_median, longue traîne)"""
+        median = math.log(self.params.length_median)
+        words = self.rng.lognormvariate(median, self.params.length_sigma)
+        return max(1, int(words))
+
+    def _fragment(self) -> str:
+        """Phrase Faker, phrase de test ou donnée personnelle comme dans les commentaires réels"""
+        draw = self.rng.random()
+        if draw < 0.55:
+            return self.fake.sentence(nb_words=self.rng.randint(5, 18))
+        if draw < 0.75:
+            return self.rng.choice(FRIENDLY_MESSAGES + NEUTRAL_MESSAGES)
+        if draw < 0.85:
+            return f"@{self.fake.user_name()}"
+        if draw < 0.93:
+            return self.fake.url()
+        if draw < 0.97:
+            return self.fake.email()
+        return self.rng.choice(EMOJIS)
+
+    def _toxic_fragment(self) -> str:
+        if self.rng.random() < 0.5:
+            return self.rng.choice(TOXIC_MESSAGES)
+        return f"You {self.rng.choice(INSULTS)} {self.rng.choice(INSULTS)}!"
+
+    def new_text(self, toxic: bool) -> str:
+        target = self.word_count()
+        fragments, words = [], 0
+        while words < target:
+            if toxic and self.rng.random() < 0.35:
+                fragment = self._toxic_fragment()
+            else:
+                fragment = self._fragment()
+            fragments.append(fragment)
+            words += len(fragment.split())
+        if toxic and not any(fragment in TOXIC_MESSAGES or fragment.startswith("You ")
+                             for fragment in fragments):
+            fragments.insert(self.rng.randrange(len(fragments) + 1), self._toxic_fragment())
+        return " ".join(fragments)[:MAX_TEXT_LENGTH]
+
+    def near_duplicate(self, text: str) -> str:
+        """Quasi-doublon, souvent identique une fois nettoyé (casse, ponctuation, espaces, emoji)"""
+        variant = self.rng.choice(("upper", "punct", "spaces", "emoji"))
+        if variant == "upper":
+            text = text.upper()
+        elif variant == "punct":
+            text = text.rstrip(".!?") + self.rng.choice(("!!!", "?", "..."))
+        elif variant == "spaces":
+            text = "  " + text.replace(" ", "  ", 3) + " "
+        else:
+            text = f"{text} {self.rng.choice(EMOJIS)}"
+        return text[:MAX_TEXT_LENGTH]
+
+    def generate(self) -> Tuple[List[str], List[Tuple[int, int, str]]]:
+        """Textes uniques et requêtes (décalage ms, index du texte, modèle)"""
+        texts: List[str] = []
+        index_of: Dict[str, int] = {}
+        requests = []
+        offset = 0.0
+
+        for _ in range(self.params.requests):
+            offset += self.rng.expovariate(self.params.rate)
+            draw = self.rng.random()
+            if texts and draw < self.params.repeat_rate:
+                # Popularité: les premiers textes reviennent plus souvent
+                index = int(len(texts) * self.rng.random() ** self.params.popularity_skew)
+            else:
+                if texts and draw < self.params.repeat_rate + self.params.near_dup_rate:
+                    text = self.near_duplicate(texts[self.rng.randrange(len(texts))])
+                else:
+                    text = self.new_text(self.rng.random() < self.params.toxic_ratio)
+                index = index_of.get(text)
+                if index is None:
+                    index = index_of[text] = len(texts)
+                    texts.append(text)
+            model = "bert" if self.rng.random() < self.params.bert_ratio else "simple"
+            requests.append((int(offset * 1000), index, model))
+
+        return texts, requests
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--rate", type=float, default=50.0, help="débit moyen du flux (requêtes/s)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--length-median", type=float, default=20.0, help="nombre de mots médian")
+    parser.add_argument("--length-sigma", type=float, default=1.0,
+                        help="dispersion log-normale (traîne des textes longs)")
+    parser.add_argument("--repeat-rate", type=float, default=0.3,
+                        help="part des requêtes reprenant un texte déjà envoyé")
+    parser.add_argument("--near-dup-rate", type=float, default=0.05,
+                        help="part des requêtes quasi-doublons")
+    parser.add_argument("--popularity-skew", type=float, default=3.0,
+                        help="concentration des répétitions (1 = uniforme)")
+    parser.add_argument("--toxic-ratio", type=float, default=0.1)
+    parser.add_argument("--bert-ratio", type=float, default=0.0,
+                        help="part des requêtes envoyées au modèle bert")
+    parser.add_argument("--locale", default="en_US")
+    parser.add_argument("--output", type=Path,
+                        default=Path(__file__).parent / "streams" / "stream.jsonl.gz")
+    args = parser.parse_args(argv)
+
+    if args.repeat_rate + args.near_dup_rate > 1:
+        parser.error("--repeat-rate + --near-dup-rate doit rester <= 1")
+
+    params = StreamParams(
+        requests=args.requests, rate=args.rate, seed=args.seed,
+        length_median=args.length_median, length_sigma=args.length_sigma,
+        repeat_rate=args.repeat_rate, near_dup_rate=args.near_dup_rate,
+        popularity_skew=args.popularity_skew,
+        toxic_ratio=args.toxic_ratio, bert_ratio=args.bert_ratio, locale=args.locale
+    )
+    print(f"🔄 Génération de {params.requests} requêtes (graine {params.seed})...")
+    texts, requests = CorpusGenerator(params).generate()
+    write_stream(args.output, params.to_dict(), texts, requests, FAKER_VERSION)
+
+    summary = describe_stream(texts, requests)
+    print(f"✅ Flux écrit: {args.output} ({args.output.stat().st_size / 1024:.0f} Ko)")
+    print(f"📊 {summary['unique_texts']} textes uniques ({summary['unique_ratio']:.0%}), "
+          f"{summary['duration_seconds']}s à {params.rate} req/s, "
+          f"longueur p50 {summary['chars_p50']} / p95 {summary['chars_p95']} / "
+          f"max {summary['chars_max']} caractères")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
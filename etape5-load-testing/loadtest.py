@@ -0,0 +1,537 @@
+"""
+Test de charge scripté (CI) pour l'API Digital Social Score
+
+Contrairement à locustfile.py (interactif, hôte distant), ce script:
+- lance l'API localement (sous-processus uvicorn ou serveur dans le processus)
+  ou cible une URL existante (--url)
+- génère une charge en boucle ouverte: les arrivées suivent un profil de débit
+  (constant, step, spike) quel que soit le temps de réponse, et la latence est
+  mesurée depuis l'instant d'arrivée prévu (pas d'omission coordonnée)
+- écrit p50/p95/p99, débit et taux d'erreur (global, par endpoint, par seconde) en JSON
+- retourne un code non nul si un SLO déclaré (--slo) n'est pas respecté
+- ou rejoue un flux généré par corpus.py (--stream): mêmes textes, mêmes
+  instants d'arrivée (accélérables avec --speed) à chaque exécution
+
+Scénarios: analyze (POST /analyze, modèle simple), health (GET /health),
+mixed (analyses simple + bert et health). En local sans artefacts BERT, les
+requêtes bert du scénario mixed répondent 503.
+
+Usage:
+    python loadtest.py --scenario analyze --profile constant --rate 50 --duration 30
+    python loadtest.py --scenario mixed --profile step --rate 10 --step-rate 10 --step-seconds 10 \\
+        --duration 60
+    python loadtest.py --scenario analyze --profile spike --rate 20 --spike-rate 200 \\
+        --spike-at 10 --spike-seconds 5 --slo "p99_ms<=800" --slo "error_rate<=0.01" \\
+        --output results/spike.json
+    python loadtest.py --url http://34.145.51.226 --scenario health --rate 5 --duration 10
+    python loadtest.py --stream streams/mix.jsonl.gz --speed 2 --duration 60
+
+Codes de sortie: 0 SLO respectés, 1 SLO non respecté, 2 API injoignable.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from messages import EXPECTED_RANGES, FRIENDLY_MESSAGES, NEUTRAL_MESSAGES, TOXIC_MESSAGES
+from stream_format import read_stream
+
+API_DIR = Path(__file__).resolve().parent.parent / "etape3-api"
+
+# Seuils repris des recommandations du README (latence > 500 ms, erreurs > 5 %)
+DEFAULT_SLOS = ["p95_ms<=500", "error_rate<=0.05"]
+
+MESSAGES = {"friendly": FRIENDLY_MESSAGES, "neutral": NEUTRAL_MESSAGES, "toxic": TOXIC_MESSAGES}
+MESSAGE_WEIGHTS = {"friendly": 5, "neutral": 3, "toxic": 2}  # mêmes poids que locustfile.py
+
+
+# ============================================================================
+# SCÉNARIOS
+# ============================================================================
+
+class RequestSpec:
+    """Une requête du scénario: endpoint, corps JSON et catégorie de message"""
+
+    def __init__(self, name: str, method: str, path: str, payload: Optional[Dict] = None,
+                 category: str = None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.payload = payload
+        self.category = category
+
+
+def analyze_request(rng: random.Random, model: str) -> RequestSpec:
+    category = rng.choices(list(MESSAGE_WEIGHTS), weights=list(MESSAGE_WEIGHTS.values()))[0]
+    text = rng.choice(MESSAGES[category])
+    return RequestSpec(f"POST /analyze [{model}]", "POST", "/analyze",
+                       {"text": text, "model": model}, category)
+
+
+def health_request(rng: random.Random) -> RequestSpec:
+    return RequestSpec("GET /health", "GET", "/health")
+
+
+# Scénario -> [(poids, fabrique de requête)]
+SCENARIOS: Dict[str, List[Tuple[int, Callable[[random.Random], RequestSpec]]]] = {
+    "analyze": [(1, lambda rng: analyze_request(rng, "simple"))],
+    "health": [(1, health_request)],
+    "mixed": [
+        (5, lambda rng: analyze_request(rng, "simple")),
+        (3, lambda rng: analyze_request(rng, "bert")),
+        (2, health_request),
+    ],
+}
+
+
+def pick_request(scenario: str, rng: random.Random) -> RequestSpec:
+    weights, factories = zip(*SCENARIOS[scenario])
+    return rng.choices(factories, weights=weights)[0](rng)
+
+
+def stream_plan(path: Path, duration: float,
+                speed: float = 1.0) -> Tuple[List[Tuple[float, RequestSpec]], Dict]:
+    """Requêtes d'un flux corpus.py arrivant avant `duration` (décalages divisés par `speed`)"""
+    header, texts, requests = read_stream(path)
+    plan = []
+    for offset_ms, index, model in requests:
+        offset = offset_ms / 1000 / speed
+        if offset >= duration:
+            break
+        spec = RequestSpec(f"POST /analyze [{model}]", "POST", "/analyze",
+                           {"text": texts[index], "model": model})
+        plan.append((offset, spec))
+    return plan, {"kind": "stream", "path": str(path), "speed": speed, "params": header["params"]}
+
+
+def check_response(spec: RequestSpec, response: httpx.Response) -> Tuple[Optional[str], bool]:
+    """Erreur éventuelle (None si succès) et score hors de la plage attendue"""
+    if response.status_code != 200:
+        return f"http_{response.status_code}", False
+    try:
+        data = response.json()
+    except ValueError:
+        return "invalid_json", False
+
+    if spec.path == "/health":
+        return (None if data.get("status") in ("healthy", "degraded") else "unhealthy"), False
+
+    score = data.get("score")
+    if not isinstance(score, (int, float)) or not 0 <= score <= 100:
+        return "invalid_score", False
+    if spec.category not in EXPECTED_RANGES:
+        return None, False
+    low, high = EXPECTED_RANGES[spec.category]
+    return None, not low <= score <= high
+
+
+# ============================================================================
+# PROFILS DE CHARGE (boucle ouverte)
+# ============================================================================
+
+class LoadProfile:
+    """
+    Débit d'arrivée (requêtes/s) en fonction du temps écoulé
+
+    - constant: `rate`
+    - step: `rate`, augmenté de `step_rate` toutes les `step_seconds`
+    - spike: `rate`, `spike_rate` entre `spike_at` et `spike_at + spike_seconds`
+    """
+
+    def __init__(self, kind: str, rate: float, step_rate: float = 0.0, step_seconds: float = 10.0,
+                 spike_rate: float = 0.0, spike_at: float = 0.0, spike_seconds: float = 0.0):
+        if kind not in ("constant", "step", "spike"):
+            raise ValueError(f"Profil inconnu: {kind}")
+        self.kind = kind
+        self.rate = rate
+        self.step_rate = step_rate
+        self.step_seconds = step_seconds
+        self.spike_rate = spike_rate
+        self.spike_at = spike_at
+        self.spike_seconds = spike_seconds
+
+    def rate_at(self, elapsed: float) -> float:
+        if self.kind == "step":
+            return self.rate + self.step_rate * int(elapsed // self.step_seconds)
+        if self.kind == "spike" and self.spike_at <= elapsed < self.spike_at + self.spike_seconds:
+            return self.spike_rate
+        return self.rate
+
+    def arrival_times(self, duration: float, rng: random.Random,
+                      poisson: bool = True) -> List[float]:
+        """Instants d'arrivée (s depuis le début): processus de Poisson ou intervalles réguliers"""
+        arrivals = []
+        elapsed = 0.0
+        while True:
+            rate = self.rate_at(elapsed)
+            if rate <= 0:
+                elapsed += 0.1
+            else:
+                elapsed += rng.expovariate(rate) if poisson else 1.0 / rate
+            if elapsed >= duration:
+                return arrivals
+            if rate > 0:
+                arrivals.append(elapsed)
+
+    def describe(self) -> Dict:
+        description = {"kind": self.kind, "rate": self.rate}
+        if self.kind == "step":
+            description.update(step_rate=self.step_rate, step_seconds=self.step_seconds)
+        elif self.kind == "spike":
+            description.update(spike_rate=self.spike_rate, spike_at=self.spike_at,
+                               spike_seconds=self.spike_seconds)
+        return description
+
+
+# ============================================================================
+# LANCEMENT DE L'API
+# ============================================================================
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class SubprocessServer:
+    """API lancée avec uvicorn dans un processus séparé (comportement le plus proche de la prod)"""
+
+    def __init__(self, port: int, command: Optional[str] = None):
+        self.port = port
+        self.command = command.split() if command else [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"
+        ]
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self):
+        env = dict(os.environ, PORT=str(self.port))
+        self.process = subprocess.Popen(self.command, cwd=API_DIR, env=env)
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self):
+        if self.alive():
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class InProcessServer:
+    """API servie par uvicorn dans un thread du processus de test (rapide, sans isolation)"""
+
+    def __init__(self, port: int):
+        import uvicorn
+
+        sys.path.insert(0, str(API_DIR))
+        from app.main import app
+
+        config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, name="api-server", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def alive(self) -> bool:
+        return self.thread.is_alive()
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=15)
+
+
+def wait_until_ready(base_url: str, server, timeout: float) -> bool:
+    """Attend que /health/ready réponde 200 (modèles chargés et échauffés)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and not server.alive():
+            return False
+        try:
+            if httpx.get(f"{base_url}/health/ready", timeout=2.0).status_code == 200:
+                return True
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    return False
+
+
+# ============================================================================
+# GÉNÉRATION DE CHARGE
+# ============================================================================
+
+async def send(client: httpx.AsyncClient, spec: RequestSpec, scheduled: float, offset: float,
+               records: List[Dict]):
+    loop = asyncio.get_running_loop()
+    error, out_of_range = None, False
+    try:
+        response = await client.request(spec.method, spec.path, json=spec.payload)
+        error, out_of_range = check_response(spec, response)
+    except httpx.TimeoutException:
+        error = "timeout"
+    except httpx.HTTPError as e:
+        error = type(e).__name__
+    records.append({
+        "name": spec.name,
+        "offset": offset,
+        "latency_ms": (loop.time() - scheduled) * 1000,
+        "error": error,
+        "out_of_range": out_of_range
+    })
+
+
+def scenario_plan(scenario: str, profile: LoadProfile, duration: float, seed: int,
+                  poisson: bool = True) -> List[Tuple[float, RequestSpec]]:
+    """Instants d'arrivée du profil et requêtes tirées du scénario (déterministe par graine)"""
+    rng = random.Random(seed)
+    return [(offset, pick_request(scenario, rng))
+            for offset in profile.arrival_times(duration, rng, poisson)]
+
+
+async def run_load(base_url: str, plan: List[Tuple[float, RequestSpec]],
+                   timeout: float) -> Tuple[List[Dict], Dict]:
+    """Envoie les requêtes aux instants prévus sans attendre les réponses précédentes"""
+    records: List[Dict] = []
+    tasks = []
+    max_lag = 0.0
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=256)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for offset, spec in plan:
+            scheduled = start + offset
+            delay = scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            max_lag = max(max_lag, loop.time() - scheduled)
+            tasks.append(asyncio.create_task(send(client, spec, scheduled, offset, records)))
+        await asyncio.gather(*tasks)
+        elapsed = loop.time() - start
+
+    return records, {"scheduled": len(plan), "elapsed_seconds": round(elapsed, 3),
+                     "max_dispatch_lag_ms": round(max_lag * 1000, 3)}
+
+
+# ============================================================================
+# RÉSULTATS ET SLO
+# ============================================================================
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Percentile au rang le plus proche (q entre 0 et 100)"""
+    if not sorted_values:
+        return None
+    rank = min(len(sorted_values), max(1, math.ceil(q / 100 * len(sorted_values)))) - 1
+    return round(sorted_values[rank], 3)
+
+
+def summarize(records: List[Dict], seconds: float) -> Dict:
+    """p50/p95/p99 (ms), débit (réponses réussies/s), taux d'erreur et répartition des erreurs"""
+    latencies = sorted(record["latency_ms"] for record in records)
+    errors = Counter(record["error"] for record in records if record["error"])
+    total = len(records)
+    return {
+        "requests": total,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": round(latencies[-1], 3) if latencies else None,
+        "throughput_rps": round((total - sum(errors.values())) / seconds, 3) if seconds else 0.0,
+        "error_rate": round(sum(errors.values()) / total, 4) if total else 0.0,
+        "out_of_range_rate": (round(sum(r["out_of_range"] for r in records) / total, 4)
+                              if total else 0.0),
+        "errors": dict(errors)
+    }
+
+
+def build_report(records: List[Dict], duration: float) -> Dict:
+    by_endpoint = defaultdict(list)
+    by_second = defaultdict(list)
+    for record in records:
+        by_endpoint[record["name"]].append(record)
+        by_second[int(record["offset"])].append(record)
+
+    timeline = []
+    for second in range(int(duration)):
+        summary = summarize(by_second.get(second, []), 1.0)
+        timeline.append({
+            "second": second,
+            "requests": summary["requests"],
+            "errors": sum(summary["errors"].values()),
+            "p95_ms": summary["p95_ms"]
+        })
+
+    return {
+        "overall": summarize(records, duration),
+        "endpoints": {name: summarize(items, duration)
+                      for name, items in sorted(by_endpoint.items())},
+        "timeline": timeline
+    }
+
+
+SLO_PATTERN = re.compile(r"^\s*(\w+)\s*(<=|>=)\s*([0-9.]+)\s*$")
+
+
+def parse_slo(expression: str) -> Tuple[str, str, float]:
+    """'p95_ms<=500' -> ('p95_ms', '<=', 500.0)"""
+    match = SLO_PATTERN.match(expression)
+    if not match:
+        raise argparse.ArgumentTypeError(
+            f"SLO invalide: {expression!r} (attendu: 'p95_ms<=500', 'throughput_rps>=40')")
+    return match.group(1), match.group(2), float(match.group(3))
+
+
+def evaluate_slos(overall: Dict, slos: List[Tuple[str, str, float]]) -> List[Dict]:
+    checks = []
+    for metric, operator, threshold in slos:
+        value = overall.get(metric)
+        if value is None:
+            passed = False
+        else:
+            passed = value <= threshold if operator == "<=" else value >= threshold
+        checks.append({"slo": f"{metric}{operator}{threshold:g}", "value": value, "passed": passed})
+    return checks
+
+
+# ============================================================================
+# POINT D'ENTRÉE
+# ============================================================================
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_argument_group("cible")
+    target.add_argument("--url", help="API déjà déployée (sinon lancée localement)")
+    target.add_argument("--server", choices=("subprocess", "inprocess"), default="subprocess")
+    target.add_argument("--server-cmd",
+                        help="commande de lancement "
+                             "(ex: 'gunicorn -c gunicorn.conf.py app.main:app'), "
+                             "exécutée dans etape3-api/ avec PORT défini")
+    target.add_argument("--port", type=int, help="port local (libre par défaut)")
+    target.add_argument("--startup-timeout", type=float, default=120.0)
+
+    load = parser.add_argument_group("charge")
+    load.add_argument("--scenario", choices=sorted(SCENARIOS), default="analyze")
+    load.add_argument("--profile", choices=("constant", "step", "spike"), default="constant")
+    load.add_argument("--rate", type=float, default=20.0, help="requêtes/s (débit de base)")
+    load.add_argument("--step-rate", type=float, default=10.0,
+                      help="step: hausse du débit à chaque palier")
+    load.add_argument("--step-seconds", type=float, default=10.0, help="step: durée d'un palier")
+    load.add_argument("--spike-rate", type=float, default=100.0, help="spike: débit pendant le pic")
+    load.add_argument("--spike-at", type=float, default=10.0, help="spike: début du pic (s)")
+    load.add_argument("--spike-seconds", type=float, default=5.0, help="spike: durée du pic (s)")
+    load.add_argument("--duration", type=float, default=30.0, help="durée de la charge (s)")
+    load.add_argument("--uniform", action="store_true",
+                      help="intervalles réguliers au lieu de Poisson")
+    load.add_argument("--timeout", type=float, default=10.0, help="timeout par requête (s)")
+    load.add_argument("--seed", type=int, default=42)
+    load.add_argument("--stream", type=Path,
+                      help="flux corpus.py à rejouer (remplace --scenario et --profile)")
+    load.add_argument("--speed", type=float, default=1.0,
+                      help="stream: facteur d'accélération du flux")
+
+    parser.add_argument("--slo", action="append", type=parse_slo,
+                        help=f"SLO sur le résultat global, répétable "
+                             f"(défaut: {' '.join(DEFAULT_SLOS)}); métriques: p50_ms p95_ms "
+                             "p99_ms max_ms throughput_rps error_rate out_of_range_rate")
+    parser.add_argument("--output", type=Path,
+                        help="fichier JSON (défaut: results/loadtest_<scénario>_<date>.json)")
+    args = parser.parse_args(argv)
+    args.slo = args.slo or [parse_slo(slo) for slo in DEFAULT_SLOS]
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.stream:
+        plan, load_description = stream_plan(args.stream, args.duration, args.speed)
+        scenario = "stream"
+    else:
+        profile = LoadProfile(args.profile, args.rate, args.step_rate, args.step_seconds,
+                              args.spike_rate, args.spike_at, args.spike_seconds)
+        plan = scenario_plan(args.scenario, profile, args.duration, args.seed, not args.uniform)
+        load_description = profile.describe()
+        scenario = args.scenario
+
+    server = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        port = args.port or free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        if args.server == "subprocess":
+            server = SubprocessServer(port, args.server_cmd)
+        else:
+            server = InProcessServer(port)
+        print(f"🚀 Lancement de l'API ({args.server}) sur {base_url}...")
+        server.start()
+
+    try:
+        if not wait_until_ready(base_url, server, args.startup_timeout):
+            print(f"❌ API non prête après {args.startup_timeout:.0f}s: {base_url}")
+            return 2
+
+        print(f"🎯 Scénario {scenario}, {len(plan)} requêtes prévues, "
+              f"charge {load_description}, {args.duration:.0f}s")
+        records, run_info = asyncio.run(run_load(base_url, plan, args.timeout))
+    finally:
+        if server is not None:
+            server.stop()
+
+    report = build_report(records, args.duration)
+    checks = evaluate_slos(report["overall"], args.slo)
+    result = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "target": base_url if args.url else f"local ({args.server})",
+        "scenario": scenario,
+        "profile": load_description,
+        "duration_seconds": args.duration,
+        "arrivals": "uniform" if args.uniform else "poisson",
+        "seed": args.seed,
+        "run": run_info,
+        **report,
+        "slos": checks,
+        "passed": all(check["passed"] for check in checks)
+    }
+
+    output = args.output or Path(__file__).parent / "results" / (
+        f"loadtest_{scenario}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+
+    overall = report["overall"]
+    print("=" * 60)
+    print(f"📊 {overall['requests']} requêtes | {overall['throughput_rps']} req/s réussies | "
+          f"erreurs {overall['error_rate']:.2%}")
+    print(f"⏱️  p50 {overall['p50_ms']} ms | p95 {overall['p95_ms']} ms | "
+          f"p99 {overall['p99_ms']} ms")
+    for name, summary in report["endpoints"].items():
+        print(f"   {name:<24} {summary['requests']:>6} req  p95 {summary['p95_ms']} ms  "
+              f"erreurs {summary['error_rate']:.2%}")
+    for check in checks:
+        print(f"{'✅' if check['passed'] else '❌'} SLO {check['slo']} (mesuré: {check['value']})")
+    print(f"📄 Résultats: {output}")
+
+    return 0 if result["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
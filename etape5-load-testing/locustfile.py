@@ -6,37 +6,7 @@ from locust import HttpUser, task, between, events
 import random
 import logging
 
-# Messages de test avec différents niveaux de toxicité
-FRIENDLY_MESSAGES = [
-    "This is a great product! I love it!",
-    "Thank you so much for your help, I really appreciate it!",
-    "The weather is beautiful today, perfect for a walk.",
-    "I had an amazing experience with this service!",
-    "Great job on the project, keep up the good work!",
-    "I completely agree with your point of view.",
-    "This is very helpful information, thank you for sharing.",
-    "What a wonderful day to learn something new!",
-]
-
-NEUTRAL_MESSAGES = [
-    "The meeting is scheduled for 3 PM.",
-    "I think we should consider other options.",
-    "This is an interesting perspective.",
-    "Could you please provide more details?",
-    "I'm not sure I understand the point.",
-    "This requires further investigation.",
-    "Let's discuss this in the next meeting.",
-]
-
-TOXIC_MESSAGES = [
-    "You are stupid and I hate you!",
-    "Go kill yourself, nobody likes you!",
-    "You are a terrible person and should die!",
-    "Shut up you idiot, nobody cares what you think!",
-    "You're worthless and pathetic!",
-    "I hope you fail miserably!",
-    "You're the worst person I've ever met!",
-]
+from messages import FRIENDLY_MESSAGES, NEUTRAL_MESSAGES, TOXIC_MESSAGES
 
 class ToxicityAnalysisUser(HttpUser):
     """Utilisateur simulé pour tester l'API de toxicité"""
@@ -0,0 +1,42 @@
+"""
+Messages de test partagés par locustfile.py et loadtest.py
+"""
+
+# Messages de test avec différents niveaux de toxicité
+FRIENDLY_MESSAGES = [
+    "This is a great product! I love it!",
+    "Thank you so much for your help, I really appreciate it!",
+    "The weather is beautiful today, perfect for a walk.",
+    "I had an amazing experience with this service!",
+    "Great job on the project, keep up the good work!",
+    "I completely agree with your point of view.",
+    "This is very helpful information, thank you for sharing.",
+    "What a wonderful day to learn something new!",
+]
+
+NEUTRAL_MESSAGES = [
+    "The meeting is scheduled for 3 PM.",
+    "I think we should consider other options.",
+    "This is an interesting perspective.",
+    "Could you please provide more details?",
+    "I'm not sure I understand the point.",
+    "This requires further investigation.",
+    "Let's discuss this in the next meeting.",
+]
+
+TOXIC_MESSAGES = [
+    "You are stupid and I hate you!",
+    "Go kill yourself, nobody likes you!",
+    "You are a terrible person and should die!",
+    "Shut up you idiot, nobody cares what you think!",
+    "You're worthless and pathetic!",
+    "I hope you fail miserably!",
+    "You're the worst person I've ever met!",
+]
+
+# Plage de score attendue par catégorie (indicative: le modèle dummy ne la respecte pas)
+EXPECTED_RANGES = {
+    "friendly": (0, 30),
+    "neutral": (20, 60),
+    "toxic": (50, 100),
+}
@@ -0,0 +1,69 @@
+"""
+Format des flux de requêtes rejouables (.jsonl.gz), sans dépendance à Faker
+
+Produit par corpus.py, relu par loadtest.py (--stream):
+    ligne 1        en-tête (paramètres, versions, nombre de textes et de requêtes)
+    n lignes       textes uniques (chaînes JSON)
+    m lignes       requêtes [décalage_ms, index_texte, modèle]
+"""
+import gzip
+import json
+import statistics
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+STREAM_FORMAT = "dss-request-stream"
+STREAM_VERSION = 1
+
+
+def write_stream(path: Path, params: Dict, texts: List[str], requests: List[Tuple[int, int, str]],
+                 faker_version: str):
+    header = {
+        "format": STREAM_FORMAT,
+        "version": STREAM_VERSION,
+        "params": params,
+        "faker_version": faker_version,
+        "texts": len(texts),
+        "requests": len(requests)
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Sans date ni nom de fichier dans l'en-tête gzip: même flux = même fichier, octet pour octet
+    with open(path, "wb") as raw, \
+            gzip.GzipFile(filename="", fileobj=raw, mode="wb", mtime=0) as compressed:
+        lines = [json.dumps(header, ensure_ascii=False)]
+        lines += [json.dumps(text, ensure_ascii=False) for text in texts]
+        lines += [json.dumps(request, separators=(",", ":")) for request in requests]
+        compressed.write(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+def read_stream(path: Path) -> Tuple[Dict, List[str], List[Tuple[int, int, str]]]:
+    """En-tête, textes et requêtes d'un flux généré par corpus.py"""
+    with gzip.open(path, "rt", encoding="utf-8") as stream:
+        header = json.loads(stream.readline())
+        if header.get("format") != STREAM_FORMAT or header.get("version") != STREAM_VERSION:
+            raise ValueError(f"Flux non reconnu: {path}")
+        texts = [json.loads(stream.readline()) for _ in range(header["texts"])]
+        requests = [tuple(json.loads(stream.readline())) for _ in range(header["requests"])]
+    return header, texts, requests
+
+
+def describe_stream(texts: List[str], requests: List[Tuple[int, int, str]]) -> Dict:
+    """Caractéristiques effectives du flux (à comparer aux paramètres)"""
+    if not requests:
+        return {"requests": 0, "unique_texts": len(texts), "unique_ratio": 0.0,
+                "duration_seconds": 0.0, "chars_p50": 0, "chars_p95": 0, "chars_max": 0,
+                "bert_ratio": 0.0}
+
+    lengths = sorted(len(texts[index]) for _, index, _ in requests)
+    quantiles = statistics.quantiles(lengths, n=100) if len(lengths) > 1 else lengths * 99
+    bert_requests = sum(model == "bert" for _, _, model in requests)
+    return {
+        "requests": len(requests),
+        "unique_texts": len(texts),
+        "unique_ratio": round(len(texts) / len(requests), 4),
+        "duration_seconds": round(requests[-1][0] / 1000, 1),
+        "chars_p50": int(quantiles[49]),
+        "chars_p95": int(quantiles[94]),
+        "chars_max": lengths[-1],
+        "bert_ratio": round(bert_requests / len(requests), 4)
+    }
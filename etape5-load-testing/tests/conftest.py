@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Les scripts de test de charge ne sont pas un package: import direct depuis etape5-load-testing/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
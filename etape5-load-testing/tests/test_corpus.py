@@ -0,0 +1,49 @@
+import re
+
+from corpus import INSULTS, CorpusGenerator, StreamParams
+from faker import VERSION as FAKER_VERSION
+from messages import TOXIC_MESSAGES
+from stream_format import read_stream, write_stream
+
+TOXIC = re.compile(
+    "|".join([re.escape(message) for message in TOXIC_MESSAGES] + [rf"you ({'|'.join(INSULTS)}) "]),
+    re.IGNORECASE
+)
+
+
+def generate(path, **kwargs):
+    params = StreamParams(**kwargs)
+    texts, requests = CorpusGenerator(params).generate()
+    write_stream(path, params.to_dict(), texts, requests, FAKER_VERSION)
+    return texts, requests
+
+
+def test_same_seed_same_bytes(tmp_path):
+    """Même graine = même fichier octet pour octet; autre graine = autre flux"""
+    generate(tmp_path / "a.jsonl.gz", requests=300, seed=7)
+    generate(tmp_path / "b.jsonl.gz", requests=300, seed=7)
+    generate(tmp_path / "c.jsonl.gz", requests=300, seed=8)
+    assert (tmp_path / "a.jsonl.gz").read_bytes() == (tmp_path / "b.jsonl.gz").read_bytes()
+    assert (tmp_path / "a.jsonl.gz").read_bytes() != (tmp_path / "c.jsonl.gz").read_bytes()
+
+
+def test_read_stream_round_trip(tmp_path):
+    """read_stream rend l'en-tête, les textes et les requêtes (décalage, texte, modèle) écrits"""
+    path = tmp_path / "stream.jsonl.gz"
+    texts, requests = generate(path, requests=200, seed=3, bert_ratio=0.5)
+    header, read_texts, read_requests = read_stream(path)
+    assert read_texts == texts
+    assert read_requests == requests
+    assert header["params"]["seed"] == 3 and header["requests"] == 200
+    offsets = [offset for offset, _, _ in read_requests]
+    assert offsets == sorted(offsets)
+    assert {model for _, _, model in read_requests} == {"simple", "bert"}
+
+
+def test_configured_ratios(tmp_path):
+    """Part de répétitions, de textes toxiques et de requêtes BERT proches des paramètres"""
+    texts, requests = generate(tmp_path / "s.jsonl.gz", requests=3000, seed=1, repeat_rate=0.4,
+                               near_dup_rate=0.0, toxic_ratio=0.3, bert_ratio=0.2)
+    assert abs((1 - len(texts) / len(requests)) - 0.4) < 0.05
+    assert abs(sum(bool(TOXIC.search(text)) for text in texts) / len(texts) - 0.3) < 0.05
+    assert abs(sum(model == "bert" for _, _, model in requests) / len(requests) - 0.2) < 0.05
@@ -0,0 +1,133 @@
+import argparse
+import json
+import random
+from collections import Counter
+
+import pytest
+
+import loadtest
+from loadtest import LoadProfile, build_report, evaluate_slos, parse_slo, percentile, summarize
+
+
+def record(name="GET /health", offset=0.0, latency_ms=10.0, error=None, out_of_range=False):
+    return {"name": name, "offset": offset, "latency_ms": latency_ms,
+            "error": error, "out_of_range": out_of_range}
+
+
+def test_percentile_nearest_rank():
+    """Percentile au rang le plus proche; None sans mesure"""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 0) == 1.0
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([], 50) is None
+
+
+def test_summarize_rates_and_errors():
+    """Débit des réponses réussies, taux d'erreur et hors plage, répartition des erreurs"""
+    records = [record(latency_ms=v) for v in (10.0, 20.0, 30.0)]
+    records += [record(latency_ms=40.0, error="http_503"),
+                record(latency_ms=50.0, error="timeout", out_of_range=True)]
+    summary = summarize(records, seconds=2.0)
+    assert summary["requests"] == 5
+    assert summary["p50_ms"] == 30.0
+    assert summary["max_ms"] == 50.0
+    assert summary["throughput_rps"] == 1.5
+    assert summary["error_rate"] == 0.4
+    assert summary["out_of_range_rate"] == 0.2
+    assert summary["errors"] == {"http_503": 1, "timeout": 1}
+
+    empty = summarize([], seconds=1.0)
+    assert empty["requests"] == 0 and empty["p95_ms"] is None and empty["error_rate"] == 0.0
+
+
+def test_build_report_per_endpoint_and_second():
+    """Rapport global, par endpoint et par seconde (secondes sans requête comprises)"""
+    records = [record(offset=0.2),
+               record(name="POST /analyze [simple]", offset=0.7, error="http_500"),
+               record(offset=2.5)]
+    report = build_report(records, duration=3)
+    assert report["overall"]["requests"] == 3
+    assert set(report["endpoints"]) == {"GET /health", "POST /analyze [simple]"}
+    assert report["endpoints"]["POST /analyze [simple]"]["error_rate"] == 1.0
+    timeline = [(s["second"], s["requests"], s["errors"]) for s in report["timeline"]]
+    assert timeline == [(0, 2, 1), (1, 0, 0), (2, 1, 0)]
+
+
+def test_parse_slo():
+    """Expressions 'métrique<=|>=seuil', espaces tolérés; sinon erreur argparse"""
+    assert parse_slo("p95_ms<=500") == ("p95_ms", "<=", 500.0)
+    assert parse_slo(" throughput_rps >= 40.5 ") == ("throughput_rps", ">=", 40.5)
+    for invalid in ("p95_ms<500", "p95_ms<=abc", "<=500", ""):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_slo(invalid)
+
+
+def test_evaluate_slos():
+    """Seuils inclus; métrique absente ou sans valeur = SLO non respecté"""
+    overall = {"p95_ms": 500.0, "error_rate": 0.1, "throughput_rps": 40.0, "p99_ms": None}
+    checks = evaluate_slos(overall, [parse_slo(s) for s in (
+        "p95_ms<=500", "error_rate<=0.05", "throughput_rps>=40", "p99_ms<=800", "unknown<=1"
+    )])
+    assert [check["passed"] for check in checks] == [True, False, True, False, False]
+    assert checks[1] == {"slo": "error_rate<=0.05", "value": 0.1, "passed": False}
+
+
+def test_parse_args_slos():
+    """SLO par défaut si aucun --slo; SLO invalide refusé par argparse"""
+    assert loadtest.parse_args([]).slo == [parse_slo(slo) for slo in loadtest.DEFAULT_SLOS]
+    assert loadtest.parse_args(["--slo", "p99_ms<=800"]).slo == [("p99_ms", "<=", 800.0)]
+    with pytest.raises(SystemExit):
+        loadtest.parse_args(["--slo", "p99_ms=800"])
+
+
+def arrivals_per_second(profile, duration, seed=0, poisson=False):
+    return Counter(int(t) for t in profile.arrival_times(duration, random.Random(seed), poisson))
+
+
+def test_constant_profile_arrivals():
+    """Constant: débit régulier; Poisson: même graine = mêmes instants, moyenne proche du débit"""
+    profile = LoadProfile("constant", rate=10)
+    counts = arrivals_per_second(profile, 3)
+    assert all(9 <= counts[second] <= 11 for second in range(3))
+
+    first = profile.arrival_times(10, random.Random(1))
+    assert first == profile.arrival_times(10, random.Random(1))
+    assert all(0 < t < 10 for t in first) and first == sorted(first)
+    assert 80 <= len(first) <= 120
+
+
+def test_step_profile_arrivals():
+    """Step: débit augmenté de step_rate à chaque palier"""
+    profile = LoadProfile("step", rate=10, step_rate=10, step_seconds=1)
+    assert [profile.rate_at(t) for t in (0, 0.99, 1, 2.5)] == [10, 10, 20, 30]
+    counts = arrivals_per_second(profile, 3)
+    assert [round(counts[second], -1) for second in range(3)] == [10, 20, 30]
+
+
+def test_spike_profile_arrivals():
+    """Spike: spike_rate pendant [spike_at, spike_at + spike_seconds), rate ailleurs"""
+    profile = LoadProfile("spike", rate=5, spike_rate=50, spike_at=1, spike_seconds=1)
+    assert [profile.rate_at(t) for t in (0.5, 1, 1.99, 2)] == [5, 50, 50, 5]
+    counts = arrivals_per_second(profile, 3)
+    assert 4 <= counts[0] <= 6 and 48 <= counts[1] <= 52 and 4 <= counts[2] <= 6
+
+    with pytest.raises(ValueError):
+        LoadProfile("ramp", rate=1)
+
+
+@pytest.mark.integration
+def test_failing_slo_exits_with_code_1(tmp_path):
+    """Charge courte sur l'API dans le processus: SLO non respecté = code de sortie 1"""
+    output = tmp_path / "result.json"
+    exit_code = loadtest.main([
+        "--server", "inprocess", "--scenario", "health", "--rate", "5", "--duration", "1",
+        "--slo", "p50_ms<=0", "--slo", "error_rate<=0.05", "--output", str(output)
+    ])
+    assert exit_code == 1
+    result = json.loads(output.read_text())
+    assert result["passed"] is False
+    assert [check["passed"] for check in result["slos"]] == [False, True]
+    assert result["overall"]["requests"] == result["run"]["scheduled"] > 0